@@ -0,0 +1,379 @@
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from Config import Config
+from DatabaseController import DatabaseController
+from QuestionnaireExporter import QuestionnaireExporter
+from QuestionnaireImporter import QuestionnaireImporter
+from fileHandler import FileHandlerStash, readConfigFile
+
+
+class CommandLine:
+    """
+    The CommandLine class handles the headless entry point "mhf" for batch jobs, e.g. in cron.
+    Every command works directly on the DatabaseController, PyQt5 is not imported.
+
+    The class is handled static like ConfigInit, run() returns the exit code:
+    0 on success, 1 if a command failed completely or in parts, 2 on invalid arguments.
+    """
+
+    logger: logging.Logger
+    config: Config
+    database: DatabaseController
+
+    @staticmethod
+    def run(lstArgs: list = None) -> int:
+        """
+        Method to parse the arguments and to execute the command
+        :param lstArgs: command line arguments without the program name, None = sys.argv
+        :return: exit code
+        """
+        args = CommandLine.createParser().parse_args(lstArgs)
+
+        CommandLine.logger = CommandLine.createLogger(verbose=args.verbose)
+
+        try:
+            CommandLine.config = CommandLine.readConfig(pathConfigFile=args.config)
+            if args.database is not None:
+                CommandLine.config.localDatabase = Path(args.database)
+
+            CommandLine.database = CommandLine.openDatabase(CommandLine.config)
+
+            return args.command(args)
+
+        except Exception as e:
+            CommandLine.logger.error("Error while " + args.commandName + ": " + str(e))
+            print("mhf " + args.commandName + ": " + str(e), file=sys.stderr)
+            return 1
+
+    @staticmethod
+    def createParser() -> argparse.ArgumentParser:
+        """
+        Method to create the parser of the arguments, every subcommand stores its method in "command"
+        :return: argument parser
+        """
+        parser = argparse.ArgumentParser(prog="mhf", description="Batch operations on the Medical History Forms database without GUI.")
+        parser.add_argument("--config", type=Path, default=FileHandlerStash.CONFIG_FILE_PATH, help="config file, default: %(default)s")
+        parser.add_argument("--database", type=Path, default=None, help="SQLite database, default: LocalDatabase of the config file")
+        parser.add_argument("-v", "--verbose", action="store_true", help="log info messages to stderr")
+
+        subparsers = parser.add_subparsers(dest="commandName", metavar="command", required=True)
+
+        importParser = subparsers.add_parser("import", help="import questionnaire files or directories of them")
+        importParser.add_argument("paths", nargs="+", type=Path, help="JSON file or directory")
+        importParser.add_argument("--pattern", default="*.json", help="glob pattern of the files in a directory, default: %(default)s")
+        importParser.add_argument("--workers", type=int, default=None, help="number of parsing processes, default: number of CPUs")
+        importParser.set_defaults(command=CommandLine.importFiles)
+
+        exportParser = subparsers.add_parser("export", help="export all questionnaires to a directory or a zip archive")
+        exportParser.add_argument("target", type=Path, help="target directory or zip archive")
+        exportParser.add_argument("--zip", action="store_true", help="write one zip archive, default if the target ends with .zip")
+        exportParser.add_argument("--workers", type=int, default=None, help="number of encoding processes, default: number of CPUs")
+        exportParser.set_defaults(command=CommandLine.exportQuestionnaires)
+
+        searchParser = subparsers.add_parser("search", help="search questions by text, abbreviation and options")
+        searchParser.add_argument("query", nargs="?", default="", help="search text, empty for all questions")
+        searchParser.add_argument("--category", type=int, default=None, help="id of the question category")
+        searchParser.add_argument("--limit", type=int, default=None, help="maximum number of results")
+        searchParser.add_argument("--json", action="store_true", help="print the questions as JSON")
+        searchParser.set_defaults(command=CommandLine.searchQuestions)
+
+        statsParser = subparsers.add_parser("stats", help="show the size of the database")
+        statsParser.add_argument("--json", action="store_true", help="print the statistics as JSON")
+        statsParser.set_defaults(command=CommandLine.showStatistics)
+
+        syncParser = subparsers.add_parser("sync", help="sync once with the network database of the config file")
+        syncParser.add_argument("--quick", action="store_true", help="only ship and pull the changes, skip the comparison of all tables")
+        syncParser.set_defaults(command=CommandLine.syncDatabase)
+
+        vacuumParser = subparsers.add_parser("vacuum", help="compact the database file")
+        vacuumParser.set_defaults(command=CommandLine.vacuumDatabase)
+
+        benchParser = subparsers.add_parser("bench", help="measure loading, searching and exporting")
+        benchParser.add_argument("--repeat", type=int, default=5, help="number of runs, default: %(default)s")
+        benchParser.add_argument("--query", action="append", default=None, help="search text, can be repeated, default: a few common words")
+        benchParser.add_argument("--export", action="store_true", help="also measure the export of all questionnaires into a zip archive")
+        benchParser.set_defaults(command=CommandLine.benchDatabase)
+
+        return parser
+
+    @staticmethod
+    def createLogger(verbose: bool = False) -> logging.Logger:
+        """
+        Method to create the logger, it logs to stderr instead of the log files of the GUI
+        :param verbose: True to log info messages, otherwise only warnings and errors
+        :return: the logger, worker processes get it by its name
+        """
+        logger = logging.getLogger("MainLogger")
+        logger.setLevel(logging.INFO if verbose else logging.WARNING)
+
+        if not logger.handlers:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(module)s:%(funcName)s | %(message)s"))
+            logger.addHandler(handler)
+
+        FileHandlerStash.LOGGER = logger
+        return logger
+
+    @staticmethod
+    def readConfig(pathConfigFile: Path) -> Config:
+        """
+        Method to read the config file, unlike the GUI a missing file is not created
+        :param pathConfigFile: path of the config file
+        :return: config object, the defaults of a new config file if it does not exist
+        """
+        FileHandlerStash.CONFIG_FILE_PATH = Path(pathConfigFile)
+
+        if FileHandlerStash.CONFIG_FILE_PATH.exists():
+            return readConfigFile()
+
+        CommandLine.logger.info("Config file " + str(pathConfigFile) + " not found, using defaults")
+        config = Config()
+        config.localDatabase = Path("data/mhf.db")
+        return config
+
+    @staticmethod
+    def openDatabase(config: Config) -> DatabaseController:
+        """
+        Method to open the local database with the tuning profile of the config
+        :param config: config object
+        :return: DatabaseController
+        """
+        sqlitePragmas = {
+            "journal_mode": config.sqliteJournalMode,
+            "synchronous": config.sqliteSynchronous,
+            "cache_size": config.sqliteCacheSize,
+            "mmap_size": config.sqliteMmapSize,
+            "temp_store": config.sqliteTempStore,
+        }
+        return DatabaseController(logger=CommandLine.logger, pathSQLiteDatabase=config.localDatabase, sqlitePragmas=sqlitePragmas)
+
+    @staticmethod
+    def importFiles(args) -> int:
+        """
+        Method of the command "import", prints the errors per file and a summary
+        :return: exit code, 1 if a file was not imported completely
+        """
+        lstPaths = []
+        for path in args.paths:
+            if path.is_dir():
+                lstPaths.extend(sorted(path.glob(args.pattern)))
+            else:
+                lstPaths.append(path)
+
+        importer = QuestionnaireImporter(database=CommandLine.database, logger=CommandLine.logger, workers=args.workers)
+        dictReport = importer.importFiles(lstPaths)
+
+        failed = 0
+        for path, (lstErrors, lstNotes) in dictReport.items():
+            if len(lstErrors) > 0:
+                failed += 1
+            for message in lstErrors + lstNotes:
+                print(str(path) + ": " + message)
+
+        print("Imported " + str(len(dictReport) - failed) + " of " + str(len(dictReport)) + " files completely")
+
+        return 1 if failed > 0 else 0
+
+    @staticmethod
+    def exportQuestionnaires(args) -> int:
+        """
+        Method of the command "export", prints the failed files and a summary
+        :return: exit code, 1 if a questionnaire was not exported
+        """
+        exporter = QuestionnaireExporter(logger=CommandLine.logger, workers=args.workers)
+        lstQuestionnaires = CommandLine.database.getQuestionnaires()
+
+        if args.zip or args.target.suffix.lower() == ".zip":
+            dictReport = exporter.exportToArchive(lstQuestionnaires, args.target)
+        else:
+            dictReport = exporter.exportToDirectory(lstQuestionnaires, args.target)
+
+        failed = 0
+        for fileName, error in dictReport.items():
+            if error is not None:
+                failed += 1
+                print(fileName + ": " + error)
+
+        print("Exported " + str(len(dictReport) - failed) + " of " + str(len(dictReport)) + " questionnaires to " + str(args.target))
+
+        return 1 if failed > 0 else 0
+
+    @staticmethod
+    def searchQuestions(args) -> int:
+        """
+        Method of the command "search", prints one question per line: id, abbreviation and text separated by tabs
+        :return: exit code, 1 if the category does not exist
+        """
+        category = None
+        if args.category is not None:
+            category = CommandLine.database.getQuestionCategoryById(args.category)
+            if category is None:
+                print("mhf search: unknown category " + str(args.category), file=sys.stderr)
+                return 1
+
+        lstQuestions = CommandLine.database.searchQuestions(args.query, category=category, limit=args.limit)
+
+        if args.json:
+            print(json.dumps(lstQuestions, default=lambda o: o.__dict__, ensure_ascii=False, indent=2))
+        else:
+            for question in lstQuestions:
+                print(str(question.id) + "\t" + str(question.abbreviation) + "\t" + " ".join(str(question.text).split()))
+
+        return 0
+
+    @staticmethod
+    def showStatistics(args) -> int:
+        """
+        Method of the command "stats", prints the number of rows per table and the size of the database
+        :return: exit code
+        """
+        dictStatistics = CommandLine.database.getStatistics()
+        dictStatistics["path"] = str(CommandLine.config.localDatabase)
+
+        if args.json:
+            print(json.dumps(dictStatistics, indent=2))
+            return 0
+
+        lstLines = [
+            ("Database", dictStatistics["path"]),
+            ("Schema version", dictStatistics["schemaVersion"]),
+            ("Questions", dictStatistics["tb_questions"]),
+            ("Questionnaires", dictStatistics["tb_questionnaires"]),
+            ("Questions in questionnaires", dictStatistics["tb_collections"]),
+            ("Question categories", dictStatistics["tb_question_categories"]),
+            ("Questionnaire categories", dictStatistics["tb_questionnaire_categories"]),
+            ("Question types", dictStatistics["tb_question_types"]),
+            ("Changes not synced", dictStatistics["tb_changelog"]),
+            ("Sync conflicts", dictStatistics["tb_sync_conflicts"]),
+            ("Full-text search", "yes" if dictStatistics["fullTextSearch"] else "no"),
+            ("Size", CommandLine.formatSize(dictStatistics["size"]) + " (" + CommandLine.formatSize(dictStatistics["free"]) + " free)"),
+        ]
+        for name, value in lstLines:
+            print((name + ":").ljust(29) + str(value))
+
+        return 0
+
+    @staticmethod
+    def syncDatabase(args) -> int:
+        """
+        Method of the command "sync", syncs once with the network database of the config file and prints the rows in conflict
+        :return: exit code, 1 if no network database is configured or rows are not synchronised because of conflicts
+        """
+        config = CommandLine.config
+        if not config.useNetworkDatabase:
+            print("mhf sync: no network database configured, set UseNetworkDatabase in " + str(FileHandlerStash.CONFIG_FILE_PATH), file=sys.stderr)
+            return 1
+
+        start = time.perf_counter()
+        count = CommandLine.database.syncOnceWithExtern(
+            host=config.networkDatabaseAddress,
+            port=config.networkDatabasePort,
+            user=config.networkDatabaseUser,
+            password=config.networkDatabasePassword,
+            database=config.networkDatabase,
+            reconcile=not args.quick,
+        )
+
+        print("Synced with " + config.networkDatabaseAddress + ", " + str(count) + " local rows changed in " + CommandLine.formatDuration(time.perf_counter() - start))
+
+        lstConflicts = CommandLine.database.getSyncConflicts()
+        for target, tableName, key1, key2, reason, detectedAt in lstConflicts:
+            print(
+                "Not synchronised: "
+                + tableName
+                + " "
+                + str(key1)
+                + ("/" + str(key2) if key2 is not None else "")
+                + " on "
+                + target
+                + ", "
+                + reason
+                + " since "
+                + time.strftime("%Y-%m-%d %H:%M", time.localtime(detectedAt / 1000))
+            )
+
+        return 1 if len(lstConflicts) > 0 else 0
+
+    @staticmethod
+    def vacuumDatabase(args) -> int:
+        """
+        Method of the command "vacuum", prints the size before and after
+        :return: exit code
+        """
+        sizeBefore = CommandLine.database.getStatistics()["size"]
+        start = time.perf_counter()
+
+        CommandLine.database.vacuum()
+
+        sizeAfter = CommandLine.database.getStatistics()["size"]
+        print("Compacted " + str(CommandLine.config.localDatabase) + " from " + CommandLine.formatSize(sizeBefore) + " to " + CommandLine.formatSize(sizeAfter) + " in " + CommandLine.formatDuration(time.perf_counter() - start))
+
+        return 0
+
+    @staticmethod
+    def benchDatabase(args) -> int:
+        """
+        Method of the command "bench", every run opens the database again, so the caches are cold.
+        Prints minimum, median and maximum per operation.
+        :return: exit code
+        """
+        lstQueries = args.query or ["schmerz", "allergie", "datum", "seit wann"]
+        dictTimes = {}
+
+        def measure(name: str, function):
+            start = time.perf_counter()
+            result = function()
+            dictTimes.setdefault(name, []).append(time.perf_counter() - start)
+            return result
+
+        for n in range(max(args.repeat, 1)):
+            database = measure("open database", lambda: CommandLine.openDatabase(CommandLine.config))
+            lstQuestions = measure("load questions", database.getQuestions)
+            lstQuestionnaires = measure("load questionnaires", database.getQuestionnaires)
+
+            for query in lstQueries:
+                measure("search " + repr(query), lambda: database.searchQuestions(query, limit=50))
+
+            if args.export:
+                exporter = QuestionnaireExporter(logger=CommandLine.logger, workers=1)
+                with tempfile.TemporaryDirectory() as directory:
+                    measure("export zip", lambda: exporter.exportToArchive(lstQuestionnaires, Path(directory) / "export.zip"))
+
+        print(str(len(lstQuestions)) + " questions, " + str(len(lstQuestionnaires)) + " questionnaires, " + str(max(args.repeat, 1)) + " runs")
+        print("operation".ljust(29) + "min".rjust(10) + "median".rjust(10) + "max".rjust(10))
+        for name, lstTimes in dictTimes.items():
+            print(name.ljust(29) + "".join(CommandLine.formatDuration(value).rjust(10) for value in (min(lstTimes), statistics.median(lstTimes), max(lstTimes))))
+
+        return 0
+
+    @staticmethod
+    def formatSize(size: int) -> str:
+        """
+        Method to format a number of bytes
+        :param size: number of bytes
+        :return: e.g. "1.5 MB"
+        """
+        if size < 1024:
+            return str(size) + " B"
+        for unit in ("KB", "MB", "GB"):
+            size /= 1024
+            if size < 1024 or unit == "GB":
+                return "%.1f %s" % (size, unit)
+
+    @staticmethod
+    def formatDuration(seconds: float) -> str:
+        """
+        Method to format a duration
+        :param seconds: duration in seconds
+        :return: e.g. "12.3 ms"
+        """
+        if seconds < 1:
+            return "%.1f ms" % (seconds * 1000)
+        return "%.2f s" % seconds
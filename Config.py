@@ -13,6 +13,8 @@ class Config:
         """
         self.useQuestionAnswerLimit: bool = False
         self.useRecoveryPoints: bool = True
+        self.useSessionJournal: bool = True
+        self.useBinarySession: bool = True
         self.useNetworkDatabase: bool = False
         self.useCustomColorCodes: bool = False
 
@@ -25,5 +27,11 @@ class Config:
         self.networkDatabasePassword: str = ""
         self.networkDatabase: str = ""
 
+        self.sqliteJournalMode: str = "WAL"
+        self.sqliteSynchronous: str = "NORMAL"
+        self.sqliteCacheSize: str = "-16000"
+        self.sqliteMmapSize: str = "268435456"
+        self.sqliteTempStore: str = "MEMORY"
+
         self.customColorCodes: str = ""
         self.userIcon: Path = Path(os.getcwd()) / Path("data/logo.png")
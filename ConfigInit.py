@@ -1,6 +1,5 @@
 import logging
 import sys
-from json import JSONDecodeError
 
 from Config import Config
 from DatabaseController import DatabaseController
@@ -11,7 +10,19 @@ from QuestionObserver import QuestionObserver
 from QuestionnaireController import QuestionnaireController
 from Questionnaire import Questionnaire
 from QuestionnaireObserver import QuestionnaireObserver
-from fileHandler import createSessionFile, removeSessionFile, createLogger, readSessionFile, setTypes, setQuestionCategories, setQuestionnaireCategories, createConfigFile, readConfigFile
+from SessionWriter import SessionWriter
+from fileHandler import (
+    FileHandlerStash,
+    createSessionFile,
+    removeSessionFile,
+    createLogger,
+    readSessionFile,
+    setTypes,
+    setQuestionCategories,
+    setQuestionnaireCategories,
+    createConfigFile,
+    readConfigFile,
+)
 
 from PyQt5 import QtWidgets
 
@@ -27,6 +38,7 @@ class ConfigInit:
     database: DatabaseController
     logger: logging.Logger
     questionnaireController: QuestionnaireController
+    sessionWriter: SessionWriter
 
     @staticmethod
     def init() -> int:
@@ -43,13 +55,33 @@ class ConfigInit:
         ConfigInit.logger = createLogger(maxFileCount=config.logFileMaxCount)
 
         # 3. Connect to database
-        ConfigInit.database = DatabaseController(logger=ConfigInit.logger, pathSQLiteDatabase=config.localDatabase)
+        sqlitePragmas = {
+            "journal_mode": config.sqliteJournalMode,
+            "synchronous": config.sqliteSynchronous,
+            "cache_size": config.sqliteCacheSize,
+            "mmap_size": config.sqliteMmapSize,
+            "temp_store": config.sqliteTempStore,
+        }
+        ConfigInit.database = DatabaseController(logger=ConfigInit.logger, pathSQLiteDatabase=config.localDatabase, sqlitePragmas=sqlitePragmas)
         if config.useNetworkDatabase:
             ConfigInit.database.connectToExtern(
-                host=config.networkDatabaseAddress, port=config.networkDatabasePort, user=config.networkDatabaseUser, password=config.networkDatabasePassword, database=config.networkDatabase
+                host=config.networkDatabaseAddress,
+                port=config.networkDatabasePort,
+                user=config.networkDatabaseUser,
+                password=config.networkDatabasePassword,
+                database=config.networkDatabase,
+                waitForConnection=True,
             )
 
         # 4. Create QuestionnaireController and check for Session file
+        ConfigInit.sessionWriter = SessionWriter(
+            logger=ConfigInit.logger,
+            pathSessionFile=FileHandlerStash.SESSION_FILE_PATH,
+            pathJournalFile=FileHandlerStash.SESSION_JOURNAL_PATH if config.useSessionJournal else None,
+            binary=config.useBinarySession,
+            # the cache holds the saved state, the questionnaire only gets copies of its questions
+            reference=ConfigInit.database.getCachedQuestion,
+        )
         ConfigInit.questionController = QuestionController(database=ConfigInit.database, logger=ConfigInit.logger)
 
         categories = ConfigInit.database.getQuestionnaireCategories()
@@ -59,7 +91,7 @@ class ConfigInit:
                 defaultCategory = category
 
         ConfigInit.questionnaireController = QuestionnaireController(questionnaire=Questionnaire(category=defaultCategory), database=ConfigInit.database, logger=ConfigInit.logger)
-        ConfigInit.questionnaireController.setObserver(observer=QuestionnaireObserver(observedController=ConfigInit.questionnaireController))
+        ConfigInit.questionnaireController.setObserver(observer=QuestionnaireObserver(observedController=ConfigInit.questionnaireController, sessionWriter=ConfigInit.sessionWriter))
 
         setTypes(types=ConfigInit.database.getTypes())
         setQuestionCategories(categories=ConfigInit.database.getQuestionCategories())
@@ -71,10 +103,13 @@ class ConfigInit:
             except FileExistsError:
                 if ConfigInit.sendSessionPrompt():
                     try:
-                        ConfigInit.questionnaireController = QuestionnaireController(questionnaire=readSessionFile(), database=ConfigInit.database, logger=ConfigInit.logger)
-                        ConfigInit.questionnaireController.setObserver(observer=QuestionnaireObserver(observedController=ConfigInit.questionnaireController))
-                    except JSONDecodeError as err:
-                        ConfigInit.logger.warning("Found empty session file. Deleting and creating a new one...")
+                        # load the question cache in one query, the binary snapshot takes unchanged fields from it
+                        ConfigInit.database.getQuestions()
+                        ConfigInit.questionnaireController = QuestionnaireController(questionnaire=readSessionFile(getQuestionById=ConfigInit.database.getQuestionById), database=ConfigInit.database, logger=ConfigInit.logger)
+                        ConfigInit.questionnaireController.setObserver(observer=QuestionnaireObserver(observedController=ConfigInit.questionnaireController, sessionWriter=ConfigInit.sessionWriter))
+                    except ValueError as err:
+                        # JSONDecodeError of an empty JSON session file or a damaged binary snapshot
+                        ConfigInit.logger.warning("Found empty or damaged session file. Deleting and creating a new one...")
                         removeSessionFile()
                         createSessionFile()
 
@@ -88,7 +123,12 @@ class ConfigInit:
         widget = MainFrame(questionnaireController=ConfigInit.questionnaireController, questionController=ConfigInit.questionController)
         widget.show()
 
-        return app.exec_()
+        result = app.exec_()
+
+        # the session file is removed after a regular exit, a queued write must not recreate it
+        ConfigInit.sessionWriter.close()
+
+        return result
 
     @staticmethod
     def sendSessionPrompt():
@@ -1,6 +1,7 @@
+import asyncio
 import json
+import re
 import threading
-import time
 from pathlib import Path
 
 from Question import Question
@@ -8,6 +9,9 @@ from QuestionCategory import QuestionCategory
 from QuestionType import QuestionType
 from Questionnaire import Questionnaire
 from QuestionnaireCategory import QuestionnaireCategory
+from SyncEngine import SyncEngine
+from SyncQueue import SyncQueue
+from TrigramIndex import TrigramIndex
 from database.DatabaseMySQL import DatabaseMySQL
 from database.DatabaseSQLite import DatabaseSQLite
 
@@ -17,15 +21,16 @@ class DatabaseController:
     DatabaseController class will handle connections between MHF and any SQL databases
     """
 
-    def __init__(self, logger, pathSQLiteDatabase: Path):
+    def __init__(self, logger, pathSQLiteDatabase: Path, sqlitePragmas: dict = None):
         """
         Constructor
         :keyword logger: logger Object
         :keyword pathSQLiteDatabase: path of databasefile e.g. data/mhf.db
+        :keyword sqlitePragmas: SQLite tuning profile e.g. {"journal_mode": "WAL"}
         """
         self.logger = logger
         self.pathSQLiteDatabase = pathSQLiteDatabase
-        self.mysqlDisconnect = False
+        self.sqlitePragmas = sqlitePragmas
 
         lstQuestionTypes = [
             ("radio", "Auswahl", 1),
@@ -38,11 +43,28 @@ class DatabaseController:
         ]
 
         try:
-            self.databaseSQLite = DatabaseSQLite(self.logger, self.pathSQLiteDatabase, lstQuestionTypes)
+            self.databaseSQLite = DatabaseSQLite(self.logger, self.pathSQLiteDatabase, lstQuestionTypes, self.sqlitePragmas)
             self.databaseMySQL = None
 
-            self.syncDatabasesThreadEvent = threading.Event()
-            self.syncDatabasesRequired = []
+            self.syncQueue = None
+            # seconds between two pulls of the changes of other workstations
+            self.pullInterval = 10
+
+            # guards the identity maps and the search index, the sync thread drops them while the GUI uses them
+            self.cacheLock = threading.RLock()
+
+            # identity maps of already loaded objects keyed by id, None = not loaded yet
+            self.cacheTypes = None
+            self.cacheQuestionCategories = None
+            self.cacheQuestionnaireCategories = None
+            self.cacheQuestions = None
+            self.cacheQuestionnaires = None
+            self.cacheCollections = None
+
+            # trigram index of question text and abbreviation, None = not built yet
+            self.searchIndex = None
+
+            self.databaseSQLite.removeAcknowledgedChanges()
 
         except Exception as e:
             self.logger.error("Error while init DatabaseController:" + str(e))
@@ -54,27 +76,25 @@ class DatabaseController:
     def __exit__(self, exc_type, exc_val, exc_tb):
         pass
 
-    def connectToExtern(self, host: str, port: int, user: str, password: str, database: str) -> bool:
+    def connectToExtern(self, host: str, port: int, user: str, password: str, database: str, waitForConnection: bool = False) -> bool:
         """
         Constructor
+        Local changes made while the extern database is not available stay in tb_changelog and are shipped after connecting.
         :keyword host: IPAddress MySQL Server
         :keyword port: Port MySQL Server
         :keyword user: Username MySQL Server
         :keyword password: Password MySQL Server
         :keyword database: name of database
+        :keyword waitForConnection: True to connect in the background if the database is not available, otherwise raise
         """
         try:
-            self.databaseMySQL = DatabaseMySQL(self.logger, host, port, user, password, database)
+            syncQueue = SyncQueue()
+            self.databaseMySQL = DatabaseMySQL(self.logger, host, port, user, password, database, onReconnect=syncQueue.putAll, waitForConnection=waitForConnection)
 
-            self.syncDatabasesThread = threading.Thread(target=self.syncDatabases, daemon=True, args=(self.syncDatabasesThreadEvent, self.databaseMySQL)).start()
+            self.syncDatabasesThread = threading.Thread(target=self.syncDatabases, daemon=True, args=(syncQueue, self.databaseMySQL)).start()
 
-            self.syncDatabasesRequired.append("tb_question_types")
-            self.syncDatabasesRequired.append("tb_question_categories")
-            self.syncDatabasesRequired.append("tb_questionnaire_categories")
-            self.syncDatabasesRequired.append("tb_questions")
-            self.syncDatabasesRequired.append("tb_questionnaires")
-            self.syncDatabasesRequired.append("tb_collections")
-            self.syncDatabasesThreadEvent.set()
+            syncQueue.putAll()
+            self.syncQueue = syncQueue
 
         except Exception as e:
             self.logger.error("Error while connectToExtern:" + str(e))
@@ -86,9 +106,12 @@ class DatabaseController:
         """
         Method to disconnect from extern database
         """
-        self.mysqlDisconnect = True
-        self.syncDatabasesRequired.clear()
-        self.syncDatabasesThreadEvent.set()
+        if self.syncQueue:
+            self.syncQueue.close()
+        self.syncQueue = None
+
+        if self.databaseMySQL:
+            self.databaseMySQL.disconnet()
         self.databaseMySQL = None
 
     def addQuestion(self, question: Question) -> Question:
@@ -97,35 +120,39 @@ class DatabaseController:
         :param question: object of question
         :return: question object include id
         """
-        try:
-            dependentOnID = -1
-            for currentQuestion in self.getQuestions():
-                if currentQuestion.abbreviation == question.dependent_on:
-                    dependentOnID = currentQuestion.id
-
-            question.id = self.databaseSQLite.addQuestion(
-                text=question.text,
-                questionType=question.type.id,
-                options=json.dumps(question.options),
-                required=question.required,
-                dependent_on=dependentOnID,
-                expectedAnswer=question.expected_answer,
-                abbrv=question.abbreviation,
-                score=question.score,
-                comment=question.comment,
-                category=question.category.id,
-            )
-
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_questions")
-                self.syncDatabasesThreadEvent.set()
-
-            return question
+        with self.cacheLock:
+            try:
+                dependentOnID = self.__getQuestionIdByAbbreviation(question.dependent_on)
+
+                question.id = self.databaseSQLite.addQuestion(
+                    text=question.text,
+                    questionType=question.type.id,
+                    options=json.dumps(question.options),
+                    required=question.required,
+                    dependent_on=dependentOnID,
+                    expectedAnswer=question.expected_answer,
+                    abbrv=question.abbreviation,
+                    score=question.score,
+                    comment=question.comment,
+                    category=question.category.id,
+                )
 
-        except Exception as e:
-            self.logger.error("Error while addQuestion:" + str(e))
-            raise
+                if self.cacheQuestions is not None:
+                    # the caller keeps changing its object, the cache holds the saved state
+                    self.cacheQuestions[question.id] = question.copy()
+
+                if self.searchIndex is not None:
+                    self.searchIndex.add(question.id, question.text + "\n" + question.abbreviation)
+
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_questions")
+
+                return question
+
+            except Exception as e:
+                self.logger.error("Error while addQuestion:" + str(e))
+                raise
 
     def editQuestion(self, question: Question) -> Question:
         """
@@ -133,36 +160,44 @@ class DatabaseController:
         :param question:  altered object of question
         :return: True if done / raise exception
         """
-        try:
-            dependentOnID = -1
-            for row in self.getQuestions():
-                if row.abbreviation == question.dependent_on:
-                    dependentOnID = row.id
-
-            self.databaseSQLite.changeQuestion(
-                id_question=question.id,
-                text=question.text,
-                questionType=question.type.id,
-                options=json.dumps(question.options),
-                required=question.required,
-                dependent_on=dependentOnID,
-                expectedAnswer=question.expected_answer,
-                abbrv=question.abbreviation,
-                score=question.score,
-                comment=question.comment,
-                category=question.category.id,
-            )
-
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_questions")
-                self.syncDatabasesThreadEvent.set()
-
-            return question
+        with self.cacheLock:
+            try:
+                dependentOnID = self.__getQuestionIdByAbbreviation(question.dependent_on)
+
+                self.databaseSQLite.changeQuestion(
+                    id_question=question.id,
+                    text=question.text,
+                    questionType=question.type.id,
+                    options=json.dumps(question.options),
+                    required=question.required,
+                    dependent_on=dependentOnID,
+                    expectedAnswer=question.expected_answer,
+                    abbrv=question.abbreviation,
+                    score=question.score,
+                    comment=question.comment,
+                    category=question.category.id,
+                )
 
-        except Exception as e:
-            self.logger.error("Error while editQuestion:" + str(e))
-            raise
+                if self.cacheQuestions is not None:
+                    cachedQuestion = self.cacheQuestions.get(question.id)
+                    if cachedQuestion is not None and cachedQuestion.abbreviation != question.abbreviation:
+                        # dependent questions reference the old abbreviation
+                        self.cacheQuestions = None
+                    else:
+                        self.cacheQuestions[question.id] = question.copy()
+
+                if self.searchIndex is not None:
+                    self.searchIndex.add(question.id, question.text + "\n" + question.abbreviation)
+
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_questions")
+
+                return question
+
+            except Exception as e:
+                self.logger.error("Error while editQuestion:" + str(e))
+                raise
 
     def removeQuestion(self, question: Question) -> bool:
         """
@@ -170,77 +205,241 @@ class DatabaseController:
         :param question:  current object of question
         :return: True if done / raise exception
         """
-        try:
-            self.databaseSQLite.removeQuestion(questionId=question.id)
+        with self.cacheLock:
+            try:
+                self.databaseSQLite.removeQuestion(questionId=question.id)
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_questions")
-                self.syncDatabasesThreadEvent.set()
+                if self.cacheQuestions is not None:
+                    removedQuestion = self.cacheQuestions.pop(question.id, None)
+                    if removedQuestion is not None:
+                        for currentQuestion in self.cacheQuestions.values():
+                            if currentQuestion.dependent_on == removedQuestion.abbreviation:
+                                # dependent questions lose their dependency
+                                self.cacheQuestions = None
+                                break
 
-            return True
+                if self.searchIndex is not None:
+                    self.searchIndex.remove(question.id)
 
-        except Exception as e:
-            self.logger.error("Error while removeQuestion:" + str(e))
-            raise
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_questions")
+
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while removeQuestion:" + str(e))
+                raise
+
+    def __clearCache(self):
+        """
+        Methode to drop all cached objects, e.g. after a rollback
+        """
+        with self.cacheLock:
+            self.cacheTypes = None
+            self.cacheQuestionCategories = None
+            self.cacheQuestionnaireCategories = None
+            self.cacheQuestions = None
+            self.cacheQuestionnaires = None
+            self.cacheCollections = None
+            self.searchIndex = None
 
     def getQuestions(self) -> list:
         """
         Methode to get all questions from database
-        :return: list of question objects
+        :return: list of question objects, copies of the cached objects
         """
-        lstQuestions = []
-        lstTypes = self.getTypes()
-        lstQuestionCategorys = self.getQuestionCategories()
+        with self.cacheLock:
+            return [question.copy() for question in self.__loadQuestions().values()]
+
+    def __loadQuestions(self) -> dict:
+        """
+        Methode to load all questions from database once, further calls use the cached objects.
+        The cached objects hold the saved state, they are never handed out, only copies of them.
+        :return: dict of question objects by id
+        """
+        if self.cacheQuestions is not None:
+            return self.cacheQuestions
+
+        dictTypes = {questionType.id: questionType for questionType in self.getTypes()}
+        dictQuestionCategories = {category.id: category for category in self.getQuestionCategories()}
         lstQuestionRows = self.databaseSQLite.getQuestions()
+        dictAbbreviations = {row[0]: row[7] for row in lstQuestionRows}
+
+        cacheQuestions = {}
 
         for row in lstQuestionRows:
-            currentType = None
-            for questionType in lstTypes:
-                if questionType.id == row[2]:
-                    currentType = questionType
-                    break
-
-            currentCategory = None
-            for category in lstQuestionCategorys:
-                if category.id == row[10]:
-                    currentCategory = category
-                    break
-
-            currentDependentOn = "none"
-            if row[5] != -1:
-                for questionRow in lstQuestionRows:
-                    if questionRow[0] == row[5]:
-                        currentDependentOn = questionRow[7]
-                        break
-
-            question = Question(
-                id=row[0],
-                text=row[1],
-                type=currentType,
-                options=json.loads(row[3]),
-                required=bool(row[4]),
-                dependent_on=currentDependentOn,
-                expected_answer=row[6],
-                abbreviation=row[7],
-                score=bool(row[8]),
-                comment=bool(row[9]),
-                category=currentCategory,
-            )
-            lstQuestions.append(question)
+            cacheQuestions[row[0]] = self.__buildQuestion(row, dictTypes, dictQuestionCategories, dictAbbreviations.get(row[5], "none"))
+
+        self.cacheQuestions = cacheQuestions
+
+        return self.cacheQuestions
+
+    def __buildQuestion(self, row: tuple, dictTypes: dict, dictQuestionCategories: dict, dependentOn: str) -> Question:
+        """
+        Method to build a question object from a row of tb_questions
+        :param row: row of tb_questions
+        :param dictTypes: question types by id
+        :param dictQuestionCategories: question categories by id
+        :param dependentOn: abbreviation of the question this question is dependent on
+        :return: question object
+        """
+        return Question(
+            id=row[0],
+            text=row[1],
+            type=dictTypes.get(row[2]),
+            options=json.loads(row[3]),
+            required=bool(row[4]),
+            dependent_on=dependentOn,
+            expected_answer=row[6],
+            abbreviation=row[7],
+            score=bool(row[8]),
+            comment=bool(row[9]),
+            category=dictQuestionCategories.get(row[10]),
+        )
+
+    def __buildQuestionFromRow(self, row: tuple) -> Question:
+        """
+        Method to build a single question object from a row of tb_questions without loading all questions
+        :param row: row of tb_questions
+        :return: question object
+        """
+        dependentOn = "none"
+        if row[5] != -1:
+            dependentRow = self.databaseSQLite.getQuestionById(row[5])
+            if dependentRow is not None:
+                dependentOn = dependentRow[7]
+
+        dictTypes = {questionType.id: questionType for questionType in self.getTypes()}
+        dictQuestionCategories = {category.id: category for category in self.getQuestionCategories()}
+
+        return self.__buildQuestion(row, dictTypes, dictQuestionCategories, dependentOn)
+
+    def searchQuestions(self, query: str, category: QuestionCategory = None, limit: int = None) -> list:
+        """
+        Method to search questions by text, abbreviation and options.
+        Every word of the query is matched as prefix, case and umlauts are folded.
+        With a limit the best matches come first, otherwise the questions are ordered by id.
+        Questions containing the query as substring of text or abbreviation are added from the trigram index of SQLite,
+        without any match the in-memory trigram index falls back to a typo-tolerant search.
+        :param query: search text, empty for all questions
+        :param category: if present only questions of this category
+        :param limit: maximum number of results, None for all
+        :return: list of question objects
+        """
+        with self.cacheLock:
+            lstWords = re.findall(r"\w+", query) if query else []
+
+            if not query:
+                lstQuestions = [question for question in self.__loadQuestions().values() if category is None or question.category.id == category.id]
+
+            elif self.databaseSQLite.fullTextSearch and len(lstWords) > 0:
+                match = " ".join('"' + word + '"*' for word in lstWords)
+                categoryId = category.id if category else None
+                lstIds = self.databaseSQLite.searchQuestions(match=match, category=categoryId, limit=-1 if limit is None else limit)
+
+                # the index only matches word prefixes, infixes like "nehmen" in "einnehmen" come from the trigram index of SQLite
+                text = " ".join(query.split())
+                if self.databaseSQLite.substringSearch and len(text) >= 3 and (limit is None or len(lstIds) < limit):
+                    setIds = set(lstIds)
+                    lstIds += [questionId for questionId in self.databaseSQLite.searchQuestionsBySubstring(text, category=categoryId, limit=-1 if limit is None else limit) if questionId not in setIds]
+                    if limit is None:
+                        lstIds.sort()
+
+                if self.cacheQuestions is None and limit is not None:
+                    # only the matches of a limited search are built, e.g. the first keystroke in the library does not load all questions
+                    lstQuestions = [self.__buildQuestionFromRow(row) for row in map(self.databaseSQLite.getQuestionById, lstIds) if row is not None]
+                else:
+                    dictQuestions = self.__loadQuestions()
+                    lstQuestions = [dictQuestions[questionId] for questionId in lstIds if questionId in dictQuestions]
+
+                # the in-memory trigram index is only built if the query matches nothing
+                if len(lstQuestions) == 0:
+                    lstQuestions = self.__searchQuestionsByTrigrams(query, category)
+
+            else:
+                lstQuestions = self.__searchQuestionsByTrigrams(query, category)
+
+            if limit is not None:
+                lstQuestions = lstQuestions[:limit]
+            return [question.copy() for question in lstQuestions]
+
+    def __searchQuestionsByTrigrams(self, query: str, category: QuestionCategory = None, fuzzy: bool = True) -> list:
+        """
+        Method to search questions with the trigram index, the index is built on first use
+        :param query: search text
+        :param category: if present only questions of this category
+        :param fuzzy: if set and no question contains the query, similar questions are returned
+        :return: list of question objects
+        """
+        dictQuestions = self.__loadQuestions()
+
+        if self.searchIndex is None:
+            self.searchIndex = TrigramIndex()
+            for question in dictQuestions.values():
+                self.searchIndex.add(question.id, question.text + "\n" + question.abbreviation)
+
+        lstQuestions = []
+        for questionId in self.searchIndex.search(query, fuzzy=fuzzy):
+            question = dictQuestions.get(questionId)
+            if question is not None and (category is None or question.category.id == category.id):
+                lstQuestions.append(question)
 
         return lstQuestions
 
+    def __getQuestionIdByAbbreviation(self, abbreviation: str) -> int:
+        """
+        Method to get the id of a question by its abbreviation
+        :param abbreviation: abbreviation of question
+        :return: id of question, -1 if not exist
+        """
+        question = self.getQuestionByAbbreviation(abbreviation)
+        if question is None:
+            return -1
+        return question.id
+
     def getQuestionById(self, questionId: int):
         """
         Method to get one question by id
         :param questionId: id of question
         :return: question object
         """
-        for question in self.getQuestions():
-            if question.id == questionId:
-                return question
-        return None
+        with self.cacheLock:
+            if self.cacheQuestions is not None:
+                question = self.cacheQuestions.get(questionId)
+                return question.copy() if question is not None else None
+
+            row = self.databaseSQLite.getQuestionById(questionId)
+            if row is None:
+                return None
+            return self.__buildQuestionFromRow(row)
+
+    def getCachedQuestion(self, questionId: int):
+        """
+        Method to get one question from the cache without database access, safe to call from other threads
+        :param questionId: id of question
+        :return: the cached question object holding the saved state, it must not be changed, or None if it is not cached
+        """
+        with self.cacheLock:
+            if self.cacheQuestions is None:
+                return None
+            return self.cacheQuestions.get(questionId)
+
+    def getQuestionByAbbreviation(self, abbreviation: str):
+        """
+        Method to get one question by abbreviation
+        :param abbreviation: unique abbreviation of question
+        :return: question object or None
+        """
+        with self.cacheLock:
+            # the unique index of abbrv is used instead of scanning the cache
+            row = self.databaseSQLite.getQuestionByAbbrv(abbreviation)
+            if row is None:
+                return None
+
+            if self.cacheQuestions is not None and row[0] in self.cacheQuestions:
+                return self.cacheQuestions[row[0]].copy()
+            return self.__buildQuestionFromRow(row)
 
     def addQuestionnaire(self, questionnaire: Questionnaire) -> [Questionnaire, list]:
         """
@@ -248,36 +447,62 @@ class DatabaseController:
         :param questionnaire: object of questionnaire
         :return: questionnaire object include id´s, errorlist = list of questions which already in table
         """
-        position = 0
-        errorList = []
+        with self.cacheLock:
+            try:
+                with self.databaseSQLite.transaction():
+                    questionnaire.id = self.databaseSQLite.addQuestionnaire(name=questionnaire.name, description=questionnaire.description, category=questionnaire.category.id)
 
-        try:
-            questionnaire.id = self.databaseSQLite.addQuestionnaire(name=questionnaire.name, description=questionnaire.description, category=questionnaire.category.id)
+                    errorList = self.__addCollections(questionnaire=questionnaire)
 
-            for question in questionnaire.questions:
-                position += 1
+                # created and lastChanged are set by the database
+                self.__refreshQuestionnaire(questionnaire.id)
 
-                try:
-                    if question.id == -1:
-                        question = self.addQuestion(question)
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_questionnaires", "tb_collections")
 
-                    self.__addCollection(id_Q=question.id, id_QA=questionnaire.id, position=position, required=question.required)
+                return questionnaire, errorList
 
-                except Exception as e:
-                    self.logger.info("Question already exist in tb_questions:" + str(e))
-                    errorList.append(question)
+            except Exception as e:
+                self.logger.error("Error while addQuestionnaire:" + str(e))
+                self.__clearCache()
+                raise
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_questionnaires")
-                self.syncDatabasesRequired.append("tb_collections")
-                self.syncDatabasesThreadEvent.set()
+    def addQuestionnaires(self, lstQuestionnaires: list) -> list:
+        """
+        Methode to add several questionnaires in one transaction, e.g. a batch import.
+        Unsaved questions are matched by abbreviation: a question already in the database or
+        in a previous questionnaire of the list is reused, only the first question of a new abbreviation is added.
+        :param lstQuestionnaires: list of questionnaire objects
+        :return: list of errorlists, one per questionnaire, see addQuestionnaire
+        """
+        with self.cacheLock:
+            try:
+                with self.databaseSQLite.transaction():
+                    dictQuestionIds = {}
 
-            return questionnaire, errorList
+                    for questionnaire in lstQuestionnaires:
+                        for question in questionnaire.questions:
+                            if question.id != -1:
+                                continue
 
-        except Exception as e:
-            self.logger.error("Error while addQuestionnaire:" + str(e))
-            raise
+                            questionId = dictQuestionIds.get(question.abbreviation)
+                            if questionId is None:
+                                questionId = self.__getQuestionIdByAbbreviation(question.abbreviation)
+                                if questionId == -1:
+                                    questionId = self.addQuestion(question).id
+                                dictQuestionIds[question.abbreviation] = questionId
+
+                            question.id = questionId
+
+                    lstErrorLists = [self.addQuestionnaire(questionnaire)[1] for questionnaire in lstQuestionnaires]
+
+                return lstErrorLists
+
+            except Exception as e:
+                self.logger.error("Error while addQuestionnaires:" + str(e))
+                self.__clearCache()
+                raise
 
     def editQuestionnaire(self, questionnaire: Questionnaire, purge: bool = False) -> [Questionnaire, list]:
         """
@@ -286,47 +511,37 @@ class DatabaseController:
         :param purge: true= remove question; false= remove only collection
         :return: questionnaire object include id´s, errorlist = list of questions which already in table
         """
-        position = 0
-        errorList = []
-
-        try:
-            for question in questionnaire.questions:
-                self.databaseSQLite.c.execute("SELECT COUNT(*) FROM tb_collections WHERE id_Q=?", (question.id,))
-                count = self.databaseSQLite.c.fetchone()[0]
+        with self.cacheLock:
+            try:
+                with self.databaseSQLite.transaction():
+                    for question in questionnaire.questions:
+                        self.databaseSQLite.c.execute("SELECT COUNT(*) FROM tb_collections WHERE id_Q=?", (question.id,))
+                        count = self.databaseSQLite.c.fetchone()[0]
 
-                self.__removeCollection(id_Q=question.id, id_QA=questionnaire.id)
+                        self.__removeCollection(id_Q=question.id, id_QA=questionnaire.id)
 
-                if count == 1 and purge:
-                    self.removeQuestion(question=question)
+                        if count == 1 and purge:
+                            self.removeQuestion(question=question)
 
-            self.__clearCollections(id_QA=questionnaire.id)
+                    self.__clearCollections(id_QA=questionnaire.id)
 
-            self.databaseSQLite.changeQuestionnaire(id_questionnaire=questionnaire.id, name=questionnaire.name, description=questionnaire.description, category=questionnaire.category.id)
+                    self.databaseSQLite.changeQuestionnaire(id_questionnaire=questionnaire.id, name=questionnaire.name, description=questionnaire.description, category=questionnaire.category.id)
 
-            for question in questionnaire.questions:
-                position += 1
+                    errorList = self.__addCollections(questionnaire=questionnaire)
 
-                try:
-                    if question.id == -1:
-                        question = self.addQuestion(question)
+                # created and lastChanged are set by the database
+                self.__refreshQuestionnaire(questionnaire.id)
 
-                    self.__addCollection(id_Q=question.id, id_QA=questionnaire.id, position=position, required=question.required)
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_questionnaires", "tb_collections")
 
-                except Exception as e:
-                    self.logger.info("Question already exist in tb_questions:" + str(e))
-                    errorList.append(question)
+                return questionnaire, errorList
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_questionnaires")
-                self.syncDatabasesRequired.append("tb_collections")
-                self.syncDatabasesThreadEvent.set()
-
-            return questionnaire, errorList
-
-        except Exception as e:
-            self.logger.error("Error while editQuestionnaire:" + str(e))
-            raise
+            except Exception as e:
+                self.logger.error("Error while editQuestionnaire:" + str(e))
+                self.__clearCache()
+                raise
 
     def removeQuestionnaire(self, questionnaire: Questionnaire, purge: bool = False) -> bool:
         """
@@ -335,95 +550,198 @@ class DatabaseController:
         :param purge: true= remove all; false= remove only collections and questionnaire
         :return: True if done / raise exception
         """
-        try:
-            for question in questionnaire.questions:
-                self.databaseSQLite.c.execute("SELECT COUNT(*) FROM tb_collections WHERE id_Q=?", (question.id,))
-                count = self.databaseSQLite.c.fetchone()[0]
+        with self.cacheLock:
+            try:
+                with self.databaseSQLite.transaction():
+                    for question in questionnaire.questions:
+                        self.databaseSQLite.c.execute("SELECT COUNT(*) FROM tb_collections WHERE id_Q=?", (question.id,))
+                        count = self.databaseSQLite.c.fetchone()[0]
 
-                self.__removeCollection(id_Q=question.id, id_QA=questionnaire.id)
+                        self.__removeCollection(id_Q=question.id, id_QA=questionnaire.id)
 
-                if count == 1 and purge:
-                    self.removeQuestion(question=question)
+                        if count == 1 and purge:
+                            self.removeQuestion(question=question)
 
-            self.databaseSQLite.removeQuestionnaire(questionnaireId=questionnaire.id)
+                    self.databaseSQLite.removeQuestionnaire(questionnaireId=questionnaire.id)
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_questionnaires")
-                self.syncDatabasesRequired.append("tb_collections")
-                self.syncDatabasesThreadEvent.set()
+                if self.cacheQuestionnaires is not None:
+                    self.cacheQuestionnaires.pop(questionnaire.id, None)
+                    self.cacheCollections.pop(questionnaire.id, None)
 
-            return True
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_questionnaires", "tb_collections")
 
-        except Exception as e:
-            self.logger.error("Error while removeQuestionnaire:" + str(e))
-            raise
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while removeQuestionnaire:" + str(e))
+                self.__clearCache()
+                raise
 
     def getQuestionnaires(self) -> list:
         """
         Methode to get all questionnaires from database
         :return: list of questionnaire objects
         """
-        lstQuestionnaireCategory = self.getQuestionnaireCategories()
-        lstQuestions = self.getQuestions()
-        lstColletionRows = self.databaseSQLite.getCollections()
+        with self.cacheLock:
+            # questions, questionnaires and collections are read from one snapshot
+            with self.databaseSQLite.transaction(write=False):
+                self.__loadQuestions()
+                self.__loadQuestionnaires()
 
-        lstQuestionnaires = []
+            lstQuestionnaires = []
+
+            for questionnaire in self.cacheQuestionnaires.values():
+                lstQuestionnaires.append(self.__assembleQuestionnaire(questionnaire))
+
+            return lstQuestionnaires
+
+    def __loadQuestionnaires(self):
+        """
+        Methode to load all questionnaires and their question ids from database once, further calls use the cache
+        """
+        if self.cacheQuestionnaires is not None:
+            return
+
+        cacheQuestionnaires = {}
+        cacheCollections = {}
 
         for questionnaireRow in self.databaseSQLite.getQuestionnaire():
-            currentCategory = None
-            for category in lstQuestionnaireCategory:
-                if category.id == questionnaireRow[3]:
-                    currentCategory = category
-                    break
-
-            currentQuestions = []
-            for collectionRow in lstColletionRows:
-                if collectionRow[1] == questionnaireRow[0]:
-                    for question in lstQuestions:
-                        if question.id == collectionRow[0]:
-                            currentQuestions.insert(collectionRow[2], question)
-
-            lstQuestionnaires.append(
-                Questionnaire(
-                    id=questionnaireRow[0],
-                    name=questionnaireRow[1],
-                    description=questionnaireRow[2],
-                    questions=currentQuestions,
-                    category=currentCategory,
-                    creationDate=questionnaireRow[4],
-                    lastEdited=questionnaireRow[5],
-                )
-            )
+            cacheQuestionnaires[questionnaireRow[0]] = self.__buildQuestionnaire(questionnaireRow)
+            cacheCollections[questionnaireRow[0]] = []
+
+        # rows are sorted by questionnaire and position
+        for collectionRow in self.databaseSQLite.getCollections():
+            if collectionRow[1] in cacheCollections:
+                cacheCollections[collectionRow[1]].append(collectionRow[0])
+
+        self.cacheQuestionnaires = cacheQuestionnaires
+        self.cacheCollections = cacheCollections
+
+    def __assembleQuestionnaire(self, questionnaire: Questionnaire) -> Questionnaire:
+        """
+        Methode to build a new questionnaire object with copies of the cached questions, so changes on it do not alter the cache
+        :param questionnaire: cached questionnaire object
+        :return: questionnaire object with its current questions
+        """
+        dictQuestions = self.__loadQuestions()
+
+        return Questionnaire(
+            id=questionnaire.id,
+            name=questionnaire.name,
+            description=questionnaire.description,
+            questions=[dictQuestions[questionId].copy() for questionId in self.cacheCollections[questionnaire.id] if questionId in dictQuestions],
+            category=questionnaire.category,
+            creationDate=questionnaire.creationDate,
+            lastEdited=questionnaire.lastEdited,
+        )
+
+    def __refreshQuestionnaire(self, questionnaireId: int):
+        """
+        Methode to reload one questionnaire and its question ids into the cache
+        :param questionnaireId: id of questionnaire
+        """
+        if self.cacheQuestionnaires is None:
+            return
+
+        questionnaireRow = self.databaseSQLite.getQuestionnaireById(questionnaireId)
+        if questionnaireRow is None:
+            self.cacheQuestionnaires.pop(questionnaireId, None)
+            self.cacheCollections.pop(questionnaireId, None)
+            return
 
-        return lstQuestionnaires
+        self.cacheQuestionnaires[questionnaireId] = self.__buildQuestionnaire(questionnaireRow)
+        self.cacheCollections[questionnaireId] = [collectionRow[0] for collectionRow in self.databaseSQLite.getCollectionsForQuestionnaire(id_QA=questionnaireId)]
+
+    def __buildQuestionnaire(self, questionnaireRow: tuple) -> Questionnaire:
+        """
+        Methode to build a questionnaire object without questions from a row of tb_questionnaires
+        :param questionnaireRow: row of tb_questionnaires
+        :return: questionnaire object
+        """
+        return Questionnaire(
+            id=questionnaireRow[0],
+            name=questionnaireRow[1],
+            description=questionnaireRow[2],
+            category=self.getQuestionnaireCategoryById(questionnaireRow[3]),
+            creationDate=questionnaireRow[4],
+            lastEdited=questionnaireRow[5],
+        )
 
     def getQuestionnaire(self, questionnaire: Questionnaire) -> Questionnaire:
         """
         Methode to get one special questionnaires from database
         :return: questionnaire object; if not exist = new Questionnare
         """
-        for questionnaireObject in self.getQuestionnaires():
-            if questionnaire.id == questionnaireObject.id:
+        with self.cacheLock:
+            questionnaireObject = self.getQuestionnaireById(questionnaire.id)
+            if questionnaireObject is not None:
                 return questionnaireObject
 
-        return questionnaire
+            return questionnaire
 
-    def __addCollection(self, id_Q: int, id_QA: int, position: int, required: int) -> bool:
+    def getQuestionnaireById(self, questionnaireId: int):
         """
-        Methode to add a new collection to the database
-        TODO: Parameter anpassen
-        :return: new category id
+        Methode to get one questionnaire by id
+        :param questionnaireId: id of questionnaire
+        :return: questionnaire object or None
         """
-        try:
-            self.databaseSQLite.addCollection(id_Q=id_Q, id_QA=id_QA, position=position, required=required)
+        with self.cacheLock:
+            if self.cacheQuestionnaires is not None:
+                if questionnaireId in self.cacheQuestionnaires:
+                    return self.__assembleQuestionnaire(self.cacheQuestionnaires[questionnaireId])
+                return None
 
-            return True
+            questionnaireRow = self.databaseSQLite.getQuestionnaireById(questionnaireId)
+            if questionnaireRow is None:
+                return None
+
+            questionnaire = self.__buildQuestionnaire(questionnaireRow)
+            for collectionRow in self.databaseSQLite.getCollectionsForQuestionnaire(id_QA=questionnaireId):
+                question = self.getQuestionById(collectionRow[0])
+                if question is not None:
+                    questionnaire.questions.append(question)
+
+            return questionnaire
+
+    def __addCollections(self, questionnaire: Questionnaire) -> list:
+        """
+        Methode to add the questions of a questionnaire as collections to the database, unsaved questions are added first
+        :param questionnaire: object of questionnaire include id
+        :return: errorlist = list of questions which already in table
+        """
+        position = 0
+        errorList = []
+        lstCollections = []
+        setQuestionIds = set()
+
+        for question in questionnaire.questions:
+            position += 1
+
+            try:
+                if question.id == -1:
+                    question = self.addQuestion(question)
+
+                if question.id in setQuestionIds:
+                    raise ValueError("Question already in questionnaire: " + str(question.abbreviation))
+
+                setQuestionIds.add(question.id)
+                lstCollections.append((question.id, questionnaire.id, position, question.required))
+
+            except Exception as e:
+                self.logger.info("Question already exist in tb_questions:" + str(e))
+                errorList.append(question)
+
+        try:
+            self.databaseSQLite.addCollections(collections=lstCollections)
 
         except Exception as e:
-            self.logger.error("Error while __addCollection:" + str(e))
+            self.logger.error("Error while __addCollections:" + str(e))
             raise
 
+        return errorList
+
     def __removeCollection(self, id_Q: int, id_QA: int) -> bool:
         """
         Methode to remove a exist collection in database
@@ -460,19 +778,22 @@ class DatabaseController:
         :param category: object of category
         :return: QuestionCategory object include id
         """
-        try:
-            category.id = self.databaseSQLite.addQuestionCategory(name=category.category, description=category.description)
+        with self.cacheLock:
+            try:
+                category.id = self.databaseSQLite.addQuestionCategory(name=category.category, description=category.description)
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_question_categories")
-                self.syncDatabasesThreadEvent.set()
+                if self.cacheQuestionCategories is not None:
+                    self.cacheQuestionCategories[category.id] = category
 
-            return category
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_question_categories")
 
-        except Exception as e:
-            self.logger.error("Error while addQuestionCategory:" + str(e))
-            raise
+                return category
+
+            except Exception as e:
+                self.logger.error("Error while addQuestionCategory:" + str(e))
+                raise
 
     def editQuestionCategory(self, category: QuestionCategory) -> QuestionCategory:
         """
@@ -480,19 +801,21 @@ class DatabaseController:
         :param category:  altered object of category
         :return: True if done / raise exception
         """
-        try:
-            self.databaseSQLite.changeQuestionCategory(id_categoryQ=category.id, name=category.category, description=category.description)
+        with self.cacheLock:
+            try:
+                self.databaseSQLite.changeQuestionCategory(id_categoryQ=category.id, name=category.category, description=category.description)
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_question_categories")
-                self.syncDatabasesThreadEvent.set()
+                self.__updateCachedCategory(self.cacheQuestionCategories, category)
 
-            return category
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_question_categories")
 
-        except Exception as e:
-            self.logger.error("Error while editQuestionCategory:" + str(e))
-            raise
+                return category
+
+            except Exception as e:
+                self.logger.error("Error while editQuestionCategory:" + str(e))
+                raise
 
     def removeQuestionCategory(self, category: QuestionCategory) -> bool:
         """
@@ -500,33 +823,38 @@ class DatabaseController:
         :param category:  current object of category
         :return: True if done / raise exception
         """
-        try:
-            self.databaseSQLite.removeQuestionCategory(categoryId=category.id)
+        with self.cacheLock:
+            try:
+                self.databaseSQLite.removeQuestionCategory(categoryId=category.id)
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_question_categories")
-                self.syncDatabasesThreadEvent.set()
+                if self.cacheQuestionCategories is not None:
+                    self.cacheQuestionCategories.pop(category.id, None)
+                self.cacheQuestions = None
 
-            return True
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_question_categories")
 
-        except Exception as e:
-            self.logger.error("Error while removeQuestionCategory:" + str(e))
-            raise
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while removeQuestionCategory:" + str(e))
+                raise
 
     def getQuestionCategories(self) -> list:
         """
         Methode to get all Categories from database
         :return: list of category objects
         """
+        with self.cacheLock:
+            if self.cacheQuestionCategories is None:
+                self.cacheQuestionCategories = {}
 
-        lstQuestionCategories = []
-
-        for row in self.databaseSQLite.getQuestionCategories():
-            category = QuestionCategory(id=row[0], category=row[1], description=row[2])
-            lstQuestionCategories.append(category)
+                for row in self.databaseSQLite.getQuestionCategories():
+                    category = QuestionCategory(id=row[0], category=row[1], description=row[2])
+                    self.cacheQuestionCategories[category.id] = category
 
-        return lstQuestionCategories
+            return list(self.cacheQuestionCategories.values())
 
     def addQuestionnaireCategory(self, category: QuestionnaireCategory) -> QuestionnaireCategory:
         """
@@ -534,19 +862,22 @@ class DatabaseController:
         :param category: object of category
         :return: QuestionnaireCategory object include id
         """
-        try:
-            category.id = self.databaseSQLite.addQuestionnaireCategory(name=category.category, description=category.description)
+        with self.cacheLock:
+            try:
+                category.id = self.databaseSQLite.addQuestionnaireCategory(name=category.category, description=category.description)
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_questionnaire_categories")
-                self.syncDatabasesThreadEvent.set()
+                if self.cacheQuestionnaireCategories is not None:
+                    self.cacheQuestionnaireCategories[category.id] = category
 
-            return category
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_questionnaire_categories")
 
-        except Exception as e:
-            self.logger.error("Error while addQuestionnaireCategory:" + str(e))
-            raise
+                return category
+
+            except Exception as e:
+                self.logger.error("Error while addQuestionnaireCategory:" + str(e))
+                raise
 
     def editQuestionnaireCategory(self, category: QuestionnaireCategory) -> QuestionnaireCategory:
         """
@@ -554,19 +885,21 @@ class DatabaseController:
         :param category:  altered object of category
         :return: True if done / raise exception
         """
-        try:
-            self.databaseSQLite.changeQuestionnaireCategory(id_categoryQA=category.id, name=category.category, description=category.description)
+        with self.cacheLock:
+            try:
+                self.databaseSQLite.changeQuestionnaireCategory(id_categoryQA=category.id, name=category.category, description=category.description)
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_questionnaire_categories")
-                self.syncDatabasesThreadEvent.set()
+                self.__updateCachedCategory(self.cacheQuestionnaireCategories, category)
 
-            return category
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_questionnaire_categories")
 
-        except Exception as e:
-            self.logger.error("Error while editQuestionnaireCategory:" + str(e))
-            raise
+                return category
+
+            except Exception as e:
+                self.logger.error("Error while editQuestionnaireCategory:" + str(e))
+                raise
 
     def removeQuestionnaireCategory(self, category: QuestionnaireCategory) -> bool:
         """
@@ -574,103 +907,188 @@ class DatabaseController:
         :param category:  current object of category
         :return: True if done / raise exception
         """
-        try:
-            self.databaseSQLite.removeQuestionnaireCategory(categoryId=category.id)
+        with self.cacheLock:
+            try:
+                self.databaseSQLite.removeQuestionnaireCategory(categoryId=category.id)
 
-            # invoke to sync database
-            if self.databaseMySQL:
-                self.syncDatabasesRequired.append("tb_questionnaire_categories")
-                self.syncDatabasesThreadEvent.set()
+                if self.cacheQuestionnaireCategories is not None:
+                    self.cacheQuestionnaireCategories.pop(category.id, None)
+                self.cacheQuestionnaires = None
+                self.cacheCollections = None
 
-            return True
+                # invoke to sync database
+                if self.syncQueue:
+                    self.syncQueue.put("tb_questionnaire_categories")
 
-        except Exception as e:
-            self.logger.error("Error while removeQuestionnaireCategory:" + str(e))
-            raise
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while removeQuestionnaireCategory:" + str(e))
+                raise
+
+    def getQuestionCategoryById(self, categoryId: int):
+        """
+        Methode to get one question category by id
+        :param categoryId: id of category
+        :return: category object or None
+        """
+        with self.cacheLock:
+            self.getQuestionCategories()
+
+            return self.cacheQuestionCategories.get(categoryId)
 
     def getQuestionnaireCategories(self) -> list:
         """
         Methode to get all Categories from database
         :return: list of category objects
         """
-        lstQuestionnaireCategories = []
+        with self.cacheLock:
+            if self.cacheQuestionnaireCategories is None:
+                self.cacheQuestionnaireCategories = {}
+
+                for row in self.databaseSQLite.getQuestionnaireCategories():
+                    category = QuestionCategory(id=row[0], category=row[1], description=row[2])
+                    self.cacheQuestionnaireCategories[category.id] = category
+
+            return list(self.cacheQuestionnaireCategories.values())
+
+    def __updateCachedCategory(self, cacheCategories: dict, category):
+        """
+        Methode to apply an altered category to the cached category object, so all objects referencing it stay valid
+        :param cacheCategories: identity map of the category table
+        :param category: altered object of category
+        """
+        if cacheCategories is None:
+            return
+
+        cachedCategory = cacheCategories.get(category.id)
+        if cachedCategory is None:
+            cacheCategories[category.id] = category
+        else:
+            cachedCategory.category = category.category
+            cachedCategory.description = category.description
 
-        for row in self.databaseSQLite.getQuestionnaireCategories():
-            category = QuestionCategory(id=row[0], category=row[1], description=row[2])
-            lstQuestionnaireCategories.append(category)
+    def getQuestionnaireCategoryById(self, categoryId: int):
+        """
+        Methode to get one questionnaire category by id
+        :param categoryId: id of category
+        :return: category object or None
+        """
+        with self.cacheLock:
+            self.getQuestionnaireCategories()
 
-        return lstQuestionnaireCategories
+            return self.cacheQuestionnaireCategories.get(categoryId)
 
     def getTypes(self) -> list:
         """
         Methode to get all types from database
         :return: list of types objects
         """
-        lstTypes = []
+        with self.cacheLock:
+            if self.cacheTypes is None:
+                self.cacheTypes = {}
 
-        for row in self.databaseSQLite.getTypes():
-            questionType = QuestionType(id=row[0], typeName=row[1], displayName=row[2], options=bool(row[3]))
-            lstTypes.append(questionType)
+                for row in self.databaseSQLite.getTypes():
+                    questionType = QuestionType(id=row[0], typeName=row[1], displayName=row[2], options=bool(row[3]))
+                    self.cacheTypes[questionType.id] = questionType
 
-        return lstTypes
+            return list(self.cacheTypes.values())
 
-    def syncDatabases(self, event, destinationDatabase):
+    def syncDatabases(self, syncQueue: SyncQueue, destinationDatabase):
         """
-        Method to sync two databases
-        :param event: Threadevent
+        Method to sync two databases in both directions, runs until the queue is closed.
+        Every change of the SQLite database is recorded in tb_changelog, only rows changed after the last
+        change acknowledged by the destination database are shipped. The changes of other workstations are
+        pulled by their version after every local change and at least every pullInterval seconds.
+        After connecting, the tables are reconciled once by checksums.
+        Conflicts are resolved per row by updatedAt, the last writer wins.
+        :param syncQueue: queue of dirty tables
         :param destinationDatabase: destination database
         """
-        time.sleep(5)
-
-        databaseSQLite = DatabaseSQLite(self.logger, self.pathSQLiteDatabase)
-
-        t = threading.currentThread()
+        syncEngine = SyncEngine(self.logger, self.pathSQLiteDatabase, destinationDatabase, self.sqlitePragmas)
+        loop = asyncio.new_event_loop()
+        reconciled = False
 
-        while not self.mysqlDisconnect:
-            if event.wait():
-                while len(self.syncDatabasesRequired) > 0:
-                    try:
-                        nextRequired = self.syncDatabasesRequired.pop()
+        while syncQueue.get(timeout=self.pullInterval) is not None:
+            if not destinationDatabase.connected:
+                continue
 
-                        if nextRequired == "tb_question_types":
-                            destinationDatabase.clearTypes()
+            try:
+                count = loop.run_until_complete(syncEngine.syncAll(reconcile=not reconciled))
+                reconciled = True
 
-                            for row in databaseSQLite.getTypes():
-                                destinationDatabase.addType(row[0], row[1], row[2], row[3])
+                if count > 0:
+                    self.__clearCache()
 
-                        elif nextRequired == "tb_question_categories":
-                            destinationDatabase.clearQuestionCategories()
+                # the connection of this controller belongs to the GUI thread
+                lstConflicts = loop.run_until_complete(syncEngine.getConflicts())
+                if len(lstConflicts) > 0:
+                    self.logger.warning(str(len(lstConflicts)) + " rows not synchronised because of conflicts, see mhf sync")
 
-                            for row in databaseSQLite.getQuestionCategories():
-                                destinationDatabase.addQuestionCategory(row[0], row[1], row[2])
+            except Exception as e:
+                self.logger.warning("Warning while sync databases: " + str(e))
 
-                        elif nextRequired == "tb_questionnaire_categories":
-                            destinationDatabase.clearQuestionnaireCategories()
+        syncEngine.close()
+        loop.close()
 
-                            for row in databaseSQLite.getQuestionnaireCategories():
-                                destinationDatabase.addQuestionnaireCategory(row[0], row[1], row[2])
+    def syncWithExtern(self):
+        """
+        Method to push the local changes and pull the changes of other workstations now
+        """
+        if self.syncQueue:
+            self.syncQueue.putAll()
 
-                        elif nextRequired == "tb_questions":
-                            destinationDatabase.clearQuestions()
+    def syncOnceWithExtern(self, host: str, port: int, user: str, password: str, database: str, reconcile: bool = True) -> int:
+        """
+        Method to sync once with an extern database and to wait until it is done, e.g. for a batch job without connectToExtern
+        :keyword host: IPAddress MySQL Server
+        :keyword port: Port MySQL Server
+        :keyword user: Username MySQL Server
+        :keyword password: Password MySQL Server
+        :keyword database: name of database
+        :keyword reconcile: True to compare all tables by checksums, otherwise only the changes are shipped and pulled
+        :return: number of changed rows in the SQLite database
+        """
+        destinationDatabase = DatabaseMySQL(self.logger, host, port, user, password, database)
+        syncEngine = SyncEngine(self.logger, self.pathSQLiteDatabase, destinationDatabase, self.sqlitePragmas)
+        loop = asyncio.new_event_loop()
 
-                            for row in databaseSQLite.getQuestions():
-                                destinationDatabase.addQuestion(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9], row[10])
+        try:
+            count = loop.run_until_complete(syncEngine.syncAll(reconcile=reconcile))
+            if count > 0:
+                self.__clearCache()
 
-                        elif nextRequired == "tb_questionnaires":
-                            destinationDatabase.clearQuestionnaires()
+            self.databaseSQLite.removeAcknowledgedChanges()
 
-                            for row in databaseSQLite.getQuestionnaire():
-                                destinationDatabase.addQuestionnaire(row[0], row[1], row[2], row[3])
+        except Exception as e:
+            self.logger.error("Error while sync with extern database: " + str(e))
+            raise
 
-                        elif nextRequired == "tb_collections":
-                            destinationDatabase.clearCollections()
+        finally:
+            syncEngine.close()
+            loop.close()
+            destinationDatabase.disconnet()
 
-                            for row in databaseSQLite.getCollections():
-                                destinationDatabase.addCollection(row[0], row[1], row[2], row[3])
+        return count
 
-                    except Exception as e:
-                        self.logger.warning("Warning while sync databases: " + str(e))
+    def getSyncConflicts(self) -> list:
+        """
+        Method to get the rows the extern database did not accept, e.g. a question whose abbreviation belongs to another question there
+        :return: list of (target, tableName, key1, key2, reason, detectedAt), see DatabaseSQLite.getSyncConflicts
+        """
+        return self.databaseSQLite.getSyncConflicts()
 
-                event.clear()
+    def getStatistics(self) -> dict:
+        """
+        Method to get the size of the local database
+        :return: dict, see DatabaseSQLite.getStatistics
+        """
+        return self.databaseSQLite.getStatistics()
 
-        self.mysqlDisconnect = False
+    def vacuum(self) -> bool:
+        """
+        Method to remove the acknowledged changes and to compact the local database file
+        :return: True / exception
+        """
+        self.databaseSQLite.removeAcknowledgedChanges()
+        return self.databaseSQLite.vacuum()
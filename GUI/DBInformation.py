@@ -91,8 +91,7 @@ class DBWindow(QtWidgets.QMainWindow):
             return
 
         if self.parent.questionnaireController.database.databaseMySQL:
-            if self.parent.questionnaireController.database.databaseMySQL.connected:
-                self.parent.questionnaireController.database.disconnectFromExtern()
+            self.parent.questionnaireController.database.disconnectFromExtern()
 
         if host and port and user and password and database:
             updateConfig("NetworkDatabaseAddress", host, "DATABASE")
@@ -361,25 +361,20 @@ class Library(QtWidgets.QMainWindow):
             self.updateAll()
             return
 
-        # Use set to avoid duplicates and improve runTime with larger dataset.
-        questions = set()
+        # Text and abbreviation are searched with the search index of the database, typos are tolerated
+        questions = self.parent.questionController.findByName(searchText)
 
-        # Find all Questions where text fits in one of the first four columns
+        # Use set of ids to avoid duplicates, the search returns copies, not the questions of the table
+        foundIds = {question.id for question in questions}
+
+        # Find all Questions where text fits in the category or type column
         items = self.ui.tableQTab.findItems(searchText, QtCore.Qt.MatchContains, 0)
+        items += self.ui.tableQTab.findItems(searchText, QtCore.Qt.MatchContains, 1)
         for item in items:
-            questions.add(item.returnQuestion())
-        itemTyp = self.ui.tableQTab.findItems(searchText, QtCore.Qt.MatchContains, 1)
-        for item in itemTyp:
-            questions.add(item.returnQuestion())
-        itemDescription = self.ui.tableQTab.findItems(searchText, QtCore.Qt.MatchContains, 2)
-        for item in itemDescription:
-            questions.add(item.returnQuestion())
-        itemAbbrv = self.ui.tableQTab.findItems(searchText, QtCore.Qt.MatchContains, 3)
-        for item in itemAbbrv:
-            questions.add(item.returnQuestion())
+            if item.returnQuestion().id not in foundIds:
+                foundIds.add(item.returnQuestion().id)
+                questions.append(item.returnQuestion())
 
-        # cast in order to use our functions (list necessary)
-        questions = list(questions)
         self.updateQTab(questions)
 
     def updateQTab(self, questions: list):
@@ -21,6 +21,7 @@ from Question import Question
 from QuestionCategory import QuestionCategory
 from Questionnaire import Questionnaire
 from QuestionnaireController import QuestionnaireController
+from QuestionnaireImporter import QuestionnaireImporter
 from QuestionController import QuestionController
 from fileHandler import readConfigFile
 
@@ -181,6 +182,7 @@ class MainFrame(QtWidgets.QMainWindow):
         self.ui.actionNewQuestionnaireCategory.triggered.connect(lambda: self.newQACat())
         self.ui.actionDatenbank_anzeigen_hinzuf_gen.triggered.connect(lambda: self.openDB())
         self.ui.actionDatei_importieren.triggered.connect(lambda: self.importQA())
+        self.ui.actionOrdner_importieren.triggered.connect(lambda: self.importDirectory())
         self.ui.actionFragebogen_exportieren.triggered.connect(lambda: self.exportQA())
         self.ui.actionProgramm_beenden_2.triggered.connect(lambda: sys.exit())
         self.ui.actionFragenbibliothek.triggered.connect(lambda: self.openFBib())
@@ -250,6 +252,25 @@ class MainFrame(QtWidgets.QMainWindow):
         self.updateQuestionList()
         self.setQuestionnaireName(labelname)
 
+    def importDirectory(self, directory: str = None):
+        """
+        Imports all questionnaires of the selected directory into the database and shows the files with errors
+        """
+        if not directory:
+            options = QFileDialog.Options()
+            options |= QFileDialog.DontUseNativeDialog
+            directory = QFileDialog.getExistingDirectory(self, "Anamnesebögen - Ordner importieren", "", options=options)
+
+        if directory:
+            importer = QuestionnaireImporter(self.questionnaireController.database, self.questionnaireController.logger)
+            report = importer.importDirectory(Path(directory))
+
+            errorFiles = [path.name for path, (errors, notes) in report.items() if len(errors) > 0]
+            if len(errorFiles) > 0:
+                self.popUp("Warnung", "Folgende Dateien wurden nicht vollständig importiert (Details im Log):\n" + "\n".join(errorFiles))
+            else:
+                self.popUp("Import", str(len(report)) + " Fragebögen wurden importiert.")
+
     def saveAfterImport(self):
         """
         Simple Dialog that asks the user if he wants to
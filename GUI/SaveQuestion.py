@@ -89,7 +89,9 @@ class SaveQuestion(QtWidgets.QMainWindow):
             self.createNoOptions()
             self.ui.comboBox_fragentyp.setCurrentIndex(2)
         else:
-            self.ui.comboBox_kategorie.setCurrentIndex(self.currentQuestion.category.id - 1)
+            # category ids are not consecutive, they are allocated per workstation
+            index = self.ui.comboBox_kategorie.findText(self.currentQuestion.category.category)
+            self.ui.comboBox_kategorie.setCurrentIndex(index)
             self.ui.comboBox_fragentyp.setCurrentIndex(self.currentQuestion.type.id - 1)
             self.ui.lineEdit_beschreibung.setText(question.text)
             self.ui.lineEdit_kurzbeschreibung.setText(question.abbreviation)
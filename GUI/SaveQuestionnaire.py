@@ -50,7 +50,9 @@ class SaveQuestionnaire(QtWidgets.QMainWindow):
             self.ui.comboBox_kategorie.addItem(category.category)
 
         if self.questionnaire is not None:
-            self.ui.comboBox_kategorie.setCurrentIndex(self.questionnaire.category.id - 1)
+            # category ids are not consecutive, they are allocated per workstation
+            index = self.ui.comboBox_kategorie.findText(self.questionnaire.category.category)
+            self.ui.comboBox_kategorie.setCurrentIndex(index)
             self.ui.lineEdit_name.setText(self.questionnaire.name)
             self.ui.lineEdit_beschreibung.setText(self.questionnaire.description)
 
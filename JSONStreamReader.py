@@ -0,0 +1,146 @@
+import json
+
+
+class JSONStreamReader:
+    """
+    Class representing an incremental reader for one array of a JSON object, e.g. the question array of a form file.
+    The file is read in chunks and every element is decoded as soon as it is complete, so only the current element
+    and one chunk are held in memory. Every character is decoded once, a chunk is only re-read while an element
+    is incomplete and the read size grows with every retry to keep the throughput linear.
+    """
+
+    WHITESPACE: str = " \t\n\r"
+    # characters a number may continue with, a number split at one of them is decoded shorter
+    NUMBER_CHARACTERS: str = "0123456789+-.eE"
+
+    def __init__(self, file, chunkSize: int = 65536):
+        """
+        Constructor
+        :param file: text file object opened for reading
+        :param chunkSize: number of characters read at once
+        """
+        self.file = file
+        self.chunkSize = chunkSize
+        self.decoder = json.JSONDecoder()
+        self.buffer: str = ""
+        self.pos: int = 0
+        self.eof: bool = False
+
+    def __fill(self, size: int) -> bool:
+        """
+        Method to append the next characters of the file to the buffer, consumed characters are dropped
+        :param size: number of characters to read
+        :return: False if the end of the file is reached
+        """
+        if self.eof:
+            return False
+
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def __peek(self) -> str:
+        """
+        Method to skip whitespace and to return the next character without consuming it
+        :return: the next character, empty at the end of the file
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self.WHITESPACE:
+                self.pos += 1
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.__fill(self.chunkSize):
+                return ""
+
+    def __expect(self, characters: str) -> str:
+        """
+        Method to consume the next character, which has to be one of the given characters
+        :param characters: allowed characters
+        :return: the consumed character
+        """
+        character = self.__peek()
+
+        if character == "" or character not in characters:
+            raise json.JSONDecodeError("Expecting one of " + repr(characters), self.buffer, self.pos)
+
+        self.pos += 1
+        return character
+
+    def __decodeValue(self):
+        """
+        Method to decode the next complete JSON value
+        :return: the decoded value
+        """
+        self.__peek()
+        size = self.chunkSize
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.__fill(size):
+                    raise
+                size *= 2
+                continue
+
+            # a number may continue in the next chunk, also if the buffer ends within its fraction or exponent
+            rest = end
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                while rest < len(self.buffer) and self.buffer[rest] in self.NUMBER_CHARACTERS:
+                    rest += 1
+
+            if rest == len(self.buffer) and self.__fill(size):
+                size *= 2
+                continue
+
+            self.pos = end
+            return value
+
+    def iterArray(self, key: str):
+        """
+        Method to iterate the elements of the array stored under the given key of the top-level object.
+        Other values of the object are decoded and dropped.
+        :param key: key of the array, e.g. "question"
+        :return: generator of the decoded elements
+        """
+        found = False
+        self.__expect("{")
+
+        if self.__peek() == "}":
+            self.pos += 1
+        else:
+            while True:
+                if self.__peek() != '"':
+                    raise json.JSONDecodeError("Expecting property name enclosed in double quotes", self.buffer, self.pos)
+                currentKey = self.__decodeValue()
+                self.__expect(":")
+
+                if currentKey == key and self.__peek() == "[":
+                    found = True
+                    self.pos += 1
+
+                    if self.__peek() == "]":
+                        self.pos += 1
+                    else:
+                        while True:
+                            yield self.__decodeValue()
+                            if self.__expect(",]") == "]":
+                                break
+                else:
+                    self.__decodeValue()
+
+                if self.__expect(",}") == "}":
+                    break
+
+        if self.__peek() != "":
+            raise json.JSONDecodeError("Extra data", self.buffer, self.pos)
+
+        if not found:
+            raise KeyError(key)
@@ -46,3 +46,22 @@ class Question:
         self.comment = comment
         self.id = id
         self.category = category
+
+    def copy(self):
+        """
+        Method to create an independent copy, e.g. to change it without altering the cached question of the database
+        :return: question object with its own list of options, type and category are shared
+        """
+        return Question(
+            text=self.text,
+            type=self.type,
+            options=list(self.options),
+            required=self.required,
+            dependent_on=self.dependent_on,
+            expected_answer=self.expected_answer,
+            abbreviation=self.abbreviation,
+            score=self.score,
+            comment=self.comment,
+            id=self.id,
+            category=self.category,
+        )
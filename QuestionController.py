@@ -57,30 +57,14 @@ class QuestionController:
 
     def findByName(self, key: str, category: QuestionCategory = None) -> list:
         """
-        Method to search for a substring / keyword in the question text of questions.
+        Method to search for keywords in the question text, abbreviation and options of questions.
         Also checks if passed for category.
         :param category: If present the category which is filtered else looking in all questions.
         :param key: Keyword that should appear in the question text
         :return: List of questions that contain the keyword
         """
         try:
-            filteredQuestions: list = []
-            for question in self.questions():
-                if category:
-                    if key:
-                        if question.category.id == category.id:
-                            if key.lower() in question.text.lower():
-                                filteredQuestions.append(question)
-                    else:
-                        if question.category.id == category.id:
-                            filteredQuestions.append(question)
-                else:
-                    if key:
-                        if key.lower() in question.text.lower():
-                            filteredQuestions.append(question)
-                    else:
-                        filteredQuestions = self.questions()
-            return filteredQuestions
+            return self.database.searchQuestions(query=key, category=category)
         except Exception as exp:
             self.logger.error(f"Error while finding question: {exp}")
             raise
@@ -92,9 +76,7 @@ class QuestionController:
         :return: Specific category with the associated ID
         """
         try:
-            for category in self.categories():
-                if category.id == catID:
-                    return category
+            return self.database.getQuestionCategoryById(catID)
         except Exception as exp:
             self.logger.error(f"Error while getting Question category: {exp}")
             raise
@@ -5,6 +5,7 @@ from DatabaseController import DatabaseController
 from Question import Question
 from Questionnaire import Questionnaire
 from QuestionnaireCategory import QuestionnaireCategory
+from QuestionnaireExporter import QuestionnaireExporter
 from QuestionnaireObserver import QuestionnaireObserver
 from fileHandler import writeToFile, readFromFile
 
@@ -87,13 +88,37 @@ class QuestionnaireController:
         The edit consists of requirement adjustions specifically for the questionnaire.
         :return:
         """
-        tempQuestionnaire = self.questionnaire
+        # the questions are copied, the requirement adjustions must not alter the questions of the active questionnaire or the database
+        tempQuestionnaire = Questionnaire(
+            id=self.questionnaire.id,
+            name=self.questionnaire.name,
+            description=self.questionnaire.description,
+            questions=[question.copy() for question in self.questionnaire.questions],
+            category=self.questionnaire.category,
+            creationDate=self.questionnaire.creationDate,
+            lastEdited=self.questionnaire.lastEdited,
+        )
         for entry in self.requirements:
             for question in tempQuestionnaire.questions:
-                if entry[0].abbr == question.abbreviation:
+                if entry[0].abbreviation == question.abbreviation:
                     question.required = entry[1]
         return writeToFile(pathToFile=path, questionnaire=tempQuestionnaire)
 
+    def exportAllQuestionnaires(self, path: Path, archive: bool = False, workers: int = None) -> dict:
+        """
+        Method to export every questionnaire of the database, read from one snapshot, to a directory or a zip archive.
+        :param path: target directory or path of the zip archive
+        :param archive: True to write one zip archive instead of single files
+        :param workers: number of encoding processes, None = number of CPUs
+        :return: report, dict file name -> error message, None if the file was written
+        """
+        exporter = QuestionnaireExporter(logger=self.logger, workers=workers)
+        lstQuestionnaires = self.getAllQuestionnaires()
+
+        if archive:
+            return exporter.exportToArchive(lstQuestionnaires, path)
+        return exporter.exportToDirectory(lstQuestionnaires, path)
+
     def getAllQuestionnaires(self):
         """
         Method to get all questionnaires as questionnaire objects from the database.
@@ -107,9 +132,7 @@ class QuestionnaireController:
         :param catID: the id of the searched questionnaireCategory
         :return: the questionnaireCategory with given ID
         """
-        for category in self.categories():
-            if category.id == catID:
-                return category
+        return self.database.getQuestionnaireCategoryById(catID)
 
     def getDefaultCategory(self) -> QuestionnaireCategory:
         """
@@ -241,7 +264,7 @@ class QuestionnaireController:
         """
         found = False
         for entry in self.requirements:
-            if entry[0].abbr == question.abbreviation:
+            if entry[0].abbreviation == question.abbreviation:
                 entry[1] = not entry[1]
                 found = True
         if not found:
@@ -253,6 +276,6 @@ class QuestionnaireController:
         :param questionToUpdate: the question that has been updated
         :return:
         """
-        for question in self.questionnaire.questions:
+        for position, question in enumerate(self.questionnaire.questions):
             if question.id == questionToUpdate.id:
-                self.questionnaire.questions[self.questionnaire.questions.index(question)] = self.database.getQuestionById(question.id)
+                self.questionnaire.questions[position] = self.database.getQuestionById(question.id)
@@ -0,0 +1,183 @@
+import io
+import logging
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from Questionnaire import Questionnaire
+from fileHandler import FileHandlerStash, writeQuestionnaireToStream, writeToFile
+
+
+def initExportWorker(loggerName: str):
+    """
+    Function to prepare a worker process, the fileHandler logs to the logger of the same name
+    :param loggerName: name of the logger of the main process
+    """
+    if FileHandlerStash.LOGGER is None:
+        FileHandlerStash.LOGGER = logging.getLogger(loggerName)
+
+
+def exportToFile(pathToFile: Path, questionnaire: Questionnaire):
+    """
+    Function executed by a worker process to write one questionnaire to its file
+    :param pathToFile: path of the file
+    :param questionnaire: questionnaire object
+    """
+    writeToFile(pathToFile=pathToFile, questionnaire=questionnaire)
+
+
+def exportToString(questionnaire: Questionnaire) -> str:
+    """
+    Function executed by a worker process to encode one questionnaire for an archive
+    :param questionnaire: questionnaire object
+    :return: content of the JSON file
+    """
+    if len(questionnaire.questions) == 0:
+        raise Exception("No questions in questionnaire.")
+
+    stream = io.StringIO()
+    writeQuestionnaireToStream(stream, questionnaire)
+    return stream.getvalue()
+
+
+class QuestionnaireExporter:
+    """
+    Class exporting a batch of questionnaires as JSON files, e.g. all questionnaires for the nightly archive.
+    The questionnaires are encoded in a process pool, at most a few of them per worker are in flight at once.
+    The files are written to a directory or streamed into one zip archive. It needs no GUI.
+    """
+
+    def __init__(self, logger, workers: int = None):
+        """
+        Constructor
+        :param logger: logger Object
+        :param workers: number of encoding processes, None = number of CPUs, 1 = encode in this process
+        """
+        self.logger = logger
+        self.workers = workers or os.cpu_count() or 1
+
+        if FileHandlerStash.LOGGER is None:
+            FileHandlerStash.LOGGER = logger
+
+    @staticmethod
+    def fileNames(lstQuestionnaires: list) -> list:
+        """
+        Method to derive a unique file name per questionnaire from its name, the import uses the name again
+        :param lstQuestionnaires: list of questionnaire objects
+        :return: list of file names, e.g. "Anamnese.json" or "Anamnese (12).json" for a second questionnaire of that name,
+        "Anamnese (12) (2).json" if that is taken as well
+        """
+        lstFileNames = []
+        setFileNames = set()
+
+        for questionnaire in lstQuestionnaires:
+            name = re.sub(r'[\x00-\x1f<>:"/\\|?*]', "_", str(questionnaire.name)).strip(" .") or "Fragebogen"
+
+            fileName = name + ".json"
+            if fileName.casefold() in setFileNames:
+                name = name + " (" + str(questionnaire.id) + ")"
+                fileName = name + ".json"
+
+            counter = 1
+            while fileName.casefold() in setFileNames:
+                counter += 1
+                fileName = name + " (" + str(counter) + ").json"
+
+            setFileNames.add(fileName.casefold())
+            lstFileNames.append(fileName)
+
+        return lstFileNames
+
+    def exportToDirectory(self, lstQuestionnaires: list, directory: Path) -> dict:
+        """
+        Method to write every questionnaire to its own file in the directory
+        :param lstQuestionnaires: list of questionnaire objects
+        :param directory: target directory, created if missing
+        :return: report, dict file name -> error message, None if the file was written
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        lstFileNames = self.fileNames(lstQuestionnaires)
+        lstArgs = [(directory / fileName, questionnaire) for fileName, questionnaire in zip(lstFileNames, lstQuestionnaires)]
+
+        dictReport = {}
+        for fileName, (result, error) in zip(lstFileNames, self.__map(exportToFile, lstArgs)):
+            dictReport[fileName] = error
+
+        return self.__logReport(dictReport)
+
+    def exportToArchive(self, lstQuestionnaires: list, pathToArchive: Path) -> dict:
+        """
+        Method to write all questionnaires into one zip archive, every file is compressed while it is written
+        :param lstQuestionnaires: list of questionnaire objects
+        :param pathToArchive: path of the zip archive, an existing archive is replaced
+        :return: report, dict file name -> error message, None if the file was written
+        """
+        lstFileNames = self.fileNames(lstQuestionnaires)
+        lstArgs = [(questionnaire,) for questionnaire in lstQuestionnaires]
+
+        dictReport = {}
+        with zipfile.ZipFile(pathToArchive, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for fileName, (content, error) in zip(lstFileNames, self.__map(exportToString, lstArgs)):
+                if error is None:
+                    with archive.open(fileName, "w") as entry:
+                        entry.write(content.encode("utf-8"))
+                dictReport[fileName] = error
+
+        return self.__logReport(dictReport)
+
+    def __map(self, function, lstArgs: list):
+        """
+        Method to execute the function for every argument tuple, in parallel if there are several workers.
+        Only a few calls per worker are submitted ahead, so the results do not pile up in memory.
+        :param function: module level function, it is called in a worker process
+        :param lstArgs: list of argument tuples
+        :return: generator of (result, error message) in the order of the arguments
+        """
+        if self.workers == 1 or len(lstArgs) < 2:
+            for args in lstArgs:
+                yield self.__call(function, args)
+            return
+
+        window = self.workers * 4
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=initExportWorker, initargs=(self.logger.name,)) as executor:
+            lstFutures = [executor.submit(function, *args) for args in lstArgs[:window]]
+
+            for n in range(len(lstArgs)):
+                if n + window < len(lstArgs):
+                    lstFutures.append(executor.submit(function, *lstArgs[n + window]))
+
+                future = lstFutures[n]
+                lstFutures[n] = None
+                try:
+                    yield future.result(), None
+                except Exception as e:
+                    yield None, str(e)
+
+    @staticmethod
+    def __call(function, args: tuple) -> tuple:
+        """
+        Method to execute the function in this process
+        :return: (result, error message)
+        """
+        try:
+            return function(*args), None
+        except Exception as e:
+            return None, str(e)
+
+    def __logReport(self, dictReport: dict) -> dict:
+        """
+        Method to log the failed files of a report
+        :param dictReport: report, dict file name -> error message
+        :return: the report
+        """
+        for fileName, error in dictReport.items():
+            if error is not None:
+                self.logger.warning("Error while export " + fileName + ": " + error)
+
+        self.logger.info("Exported " + str(sum(1 for error in dictReport.values() if error is None)) + " of " + str(len(dictReport)) + " questionnaires")
+
+        return dictReport
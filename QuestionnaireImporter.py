@@ -0,0 +1,165 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from DatabaseController import DatabaseController
+from Questionnaire import Questionnaire
+from fileHandler import (
+    FileHandlerStash,
+    getQuestionnaireCategoryByID,
+    questionFromJSON,
+    readJSONQuestionsFromFile,
+    setQuestionCategories,
+    setQuestionnaireCategories,
+    setTypes,
+)
+
+
+class QuestionnaireImporter:
+    """
+    Class importing a batch of questionnaire JSON files, e.g. the migration of legacy forms.
+    The files are parsed in a process pool, the questions are deduplicated by abbreviation across the whole batch
+    and all questionnaires are written to the database in one transaction. It needs no GUI.
+    """
+
+    def __init__(self, database: DatabaseController, logger, workers: int = None):
+        """
+        Constructor
+        :param database: DatabaseController the questionnaires are added to
+        :param logger: logger Object
+        :param workers: number of parsing processes, None = number of CPUs, 1 = parse in this process
+        """
+        self.database = database
+        self.logger = logger
+        self.workers = workers or os.cpu_count() or 1
+
+        # the lookup tables of the fileHandler are filled by ConfigInit, unless used headless
+        if FileHandlerStash.LOGGER is None:
+            FileHandlerStash.LOGGER = logger
+        if len(FileHandlerStash.TYPES_BY_NAME) == 0:
+            setTypes(types=database.getTypes())
+        if len(FileHandlerStash.QUESTION_CATEGORIES_BY_ID) == 0:
+            setQuestionCategories(categories=database.getQuestionCategories())
+        if len(FileHandlerStash.QUESTIONNAIRE_CATEGORIES_BY_ID) == 0:
+            setQuestionnaireCategories(categories=database.getQuestionnaireCategories())
+
+    def importDirectory(self, directory: Path, pattern: str = "*.json") -> dict:
+        """
+        Method to import all questionnaire files of a directory
+        :param directory: directory of the files
+        :param pattern: glob pattern of the files
+        :return: report, see importFiles
+        """
+        return self.importFiles(sorted(Path(directory).glob(pattern)))
+
+    def importFiles(self, lstPaths: list) -> dict:
+        """
+        Method to import questionnaire files, every file becomes a questionnaire named like the file.
+        A file which cannot be read or contains an unknown question type is skipped as a whole.
+        A question repeated within a file is added to its questionnaire once, this is reported as a note.
+        :param lstPaths: list of paths of the files
+        :return: report, dict path -> (list of error messages, list of notes), no errors if the file was imported completely
+        """
+        lstPaths = [Path(path) for path in lstPaths]
+        dictReport = {path: ([], []) for path in lstPaths}
+        lstImports = []
+
+        for path, result in zip(lstPaths, self.__parseFiles(lstPaths)):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+
+                questionnaire, lstDuplicates = self.__buildQuestionnaire(path, result)
+                lstImports.append((path, questionnaire))
+
+                for abbreviation in lstDuplicates:
+                    self.logger.info("Question of " + str(path) + " repeated within the form: " + abbreviation)
+                    dictReport[path][1].append("Question repeated within the form, added once: " + abbreviation)
+
+            except Exception as e:
+                self.logger.warning("Error while read questionnaire file " + str(path) + ": " + repr(e))
+                dictReport[path][0].append("File skipped: " + repr(e))
+
+        if len(lstImports) == 0:
+            return dictReport
+
+        try:
+            lstErrorLists = self.database.addQuestionnaires([questionnaire for path, questionnaire in lstImports])
+
+        except Exception as e:
+            self.logger.error("Error while import questionnaires: " + str(e))
+            for path, questionnaire in lstImports:
+                dictReport[path][0].append("Not imported, database error: " + str(e))
+            return dictReport
+
+        for (path, questionnaire), errorList in zip(lstImports, lstErrorLists):
+            for question in errorList:
+                self.logger.warning("Question of " + str(path) + " not added: " + str(question.abbreviation))
+                dictReport[path][0].append("Question not added: " + str(question.abbreviation))
+
+        self.logger.info("Imported " + str(len(lstImports)) + " of " + str(len(lstPaths)) + " questionnaire files")
+
+        return dictReport
+
+    def __parseFiles(self, lstPaths: list) -> list:
+        """
+        Method to read the question arrays of the files, in parallel if there are several files and workers
+        :param lstPaths: list of paths of the files
+        :return: list of JSON question lists or exceptions, in the order of the paths
+        """
+        if self.workers == 1 or len(lstPaths) < 2:
+            return [self.__parseFile(path) for path in lstPaths]
+
+        lstResults = []
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(lstPaths))) as executor:
+            lstFutures = [executor.submit(readJSONQuestionsFromFile, path) for path in lstPaths]
+
+            for future in lstFutures:
+                try:
+                    lstResults.append(future.result())
+                except Exception as e:
+                    lstResults.append(e)
+
+        return lstResults
+
+    @staticmethod
+    def __parseFile(path: Path):
+        """
+        Method to read the question array of one file in this process
+        :param path: path of the file
+        :return: JSON question list or the exception
+        """
+        try:
+            return readJSONQuestionsFromFile(path)
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def __buildQuestionnaire(path: Path, lstJSONQuestions: list) -> tuple:
+        """
+        Method to build the questionnaire of one file, a repeated abbreviation is left out
+        :param path: path of the file
+        :param lstJSONQuestions: JSON objects of the question array
+        :return: (questionnaire object, list of the abbreviations left out)
+        """
+        if len(lstJSONQuestions) == 0:
+            raise ValueError("No questions in questionnaire")
+
+        lstQuestions = []
+        lstDuplicates = []
+        setAbbreviations = set()
+
+        for q in lstJSONQuestions:
+            question = questionFromJSON(q)
+            if question.type is None:
+                raise ValueError("Unknown question type: " + str(q["type"]))
+
+            if question.abbreviation in setAbbreviations:
+                lstDuplicates.append(question.abbreviation)
+                continue
+
+            setAbbreviations.add(question.abbreviation)
+            lstQuestions.append(question)
+
+        return Questionnaire(name=path.stem, questions=lstQuestions, category=getQuestionnaireCategoryByID()), lstDuplicates
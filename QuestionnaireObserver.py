@@ -1,4 +1,5 @@
 import QuestionnaireController
+from SessionWriter import SessionWriter
 from fileHandler import writeToSessionFile
 
 
@@ -7,12 +8,21 @@ class QuestionnaireObserver:
     Class to process changes on connected questionnaireController's questionnaire. Used for session back ups.
     """
 
-    def __init__(self, observedController: QuestionnaireController):
+    def __init__(self, observedController: QuestionnaireController, sessionWriter: SessionWriter = None):
+        """
+        Constructor
+        :param observedController: the questionnaireController observed by this observer
+        :param sessionWriter: background writer of the session file, None to write the session file directly
+        """
         self.observedController = observedController
+        self.sessionWriter = sessionWriter
 
     def update(self):
         """
         Method to redirect changes of the observed questionnaire to the fileHandler for the session file.
         :return:
         """
-        writeToSessionFile(self.observedController.questionnaire)
+        if self.sessionWriter is not None:
+            self.sessionWriter.update(self.observedController.questionnaire)
+        else:
+            writeToSessionFile(self.observedController.questionnaire)
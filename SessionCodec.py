@@ -0,0 +1,231 @@
+import struct
+
+
+class SessionCodec:
+    """
+    Class encoding the session snapshot in a compact, versioned binary format.
+    A question saved in the database is stored as its id and only the fields that differ from the database,
+    the other fields are taken from the database on restore. An unsaved question is stored completely.
+
+    Layout, little-endian, str = u32 length + UTF-8:
+    magic "MHFS", u8 version, u64 generation of the snapshot (see SessionWriter),
+    questionnaire: str name, i64 id, str description, str creationDate, str lastEdited, i64 category id,
+    u32 number of questions, per question: u32 session key, i64 id, u16 mask of the stored fields, the stored fields.
+    Fields: str text, str typeName, u16 count + str options, u8 required, str dependent_on, str expected_answer,
+    str abbreviation, u8 score, u8 comment, i64 category id.
+    Version 1 stored the category ids as i32, versions 1 and 2 have no generation, they are still decoded.
+    """
+
+    MAGIC: bytes = b"MHFS"
+    VERSION: int = 3
+
+    FIELDS: tuple = ("text", "type", "options", "required", "dependent_on", "expected_answer", "abbreviation", "score", "comment", "category")
+    ALL_FIELDS: int = (1 << len(FIELDS)) - 1
+
+    VERSION_HEADER: struct.Struct = struct.Struct("<B")
+    GENERATION: struct.Struct = struct.Struct("<Q")
+    LENGTH: struct.Struct = struct.Struct("<I")
+    ID: struct.Struct = struct.Struct("<q")
+    QUESTIONNAIRE_TAIL: struct.Struct = struct.Struct("<qI")
+    QUESTION_HEAD: struct.Struct = struct.Struct("<IqH")
+    COUNT: struct.Struct = struct.Struct("<H")
+    CATEGORY: struct.Struct = struct.Struct("<q")
+
+    # category ids of version 1
+    QUESTIONNAIRE_TAIL_V1: struct.Struct = struct.Struct("<iI")
+    CATEGORY_V1: struct.Struct = struct.Struct("<i")
+
+    @classmethod
+    def isBinary(cls, data: bytes) -> bool:
+        """
+        Method to check whether data is a binary snapshot, otherwise it is the JSON format
+        :param data: content of the session file
+        :return: True if the data starts with the magic bytes
+        """
+        return data[: len(cls.MAGIC)] == cls.MAGIC
+
+    @staticmethod
+    def fieldValues(question) -> tuple:
+        """
+        Method to get the values of a question in the order of FIELDS
+        :param question: question object
+        :return: tuple of values, type and category as typeName and id
+        """
+        return (
+            str(question.text),
+            question.type.typeName,
+            [str(option) for option in question.options],
+            bool(question.required),
+            str(question.dependent_on),
+            str(question.expected_answer),
+            str(question.abbreviation),
+            bool(question.score),
+            bool(question.comment),
+            question.category.id if question.category is not None else -1,
+        )
+
+    @classmethod
+    def encode(cls, header: dict, lstQuestions: list, lstKeys: list, reference=None, generation: int = 0) -> bytes:
+        """
+        Method to encode a session snapshot
+        :param header: fields of the questionnaire, see SessionWriter.update
+        :param lstQuestions: questions of the questionnaire
+        :param lstKeys: session keys of the questions
+        :param reference: function(id) -> question object with the saved state of the database or None, None to store all fields.
+            It must not return the question objects of the session, their changes would not be stored.
+        :param generation: generation of the snapshot, only journal records of the same generation belong to it
+        :return: encoded snapshot
+        """
+        parts = [cls.MAGIC, cls.VERSION_HEADER.pack(cls.VERSION), cls.GENERATION.pack(generation)]
+        append = parts.append
+        packLength = cls.LENGTH.pack
+
+        def packStr(value: str):
+            data = value.encode("utf-8")
+            append(packLength(len(data)))
+            append(data)
+
+        category = header["category"]
+        packStr(str(header["name"]))
+        append(cls.ID.pack(header["id"]))
+        packStr(str(header["description"]))
+        packStr(str(header["creationDate"]))
+        packStr(str(header["lastEdited"]))
+        append(cls.QUESTIONNAIRE_TAIL.pack(category.id if category is not None else -1, len(lstQuestions)))
+
+        for key, question in zip(lstKeys, lstQuestions):
+            values = cls.fieldValues(question)
+
+            mask = cls.ALL_FIELDS
+            referenceQuestion = reference(question.id) if reference is not None and question.id != -1 else None
+            if referenceQuestion is not None and referenceQuestion is not question:
+                mask = 0
+                for bit, (value, referenceValue) in enumerate(zip(values, cls.fieldValues(referenceQuestion))):
+                    if value != referenceValue:
+                        mask |= 1 << bit
+
+            append(cls.QUESTION_HEAD.pack(key, question.id, mask))
+
+            for bit, value in enumerate(values):
+                if not mask & (1 << bit):
+                    continue
+                field = cls.FIELDS[bit]
+                if field == "options":
+                    append(cls.COUNT.pack(len(value)))
+                    for option in value:
+                        packStr(option)
+                elif field in ("required", "score", "comment"):
+                    append(b"\x01" if value else b"\x00")
+                elif field == "category":
+                    append(cls.CATEGORY.pack(value))
+                else:
+                    packStr(value)
+
+        return b"".join(parts)
+
+    @classmethod
+    def decode(cls, data: bytes, reference=None) -> dict:
+        """
+        Method to decode a session snapshot into the JSON object of the JSON session format.
+        A question which is stored without all fields and no longer exists in the database is skipped.
+        :param data: encoded snapshot
+        :param reference: function(id) -> question object of the database or None
+        :return: JSON object with the keys of Questionnaire.toJSON, "sessionKeys", "generation" (None before version 3)
+            and "missingQuestions" (ids of skipped questions)
+        """
+        try:
+            return cls.__decode(data, reference)
+        except (struct.error, UnicodeDecodeError, IndexError, KeyError) as e:
+            raise ValueError("Invalid session snapshot: " + repr(e))
+
+    @classmethod
+    def __decode(cls, data: bytes, reference) -> dict:
+        """
+        Method to decode a session snapshot, see decode
+        """
+        if not cls.isBinary(data):
+            raise ValueError("Invalid session snapshot: magic bytes missing")
+
+        unpackLength = cls.LENGTH.unpack_from
+        pos = len(cls.MAGIC)
+
+        def unpackStr() -> str:
+            nonlocal pos
+            (length,) = unpackLength(data, pos)
+            end = pos + 4 + length
+            if end > len(data):
+                raise IndexError("string exceeds snapshot")
+            value = data[pos + 4 : end].decode("utf-8")
+            pos = end
+            return value
+
+        (version,) = cls.VERSION_HEADER.unpack_from(data, pos)
+        pos += cls.VERSION_HEADER.size
+        if version not in (1, 2, cls.VERSION):
+            raise ValueError("Unsupported session snapshot version " + str(version))
+        generation = None
+        if version > 2:
+            (generation,) = cls.GENERATION.unpack_from(data, pos)
+            pos += cls.GENERATION.size
+        questionnaireTail = cls.QUESTIONNAIRE_TAIL if version > 1 else cls.QUESTIONNAIRE_TAIL_V1
+        category = cls.CATEGORY if version > 1 else cls.CATEGORY_V1
+
+        jO = {"name": unpackStr()}
+        (jO["id"],) = cls.ID.unpack_from(data, pos)
+        pos += cls.ID.size
+        jO["description"] = unpackStr()
+        jO["creationDate"] = unpackStr()
+        jO["lastEdited"] = unpackStr()
+        categoryId, count = questionnaireTail.unpack_from(data, pos)
+        pos += questionnaireTail.size
+        jO["category"] = {"id": categoryId}
+
+        lstQuestions = []
+        lstKeys = []
+        lstMissing = []
+
+        for n in range(count):
+            key, questionId, mask = cls.QUESTION_HEAD.unpack_from(data, pos)
+            pos += cls.QUESTION_HEAD.size
+
+            values = [None] * len(cls.FIELDS)
+            for bit, field in enumerate(cls.FIELDS):
+                if not mask & (1 << bit):
+                    continue
+                if field == "options":
+                    (optionCount,) = cls.COUNT.unpack_from(data, pos)
+                    pos += cls.COUNT.size
+                    values[bit] = [unpackStr() for i in range(optionCount)]
+                elif field in ("required", "score", "comment"):
+                    values[bit] = data[pos] != 0
+                    pos += 1
+                elif field == "category":
+                    (values[bit],) = category.unpack_from(data, pos)
+                    pos += category.size
+                else:
+                    values[bit] = unpackStr()
+
+            if mask != cls.ALL_FIELDS:
+                referenceQuestion = reference(questionId) if reference is not None else None
+                if referenceQuestion is None:
+                    lstMissing.append(questionId)
+                    continue
+                values = [value if mask & (1 << bit) else referenceValue for bit, (value, referenceValue) in enumerate(zip(values, cls.fieldValues(referenceQuestion)))]
+
+            q = dict(zip(cls.FIELDS, values))
+            q["type"] = {"typeName": q["type"]}
+            q["category"] = {"id": q["category"]}
+            q["id"] = questionId
+
+            lstQuestions.append(q)
+            lstKeys.append(key)
+
+        if pos != len(data):
+            raise ValueError("Invalid session snapshot: trailing data")
+
+        jO["questions"] = lstQuestions
+        jO["sessionKeys"] = lstKeys
+        jO["generation"] = generation
+        jO["missingQuestions"] = lstMissing
+
+        return jO
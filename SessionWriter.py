@@ -0,0 +1,250 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from Questionnaire import Questionnaire
+from SessionCodec import SessionCodec
+from fileHandler import writeFileAtomic
+
+
+class SessionWriter:
+    """
+    Class writing the session file of the active questionnaire in a background thread.
+    A burst of changes is collected until no change arrived for the debounce time, then the session file is replaced atomically.
+    With a journal only the changed questionnaire fields, the changed questions and the question order are appended
+    to the journal file, after a number of records it is compacted into a new session file.
+    Every session file has a new generation and the journal records carry the generation of their session file,
+    so records left over by a crash between writing the session file and emptying the journal are not replayed.
+    The session file is a binary snapshot of the SessionCodec or, for compatibility, JSON.
+    """
+
+    def __init__(
+        self,
+        logger,
+        pathSessionFile: Path,
+        pathJournalFile: Path = None,
+        debounce: float = 0.5,
+        maxDelay: float = 5,
+        compactAfter: int = 100,
+        binary: bool = True,
+        reference=None,
+    ):
+        """
+        Constructor
+        :param logger: logger Object
+        :param pathSessionFile: path of the session file, e.g. session.lock
+        :param pathJournalFile: path of the journal file, None to replace the session file on every write
+        :param debounce: seconds without new change before the session is written
+        :param maxDelay: seconds after the first change the session is written at the latest
+        :param compactAfter: number of journal records before the session file is written again
+        :param binary: True to write binary snapshots, False to write JSON
+        :param reference: thread-safe function(id) -> question object with the saved state of the database or None, see SessionCodec.encode
+        """
+        self.logger = logger
+        self.pathSessionFile = pathSessionFile
+        self.pathJournalFile = pathJournalFile
+        self.debounce = debounce
+        self.maxDelay = maxDelay
+        self.compactAfter = compactAfter
+        self.binary = binary
+        self.reference = reference
+
+        self.condition = threading.Condition()
+        self.pending: tuple = None
+        self.firstUpdate: float = 0
+        self.lastUpdate: float = 0
+        self.flushRequested: bool = False
+        self.writing: bool = False
+        self.closed: bool = False
+
+        # state of the last written session, only used by the writer thread
+        # session keys identify the question objects in the journal, an abbreviation may occur twice after an import
+        self.sessionKeys: dict = {}
+        self.nextSessionKey: int = 0
+        self.writtenHeader: str = None
+        self.writtenOrder: list = None
+        self.writtenQuestions: dict = {}
+        self.journalRecords: int = 0
+        self.generation: int = 0
+
+        self.thread = threading.Thread(target=self.__run, daemon=True, name="session")
+        self.thread.start()
+
+    def update(self, questionnaire: Questionnaire):
+        """
+        Method to queue the current state of the questionnaire, only the references are copied
+        :param questionnaire: the active questionnaire
+        """
+        header = {
+            "name": questionnaire.name,
+            "id": questionnaire.id,
+            "description": questionnaire.description,
+            "creationDate": questionnaire.creationDate,
+            "lastEdited": questionnaire.lastEdited,
+            "category": questionnaire.category,
+        }
+
+        with self.condition:
+            if self.closed:
+                return
+
+            now = time.monotonic()
+            if self.pending is None:
+                self.firstUpdate = now
+            self.lastUpdate = now
+
+            self.pending = (header, list(questionnaire.questions))
+            self.condition.notify_all()
+
+    def flush(self):
+        """
+        Method to write a queued state immediately and to wait until it is written
+        """
+        with self.condition:
+            self.flushRequested = True
+            self.condition.notify_all()
+
+            while (self.pending is not None or self.writing) and not self.closed:
+                self.condition.wait()
+
+            self.flushRequested = False
+
+    def close(self, flush: bool = False):
+        """
+        Method to stop the writer thread
+        :param flush: True to write a queued state before, otherwise it is dropped
+        """
+        if flush:
+            self.flush()
+
+        with self.condition:
+            self.closed = True
+            self.pending = None
+            self.condition.notify_all()
+
+        self.thread.join()
+
+    def __run(self):
+        """
+        Method executed by the writer thread, waits for the debounced state and writes it
+        """
+        while True:
+            with self.condition:
+                while True:
+                    if self.closed:
+                        return
+
+                    if self.pending is not None:
+                        remaining = min(self.lastUpdate + self.debounce, self.firstUpdate + self.maxDelay) - time.monotonic()
+
+                        if remaining <= 0 or self.flushRequested:
+                            break
+
+                        self.condition.wait(remaining)
+                    else:
+                        self.condition.wait()
+
+                header, lstQuestions = self.pending
+                self.pending = None
+                self.writing = True
+
+            try:
+                self.__write(header, lstQuestions)
+
+            except Exception as e:
+                self.logger.error("Error while write session file: " + str(e))
+                # the next write is a complete session file
+                self.writtenOrder = None
+
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
+
+    def __write(self, header: dict, lstQuestions: list):
+        """
+        Method to write the session file or to append the changes since the last write to the journal
+        :param header: fields of the questionnaire
+        :param lstQuestions: questions of the questionnaire
+        """
+        lstKeys = [self.__sessionKey(question) for question in lstQuestions]
+        headerJSON = self.__encode(header)
+
+        dictFingerprints = {}
+        dictChanged = {}
+        for key, question in zip(lstKeys, lstQuestions):
+            fingerprint = self.__fingerprint(question)
+            dictFingerprints[key] = fingerprint
+            if self.writtenQuestions.get(key) != fingerprint:
+                dictChanged[str(key)] = question
+
+        if self.pathJournalFile is None or self.writtenOrder is None or self.journalRecords >= self.compactAfter:
+            # unique across restarts, the journal of an earlier session may still exist
+            self.generation = max(self.generation + 1, time.time_ns())
+
+            if self.binary:
+                writeFileAtomic(self.pathSessionFile, SessionCodec.encode(header, lstQuestions, lstKeys, self.reference, self.generation))
+            else:
+                session = dict(header)
+                session["questions"] = lstQuestions
+                session["sessionKeys"] = lstKeys
+                session["generation"] = self.generation
+                writeFileAtomic(self.pathSessionFile, self.__encode(session))
+            if self.pathJournalFile is not None:
+                open(self.pathJournalFile, "w").close()
+
+            self.journalRecords = 0
+            # forget removed questions
+            self.sessionKeys = {id(question): (key, question) for key, question in zip(lstKeys, lstQuestions)}
+        else:
+            record = {"generation": self.generation}
+            if headerJSON != self.writtenHeader:
+                record["questionnaire"] = header
+            if len(dictChanged) > 0:
+                record["questions"] = dictChanged
+            if lstKeys != self.writtenOrder:
+                record["order"] = lstKeys
+
+            if len(record) == 1:
+                return
+
+            with open(self.pathJournalFile, "a", encoding="utf-8") as file:
+                file.write(self.__encode(record) + "\n")
+            self.journalRecords += 1
+
+        self.writtenHeader = headerJSON
+        self.writtenOrder = lstKeys
+        self.writtenQuestions = dictFingerprints
+
+    def __sessionKey(self, question) -> int:
+        """
+        Method to get the session key of a question object, a new object gets the next key
+        :param question: question object
+        :return: session key
+        """
+        entry = self.sessionKeys.get(id(question))
+        if entry is None:
+            # the question is kept in the entry, so its id is not reused
+            entry = (self.nextSessionKey, question)
+            self.sessionKeys[id(question)] = entry
+            self.nextSessionKey += 1
+        return entry[0]
+
+    @staticmethod
+    def __fingerprint(question) -> tuple:
+        """
+        Method to capture the current values of a question, options are copied as they are changed in place
+        :param question: question object
+        :return: tuple of values
+        """
+        return tuple(tuple(value) if isinstance(value, list) else value for value in vars(question).values())
+
+    @staticmethod
+    def __encode(obj) -> str:
+        """
+        Method to encode an object in the format of Questionnaire.toJSON without indent
+        :param obj: object to encode
+        :return: JSON string
+        """
+        return json.dumps(obj, default=lambda o: o.__dict__, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,417 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from SyncQueue import SyncQueue
+from database.DatabaseSQLite import DatabaseSQLite
+
+
+class SyncEngine:
+    """
+    Class representing the asyncio sync engine between the local SQLite database and a MySQL database.
+    The blocking database calls run in a thread pool, every worker thread uses its own SQLite connection and
+    its own connection of the MySQL pool. So the tables are reconciled concurrently and the network latency
+    of one table overlaps with the others, changes are read from SQLite while the previous batch is written.
+
+    A row the MySQL database does not accept because of a UNIQUE column is recorded in tb_sync_conflicts,
+    rows referencing it are held back and recorded as well. Recorded rows are shipped again with every write
+    until they are accepted or deleted.
+    """
+
+    # columns referencing another synchronised table: table -> ((column index, referenced table), ...)
+    REFERENCES: dict = {
+        "tb_questions": ((10, "tb_question_categories"),),
+        "tb_questionnaires": ((3, "tb_questionnaire_categories"),),
+        "tb_collections": ((0, "tb_questions"), (1, "tb_questionnaires")),
+    }
+    # tables reconciled concurrently, a stage only references tables of the stages before
+    RECONCILE_STAGES: tuple = (
+        ("tb_question_types", "tb_question_categories", "tb_questionnaire_categories"),
+        ("tb_questions", "tb_questionnaires"),
+        ("tb_collections",),
+    )
+
+    def __init__(self, logger, pathSQLiteDatabase: Path, destinationDatabase, sqlitePragmas: dict = None, workers: int = 3, rangeSize: int = 256, batchSize: int = 1000):
+        """
+        Constructor
+        :param logger: logger Object
+        :param pathSQLiteDatabase: path of databasefile e.g. data/mhf.db
+        :param destinationDatabase: DatabaseMySQL object, its pool has to provide a connection per worker
+        :param sqlitePragmas: SQLite tuning profile e.g. {"journal_mode": "WAL"}
+        :param workers: number of worker threads
+        :param rangeSize: number of key values per range of the reconciliation
+        :param batchSize: maximum number of changes per pushed batch
+        """
+        self.logger = logger
+        self.pathSQLiteDatabase = pathSQLiteDatabase
+        self.destinationDatabase = destinationDatabase
+        self.sqlitePragmas = sqlitePragmas
+        self.rangeSize = rangeSize
+        self.batchSize = batchSize
+
+        self.target = destinationDatabase.getTarget()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync")
+
+        # databases of the current worker thread
+        self.local = threading.local()
+        self.sessions: list = []
+        self.sessionsLock = threading.Lock()
+
+    def close(self):
+        """
+        Method to stop the worker threads and to return the MySQL connections to the pool
+        """
+        self.executor.shutdown(wait=False)
+
+        with self.sessionsLock:
+            for session in self.sessions:
+                self.__closeSession(session)
+            self.sessions.clear()
+
+    def __closeSession(self, session):
+        """
+        Method to close a MySQL session, errors of a broken connection are ignored
+        :param session: DatabaseMySQL object of a worker thread
+        """
+        try:
+            session.conn.close()
+        except Exception as e:
+            self.logger.warning("Warning while close MySQL session: " + str(e))
+
+    def __databases(self) -> tuple:
+        """
+        Method to return the databases of the current worker thread, they are opened on first use
+        :return: (DatabaseSQLite, DatabaseMySQL)
+        """
+        if getattr(self.local, "source", None) is None:
+            self.local.source = DatabaseSQLite(self.logger, self.pathSQLiteDatabase, pragmas=self.sqlitePragmas)
+
+        if getattr(self.local, "destination", None) is None:
+            self.local.destination = self.destinationDatabase.openSession()
+
+            with self.sessionsLock:
+                self.sessions.append(self.local.destination)
+
+        return self.local.source, self.local.destination
+
+    def __call(self, function, args: tuple):
+        """
+        Method executed by a worker thread, a MySQL session failing is replaced on the next call
+        :param function: function(source, destination, *args)
+        :param args: further arguments of the function
+        :return: result of the function
+        """
+        source, destination = self.__databases()
+
+        try:
+            return function(source, destination, *args)
+
+        except Exception:
+            with self.sessionsLock:
+                if destination in self.sessions:
+                    self.sessions.remove(destination)
+            self.__closeSession(destination)
+            self.local.destination = None
+            raise
+
+    async def __run(self, function, *args):
+        """
+        Method to run a blocking function in a worker thread
+        :param function: function(source, destination, *args)
+        :param args: further arguments of the function
+        :return: result of the function
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.__call, function, args)
+
+    async def syncAll(self, reconcile: bool = False) -> int:
+        """
+        Method to push the local changes, to pull the changes of other workstations and optionally to reconcile all tables
+        :param reconcile: True to compare all tables by checksums, e.g. after connecting
+        :return: number of changed rows in the SQLite database
+        """
+        await self.push()
+        count = await self.pull()
+
+        if reconcile:
+            lastSeq = await self.__run(lambda source, destination: source.getLastChangeSeq())
+
+            # the conflicts of a stage are recorded before the rows referencing them are compared
+            for lstTables in self.RECONCILE_STAGES:
+                lstCounts = await asyncio.gather(*(self.syncTable(table) for table in lstTables))
+                count += sum(lstCounts)
+
+            await self.__run(SyncEngine.__acknowledge, self.target, lastSeq)
+
+        return count
+
+    @staticmethod
+    def __acknowledge(source: DatabaseSQLite, destination, target: str, seq: int):
+        """
+        Method to acknowledge the changes up to seq, an acknowledgement is never moved back
+        """
+        ackSeq = source.getSyncState(target)
+
+        if ackSeq is None or ackSeq < seq:
+            source.setSyncState(target, seq)
+
+    async def getConflicts(self) -> list:
+        """
+        Method to read the rows the MySQL database did not accept, through the connection of a worker thread
+        :return: list of (target, tableName, key1, key2, reason, detectedAt), see DatabaseSQLite.getSyncConflicts
+        """
+        return await self.__run(lambda source, destination: source.getSyncConflicts(self.target))
+
+    async def push(self):
+        """
+        Method to ship the changes after the last acknowledged change to the MySQL database.
+        A changed row is shipped as UPSERT of its current state, a row which no longer exists as DELETE.
+        Every batch is committed at once with one hub version and acknowledged afterwards, a failed batch is shipped again.
+        The next batch is read while the previous one is written. A new target gets all changes kept in tb_changelog,
+        e.g. the deletes made before the first sync, the rows never changed are covered by the reconciliation.
+        """
+        ackSeq = await self.__run(lambda source, destination: source.getSyncState(self.target))
+
+        if ackSeq is None:
+            ackSeq = 0
+
+        batch = await self.__run(SyncEngine.__readBatch, ackSeq, self.batchSize)
+
+        while batch is not None:
+            lastSeq, dictUpserts, dictDeletes = batch
+
+            writing = asyncio.ensure_future(self.__run(SyncEngine.__writeBatch, self.target, dictUpserts, dictDeletes))
+            try:
+                nextBatch = await self.__run(SyncEngine.__readBatch, lastSeq, self.batchSize)
+            finally:
+                await writing
+
+            await self.__run(SyncEngine.__acknowledge, self.target, lastSeq)
+            batch = nextBatch
+
+        await self.__run(lambda source, destination: source.removeAcknowledgedChanges())
+
+    @staticmethod
+    def __readBatch(source: DatabaseSQLite, destination, afterSeq: int, batchSize: int):
+        """
+        Method to read the next batch of changes with the current state of the changed rows
+        :return: (last seq, dict table -> rows to upsert, dict table -> (key1, key2, deletedAt) to delete) or None
+        """
+        lstChanges = source.getChanges(afterSeq, batchSize)
+
+        if len(lstChanges) == 0:
+            return None
+
+        # several changes of the same row are shipped once, a delete with the time of the last delete
+        dictRowKeys = {}
+        for seq, table, key1, key2, operation, changedAt in lstChanges:
+            dictRowKeys[(table, key1, key2)] = max(changedAt, dictRowKeys.get((table, key1, key2), 0))
+
+        dictUpserts = {table: [] for table in SyncQueue.ORDER}
+        dictDeletes = {table: [] for table in SyncQueue.ORDER}
+
+        for (table, key1, key2), changedAt in dictRowKeys.items():
+            row = source.getRowByKey(table, (key1, key2))
+
+            if row is None:
+                dictDeletes[table].append((key1, key2, changedAt or int(time.time() * 1000)))
+            else:
+                dictUpserts[table].append(row)
+
+        return lstChanges[-1][0], dictUpserts, dictDeletes
+
+    @staticmethod
+    def __writeBatch(source: DatabaseSQLite, destination, target: str, dictUpserts: dict, dictDeletes: dict) -> list:
+        """
+        Method to write one batch of changes to the MySQL database in one transaction
+        :return: list of (table, key1, key2, reason) of the rows not accepted, see __upsertTables
+        """
+        lstResolved = []
+
+        with destination.transaction():
+            version = destination.nextVersion()
+
+            # deletes first, a new row may reuse the unique abbreviation or name of a deleted one
+            # deletes in reverse dependency order, upserts in dependency order
+            for table in reversed(SyncQueue.ORDER):
+                if len(dictDeletes[table]) > 0:
+                    destination.deleteRows(table, dictDeletes[table], version)
+                    lstResolved += [(table, key1, key2) for key1, key2, updatedAt in dictDeletes[table]]
+
+            lstWritten, lstConflicts = SyncEngine.__upsertTables(source, destination, target, dictUpserts, version)
+
+        source.updateSyncConflicts(target, lstResolved + lstWritten, lstConflicts)
+        return lstConflicts
+
+    @staticmethod
+    def __upsertTables(source: DatabaseSQLite, destination, target: str, dictUpserts: dict, version: int) -> tuple:
+        """
+        Method to upsert rows in dependency order, use it inside destination.transaction().
+        The recorded conflicts of the given tables are shipped again, a row referencing a row in conflict is held back.
+        :param dictUpserts: dict table -> rows to upsert
+        :return: (list of (table, key1, key2) accepted or deleted, list of (table, key1, key2, reason) not accepted)
+        """
+        dictRetry = {}
+        dictBlocked = {table: set() for table in SyncQueue.ORDER}
+        for conflictTarget, table, key1, key2, reason, detectedAt in source.getSyncConflicts(target):
+            dictRetry.setdefault(table, []).append((key1, key2))
+            dictBlocked[table].add(key1)
+
+        lstWritten = []
+        lstConflicts = []
+
+        for table in SyncQueue.ORDER:
+            if table not in dictUpserts:
+                continue
+
+            keyCount = len(DatabaseSQLite.TABLE_KEYS[table])
+            dictRows = {tuple(row[:keyCount]): row for row in dictUpserts[table]}
+
+            for key in dictRetry.get(table, []):
+                key = key[:keyCount]
+                if key not in dictRows:
+                    row = source.getRowByKey(table, key)
+                    if row is None:
+                        lstWritten.append(SyncEngine.__conflictKey(table, key))
+                    else:
+                        dictRows[key] = row
+
+            lstRows = []
+            for key, row in dictRows.items():
+                lstReferences = [referencedTable + " " + str(row[index]) for index, referencedTable in SyncEngine.REFERENCES.get(table, ()) if row[index] in dictBlocked[referencedTable]]
+
+                if len(lstReferences) > 0:
+                    lstConflicts.append(SyncEngine.__conflictKey(table, key) + ("references " + ", ".join(lstReferences) + " in conflict",))
+                    dictBlocked[table].add(key[0])
+                else:
+                    lstRows.append(row)
+
+            if len(lstRows) == 0:
+                continue
+
+            lstRejected = destination.upsertRows(table, lstRows, version)
+            setRejected = {tuple(row[:keyCount]) for row in lstRejected}
+
+            for row in lstRows:
+                key = tuple(row[:keyCount])
+                if key in setRejected:
+                    lstConflicts.append(SyncEngine.__conflictKey(table, key) + ("value of a UNIQUE column belongs to another row",))
+                    dictBlocked[table].add(key[0])
+                else:
+                    lstWritten.append(SyncEngine.__conflictKey(table, key))
+                    dictBlocked[table].discard(key[0])
+
+        return lstWritten, lstConflicts
+
+    @staticmethod
+    def __conflictKey(table: str, key: tuple) -> tuple:
+        """
+        Method to build the key of a row in tb_sync_conflicts
+        :return: (table, key1, key2), key2 is None for tables with one key column
+        """
+        return (table, key[0], key[1] if len(key) > 1 else None)
+
+    async def pull(self) -> int:
+        """
+        Method to apply the changes made in the MySQL database after the last pulled version to the SQLite database.
+        All changes are read from one snapshot and applied in one transaction, the last writer by updatedAt wins.
+        :return: number of changed rows in the SQLite database
+        """
+        return await self.__run(SyncEngine.__pull, self.target)
+
+    @staticmethod
+    def __pull(source: DatabaseSQLite, destination, target: str) -> int:
+        """
+        Method to read the changes after the pulled version from one snapshot and to apply them
+        """
+        pulledVersion = source.getPullState(target)
+
+        with destination.transaction():
+            hubVersion = destination.getHubVersion()
+
+            if hubVersion <= pulledVersion:
+                return 0
+
+            dictRows = {table: destination.getChangedRows(table, pulledVersion) for table in SyncQueue.ORDER}
+            lstDeletes = destination.getTombstones(pulledVersion)
+
+        count = source.applyRemoteChanges(dictRows, lstDeletes)
+        source.setPullState(target, hubVersion)
+
+        return count
+
+    async def syncTable(self, table: str) -> int:
+        """
+        Method to merge one table of the SQLite and the MySQL database.
+        A table with equal checksum is skipped, otherwise the checksums per key range are compared
+        and only the rows of the divergent ranges are transferred. A row missing on one side is copied,
+        a row on both sides is replaced by the one with the newer updatedAt, on equal updatedAt MySQL wins.
+        Both databases are read concurrently.
+        :param table: name of table, see SyncQueue.ORDER
+        :return: number of changed rows in the SQLite database
+        """
+        sourceChecksums, destinationChecksums = await asyncio.gather(
+            self.__run(lambda source, destination: source.getChecksums(table)), self.__run(lambda source, destination: destination.getChecksums(table))
+        )
+
+        if sourceChecksums == destinationChecksums:
+            return 0
+
+        dictSourceChecksums, dictDestinationChecksums = await asyncio.gather(
+            self.__run(lambda source, destination: source.getChecksums(table, self.rangeSize)),
+            self.__run(lambda source, destination: destination.getChecksums(table, self.rangeSize)),
+        )
+
+        lstRanges = sorted(bucket for bucket in dictSourceChecksums.keys() | dictDestinationChecksums.keys() if dictSourceChecksums.get(bucket) != dictDestinationChecksums.get(bucket))
+
+        self.logger.info("Reconcile " + table + ": " + str(len(lstRanges)) + " of " + str(len(dictSourceChecksums)) + " ranges differ")
+
+        lstSourceRows, lstDestinationRows = await asyncio.gather(
+            self.__run(lambda source, destination: source.getRowsInRanges(table, self.rangeSize, lstRanges)),
+            self.__run(lambda source, destination: destination.getRowsInRanges(table, self.rangeSize, lstRanges)),
+        )
+
+        keyCount = len(DatabaseSQLite.TABLE_KEYS[table])
+        dictSourceRows = {tuple(row[:keyCount]): row for row in lstSourceRows}
+        dictDestinationRows = {tuple(row[:keyCount]): row for row in lstDestinationRows}
+
+        lstPush = []
+        lstPull = []
+
+        for key in dictSourceRows.keys() | dictDestinationRows.keys():
+            sourceRow = dictSourceRows.get(key)
+            destinationRow = dictDestinationRows.get(key)
+
+            if destinationRow is None:
+                lstPush.append(sourceRow)
+            elif sourceRow is None:
+                lstPull.append(destinationRow)
+            elif DatabaseSQLite.rowChecksum(sourceRow) == DatabaseSQLite.rowChecksum(destinationRow):
+                continue
+            elif sourceRow[-1] > destinationRow[-1]:
+                lstPush.append(sourceRow)
+            else:
+                lstPull.append(destinationRow)
+
+        lstTasks = []
+        if len(lstPush) > 0:
+            lstTasks.append(self.__run(SyncEngine.__pushRows, self.target, table, lstPush))
+        if len(lstPull) > 0:
+            lstTasks.append(self.__run(lambda source, destination: source.applyRemoteChanges({table: lstPull}, [], replaceEqual=True)))
+
+        lstCounts = await asyncio.gather(*lstTasks)
+
+        return lstCounts[-1] if len(lstPull) > 0 else 0
+
+    @staticmethod
+    def __pushRows(source: DatabaseSQLite, destination, target: str, table: str, lstRows: list) -> list:
+        """
+        Method to write rows of one table to the MySQL database in one transaction
+        :return: list of (table, key1, key2, reason) of the rows not accepted, see __upsertTables
+        """
+        with destination.transaction():
+            lstWritten, lstConflicts = SyncEngine.__upsertTables(source, destination, target, {table: lstRows}, destination.nextVersion())
+
+        source.updateSyncConflicts(target, lstWritten, lstConflicts)
+        return lstConflicts
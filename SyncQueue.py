@@ -0,0 +1,92 @@
+import threading
+import time
+
+
+class SyncQueue:
+    """
+    Class representing the thread-safe work queue of the database sync thread.
+    Every table is queued at most once, a burst of changes is collected until no change arrived for the debounce time.
+    The dirty tables are returned in dependency order.
+    """
+
+    # tables in the order they reference each other
+    ORDER: tuple = ("tb_question_types", "tb_question_categories", "tb_questionnaire_categories", "tb_questions", "tb_questionnaires", "tb_collections")
+
+    def __init__(self, debounce: float = 0.5, maxDelay: float = 5):
+        """
+        Constructor
+        :param debounce: seconds without new change before the dirty tables are returned
+        :param maxDelay: seconds after the first change the dirty tables are returned at the latest
+        """
+        self.debounce = debounce
+        self.maxDelay = maxDelay
+
+        self.condition = threading.Condition()
+        self.dirtyTables: set = set()
+        self.firstPut: float = 0
+        self.lastPut: float = 0
+        self.closed: bool = False
+
+    def put(self, *tables: str):
+        """
+        Method to mark tables as dirty, tables already queued are not queued again
+        :param tables: names of tables, see ORDER
+        """
+        with self.condition:
+            if self.closed:
+                return
+
+            now = time.monotonic()
+            if len(self.dirtyTables) == 0:
+                self.firstPut = now
+            self.lastPut = now
+
+            self.dirtyTables.update(tables)
+            self.condition.notify_all()
+
+    def putAll(self):
+        """
+        Method to mark all tables as dirty
+        """
+        self.put(*self.ORDER)
+
+    def get(self, timeout: float = None) -> list:
+        """
+        Method to wait for dirty tables, blocks until the debounce time passed, the timeout passed or the queue is closed
+        :param timeout: seconds to wait for a first change, None to wait without limit
+        :return: names of the dirty tables in dependency order, empty after the timeout, None if the queue is closed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self.condition:
+            while True:
+                if self.closed:
+                    return None
+
+                now = time.monotonic()
+
+                if len(self.dirtyTables) > 0:
+                    remaining = min(self.lastPut + self.debounce, self.firstPut + self.maxDelay) - now
+
+                    if remaining <= 0:
+                        lstTables = [table for table in self.ORDER if table in self.dirtyTables]
+                        self.dirtyTables.clear()
+
+                        return lstTables
+
+                    self.condition.wait(remaining)
+                elif deadline is None:
+                    self.condition.wait()
+                elif deadline <= now:
+                    return []
+                else:
+                    self.condition.wait(deadline - now)
+
+    def close(self):
+        """
+        Method to close the queue, a waiting get returns None
+        """
+        with self.condition:
+            self.closed = True
+            self.dirtyTables.clear()
+            self.condition.notify_all()
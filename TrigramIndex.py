@@ -0,0 +1,113 @@
+import unicodedata
+
+
+class TrigramIndex:
+    """
+    Class representing an in-memory trigram index for fast and typo-tolerant text searches.
+    Every document is split into trigrams, a query only checks the documents of its rarest trigram
+    instead of scanning all documents.
+    """
+
+    def __init__(self, minSimilarity: float = 0.6):
+        """
+        Constructor
+        :param minSimilarity: share of the query trigrams a document needs for a fuzzy match
+        """
+        self.minSimilarity = minSimilarity
+        self.documents: dict = {}
+        self.postings: dict = {}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Method to fold case, umlauts and whitespace of a text
+        :param text: the text to normalize
+        :return: normalized text, e.g. "Größe  " -> "grosse"
+        """
+        text = text.casefold()
+        if not text.isascii():
+            text = unicodedata.normalize("NFKD", text)
+            text = "".join(character for character in text if not unicodedata.combining(character))
+        return " ".join(text.split())
+
+    @staticmethod
+    def trigrams(text: str) -> set:
+        """
+        Method to split a normalized text into its trigrams
+        :param text: normalized text
+        :return: set of trigrams
+        """
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
+    def add(self, documentId: int, text: str):
+        """
+        Method to add or replace a document
+        :param documentId: id of the document, e.g. question id
+        :param text: text of the document
+        """
+        if documentId in self.documents:
+            self.remove(documentId)
+
+        document = self.normalize(text)
+        self.documents[documentId] = document
+
+        postings = self.postings
+        for trigram in self.trigrams(document):
+            postingList = postings.get(trigram)
+            if postingList is None:
+                postings[trigram] = {documentId}
+            else:
+                postingList.add(documentId)
+
+    def remove(self, documentId: int):
+        """
+        Method to remove a document, unknown ids are ignored
+        :param documentId: id of the document
+        """
+        document = self.documents.pop(documentId, None)
+        if document is None:
+            return
+
+        for trigram in self.trigrams(document):
+            postingList = self.postings.get(trigram)
+            if postingList is not None:
+                postingList.discard(documentId)
+                if len(postingList) == 0:
+                    del self.postings[trigram]
+
+    def search(self, query: str, fuzzy: bool = True) -> list:
+        """
+        Method to search for documents containing the query.
+        If no document contains the query and fuzzy is set, documents sharing most of the query trigrams are returned.
+        :param query: the text to search for
+        :param fuzzy: True to search typo-tolerant if there is no exact match
+        :return: list of document ids, exact matches ordered by id, fuzzy matches by similarity
+        """
+        key = self.normalize(query)
+
+        if not key:
+            return sorted(self.documents)
+
+        if len(key) < 3:
+            return sorted(documentId for documentId, document in self.documents.items() if key in document)
+
+        queryTrigrams = self.trigrams(key)
+
+        # the substring check follows anyway, intersecting long posting lists of common trigrams costs more than it saves
+        candidates = min((self.postings.get(trigram, ()) for trigram in queryTrigrams), key=len)
+        documents = self.documents
+        result = sorted(documentId for documentId in candidates if key in documents[documentId])
+
+        if len(result) > 0 or not fuzzy:
+            return result
+
+        counts: dict = {}
+        for trigram in queryTrigrams:
+            for documentId in self.postings.get(trigram, ()):
+                counts[documentId] = counts.get(documentId, 0) + 1
+
+        minCount = self.minSimilarity * len(queryTrigrams)
+        matches = [(count, documentId) for documentId, count in counts.items() if count >= minCount]
+        matches.sort(key=lambda match: (-match[0], match[1]))
+
+        return [documentId for count, documentId in matches]
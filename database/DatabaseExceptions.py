@@ -13,3 +13,14 @@ class DatabaseNotConnectedError(Error):
 
     def __init__(self, message):
         self.message = message
+
+
+class FullTextSearchNotAvailableError(Error):
+    """Exception raised if SQLite has no full-text search index.
+
+    Attributes:
+        message -- explanation of the error
+    """
+
+    def __init__(self, message):
+        self.message = message
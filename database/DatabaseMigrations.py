@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+
+class Migration:
+    """
+    Class representing one versioned step of a database schema
+    """
+
+    def __init__(self, version: int, description: str, statements: list = None, function=None):
+        """
+        Constructor
+        :param version: schema version reached after this migration, ascending without gaps
+        :param description: short description for the log
+        :param statements: SQL statements executed in order
+        :param function: optional function(database) executed after the statements
+        """
+        if statements is None:
+            statements = []
+        self.version = version
+        self.description = description
+        self.statements = statements
+        self.function = function
+
+
+class DatabaseMigrations:
+    """
+    Class which brings a database backend to the latest schema version.
+
+    The backend has to provide:
+    - getSchemaVersion() -> int: current schema version, 0 for a new database
+    - setSchemaVersion(version): store the schema version inside the running transaction
+    - transaction(): context manager, commit on success and rollback on exception
+    - c: cursor to execute the statements
+
+    Every migration runs exactly once in its own transaction. A database which already has
+    the latest version is detected with one version lookup and no DDL is executed.
+    """
+
+    def __init__(self, logger, migrations: list):
+        """
+        Constructor
+        :param logger: logger Object
+        :param migrations: list of Migration objects
+        """
+        self.logger = logger
+        self.migrations: list = sorted(migrations, key=lambda migration: migration.version)
+
+    def latestVersion(self) -> int:
+        """
+        Method to get the schema version reached after all migrations
+        :return: latest version, 0 if there are no migrations
+        """
+        if len(self.migrations) == 0:
+            return 0
+        return self.migrations[-1].version
+
+    def migrate(self, database) -> int:
+        """
+        Method to apply all missing migrations to the given backend
+        :param database: DatabaseSQLite or DatabaseMySQL object
+        :return: schema version of the database after the migration
+        """
+        currentVersion = database.getSchemaVersion()
+
+        if currentVersion >= self.latestVersion():
+            return currentVersion
+
+        for migration in self.migrations:
+            if migration.version <= currentVersion:
+                continue
+
+            self.logger.info("Migrate database to version " + str(migration.version) + ": " + migration.description)
+
+            try:
+                with database.transaction():
+                    for statement in migration.statements:
+                        database.c.execute(statement)
+
+                    if migration.function:
+                        migration.function(database)
+
+                    database.setSchemaVersion(migration.version)
+
+            except Exception as e:
+                self.logger.error("Error while migrate database to version " + str(migration.version) + ": " + str(e))
+                raise
+
+            currentVersion = migration.version
+
+        return currentVersion
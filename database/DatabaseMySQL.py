@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 
+import copy
 import threading
-import time
+from contextlib import contextmanager
+
 import mysql.connector
+from mysql.connector import errorcode
 
 from database.DatabaseExceptions import DatabaseNotConnectedError
+from database.DatabaseMigrations import DatabaseMigrations, Migration
 
 
 class DatabaseMySQL:
@@ -12,7 +16,37 @@ class DatabaseMySQL:
     DatabaseController class will handle connections between MHF and a MySQL database
     """
 
-    def __init__(self, logger, host: str, port: int, user: str, password: str, database: str):
+    # columns of the synchronised tables in the order of the SQLite rows, primary key columns first
+    # the last primary key column is used for range checksums
+    TABLE_COLUMNS: dict = {
+        "tb_question_types": ("id_type", "typeName", "displayName", "options", "updatedAt"),
+        "tb_question_categories": ("id_categoryQ", "name", "description", "updatedAt"),
+        "tb_questionnaire_categories": ("id_categoryQA", "name", "description", "updatedAt"),
+        "tb_questions": ("id_question", "text", "type", "options", "required", "dependentOn", "expectedAnswer", "abbrv", "score", "comment", "category", "updatedAt"),
+        "tb_questionnaires": ("id_questionnaire", "name", "description", "category", "created", "lastChanged", "updatedAt"),
+        "tb_collections": ("id_Q", "id_QA", "position", "required", "updatedAt"),
+    }
+    TABLE_KEYS: dict = {
+        "tb_question_types": ("id_type",),
+        "tb_question_categories": ("id_categoryQ",),
+        "tb_questionnaire_categories": ("id_categoryQA",),
+        "tb_questions": ("id_question",),
+        "tb_questionnaires": ("id_questionnaire",),
+        "tb_collections": ("id_Q", "id_QA"),
+    }
+    # UNIQUE columns besides the primary key of the synchronised tables
+    UNIQUE_COLUMNS: dict = {
+        "tb_question_categories": "name",
+        "tb_questionnaire_categories": "name",
+        "tb_questions": "abbrv",
+    }
+
+    # seconds between health checks and bounds of the reconnect backoff
+    checkInterval: float = 1
+    minReconnectDelay: float = 1
+    maxReconnectDelay: float = 60
+
+    def __init__(self, logger, host: str, port: int, user: str, password: str, database: str, poolSize: int = 4, onReconnect=None, connector=mysql.connector, waitForConnection: bool = False):
         """
         Constructor
         :keyword logger logger Object
@@ -21,6 +55,10 @@ class DatabaseMySQL:
         :keyword user Username MySQL Server
         :keyword password Password MySQL Server
         :keyword database name of database
+        :keyword poolSize number of connections in the pool
+        :keyword onReconnect optional function called by the supervisor thread after the connection is recovered
+        :keyword connector driver module providing pooling.MySQLConnectionPool, e.g. a fake driver for tests
+        :keyword waitForConnection True to connect in the background if the database is not available yet, otherwise raise
         """
         self.logger = logger
         self.host: str = host
@@ -28,13 +66,33 @@ class DatabaseMySQL:
         self.user: str = user
         self.password = password
         self.database: str = database
+        self.poolSize: int = poolSize
+        self.onReconnect = onReconnect
+        self.connector = connector
 
         self.mysqlRun: bool = True
         self.connected: bool = False
 
-        self.__connect(True)
+        # serializes the use of the connection between the sync thread and the supervisor thread
+        self.lock = threading.RLock()
+        self.stopEvent = threading.Event()
+
+        self.pool = None
+        self.conn = None
+        self.c = None
+
+        try:
+            self.__connect()
+            self.connected = True
+
+        except Exception:
+            if not waitForConnection:
+                raise
+
+            self.logger.warning("MySQL database not available, try to connect in the background")
 
-        self.checkThread = threading.Thread(target=self.__checkConnection, daemon=True).start()
+        self.checkThread = threading.Thread(target=self.__superviseConnection, daemon=True)
+        self.checkThread.start()
 
     def __enter__(self):
         return self
@@ -42,381 +100,579 @@ class DatabaseMySQL:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.disconnet()
 
-    def __connect(self, first: bool = False):
+    def __connect(self):
         """
-        Method to connect to MySQL database, if not available try to reconnect all 5 seconds
+        Method to create the connection pool and take the connection of this object from it
         """
-        while True:
-            try:
-                self.conn = mysql.connector.connect(host=self.host, port=self.port, user=self.user, password=self.password, database=self.database)
-                self.c = self.conn.cursor()
+        try:
+            self.pool = self.connector.pooling.MySQLConnectionPool(
+                pool_name="mhf_" + str(id(self)), pool_size=self.poolSize, host=self.host, port=self.port, user=self.user, password=self.password, database=self.database
+            )
+            conn = self.pool.get_connection()
+            self.c = conn.cursor()
+            self.conn = conn
 
-                self.__createTables()
+            self.__createTables()
 
-                return
+        except Exception as e:
+            self.logger.error("Error while connection to MySQL database: " + str(e))
+            raise
 
-            except Exception as e:
-                self.logger.error("Error while connection to MySQL database, try to reconnect in 5 seconds: " + str(e))
+    def openSession(self):
+        """
+        Method to open another connection of the pool, e.g. for a worker thread.
+        The session has no supervisor thread, it is closed with session.conn.close().
+        :return: DatabaseMySQL object using its own connection
+        """
+        try:
+            session = copy.copy(self)
+            session.conn = self.pool.get_connection()
+            session.c = session.conn.cursor()
+            session.lock = threading.RLock()
+            session.stopEvent = threading.Event()
+            session.checkThread = None
+            session.onReconnect = None
+            session.connected = True
 
-                if first:
-                    raise
+            return session
 
-                time.sleep(5)
+        except Exception as e:
+            self.logger.error("Error while open MySQL session: " + str(e))
+            raise
 
     def disconnet(self):
         """
-        Method to disconnect from MySQL database
+        Method to disconnect from MySQL database, the supervisor thread is stopped without waiting for it
         """
         self.mysqlRun = False
-        self.connected = True
-        time.sleep(2)
+        self.connected = False
+        self.stopEvent.set()
 
         try:
-            self.conn.close()
+            with self.lock:
+                if self.conn is not None:
+                    self.conn.close()
         except Exception as e:
             self.logger.error("Error while disconnect MySQL database: " + str(e))
             raise
 
-    def __checkConnection(self):
+    def __superviseConnection(self):
         """
-        Method to check if the MySQL database connected
-        If not connected, the method try to connect
+        Method of the supervisor thread to check the connection with ping(reconnect=True).
+        If the connection is lost, the reconnect is retried with exponential backoff.
+        All waits end immediately on disconnet.
         """
-        while self.mysqlRun:
+        delay = self.checkInterval
+        reconnectDelay = 0
+
+        while not self.stopEvent.wait(delay):
+            if self.__pingConnection():
+                delay = self.checkInterval
+                reconnectDelay = 0
+                continue
+
+            reconnectDelay = min(max(reconnectDelay * 2, self.minReconnectDelay), self.maxReconnectDelay)
+            delay = reconnectDelay
+
+            self.logger.error("Error: MySQL database are disconnected, try to reconnect in " + str(delay) + " seconds")
+
+    def __pingConnection(self) -> bool:
+        """
+        Method to check the connection and to reconnect it if it is lost, a connection never established is established
+        :return: True if connected
+        """
+        with self.lock:
+            if not self.mysqlRun:
+                return True
+
+            wasConnected = self.connected
+
             try:
-                self.c.execute("SELECT * FROM tb_questions LIMIT 1")
-                self.c.fetchone()
+                if self.conn is None:
+                    self.__connect()
+                else:
+                    self.conn.ping(reconnect=True, attempts=1, delay=0)
+
+                    if not wasConnected:
+                        self.c = self.conn.cursor()
+                        self.__createTables()
+
                 self.connected = True
 
             except Exception as e:
-                self.logger.error("Error: MySQL database are disconnected: " + str(e))
+                if wasConnected:
+                    self.logger.error("Error: MySQL database are disconnected: " + str(e))
                 self.connected = False
-                self.__connect()
 
-            time.sleep(1)
+                return False
+
+        if not wasConnected:
+            self.logger.info("MySQL database reconnected")
+
+            if self.onReconnect:
+                self.onReconnect()
+
+        return True
 
     def __createTables(self):
         """
-        Methode to create all needed Tables if they are not exist
+        Methode to bring the database to the latest schema version by applying the missing migrations
         """
         try:
-            self.c.execute(
-                "CREATE TABLE IF NOT EXISTS tb_question_types(" "id_type INT PRIMARY KEY," "typeName VARCHAR(255) NOT NULL," "displayName VARCHAR(255) NOT NULL," "options BOOLEAN NOT NULL" ")"
-            )
-
-            self.c.execute("CREATE TABLE IF NOT EXISTS tb_question_categories(" "id_categoryQ INT PRIMARY KEY," "name VARCHAR(255) UNIQUE NOT NULL," "description VARCHAR(255)" ")")
-
-            self.c.execute("CREATE TABLE IF NOT EXISTS tb_questionnaire_categories(" "id_categoryQA INT PRIMARY KEY," "name VARCHAR(255) UNIQUE NOT NULL," "description VARCHAR(255)" ")")
-
-            self.c.execute(
-                "CREATE TABLE IF NOT EXISTS tb_questions("
-                "id_question INT PRIMARY KEY,"
-                "text LONGTEXT NOT NULL,"
-                "type INT NOT NULL,"
-                "options VARCHAR(255) NOT NULL,"
-                "required BOOLEAN NOT NULL,"
-                "dependentOn INT NOT NULL,"
-                "expectedAnswer VARCHAR(255) NOT NULL,"
-                "abbrv VARCHAR(255) UNIQUE NOT NULL,"
-                "score BOOLEAN NOT NULL,"
-                "comment BOOLEAN NOT NULL,"
-                "category INT NOT NULL"
-                # 'FOREIGN KEY(type) REFERENCES tb_question_types(id_type),'
-                # 'FOREIGN KEY(dependentOn) REFERENCES tb_questions(id_question),'
-                # 'FOREIGN KEY(category) REFERENCES tb_question_Categories(id_categoryQ)'
-                ")"
-            )
-
-            self.c.execute(
-                "CREATE TABLE IF NOT EXISTS tb_questionnaires("
-                "id_questionnaire INT PRIMARY KEY,"
-                "name VARCHAR(255) NOT NULL,"
-                "description VARCHAR(255),"
-                "category INT NOT NULL,"
-                "created TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,"
-                "lastChanged TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP"
-                # 'FOREIGN KEY(category) REFERENCES tb_questionnaire_Categories(id_categoryQA)'
-                ")"
-            )
-
-            self.c.execute(
-                "CREATE TABLE IF NOT EXISTS tb_collections("
-                "id_Q INT NOT NULL,"
-                "id_QA INT NOT NULL,"
-                "position INT NOT NULL,"
-                "required BOOLEAN NOT NULL,"
-                "PRIMARY KEY (id_Q, id_QA)"
-                # 'FOREIGN KEY(id_Q) REFERENCES tb_questions(id_question),'
-                # 'FOREIGN KEY(id_QA) REFERENCES tb_questionnaires(id_questionnaire)'
-                ")"
-            )
+            DatabaseMigrations(self.logger, self.__migrations()).migrate(self)
 
         except Exception as e:
             self.logger.error("Error while create tables in MySQL database: " + str(e))
             raise
 
-    def addQuestion(
-        self, idQuestion: int, text: str, questionType: int, options: str, required: int, dependent_on: int, expectedAnswer: str, abbrv: str, score: int, comment: int, category: int
-    ) -> int:
-        """
-        Method to add a new question into the tb_questions table
-        :param idQuestion: id of question
-        :param text: text of question
-        :param questionType: type id ov question
-        :param options: options of question (JSON)
-        :param required: if question required or not
-        :param dependent_on: dependent on question id
-        :param expectedAnswer: option of dependent on question
-        :param abbrv: unique abbreviation of question
-        :param score: if question score or not
-        :param comment: if question comment or not
-        :param category: category id of question
-        :return: new row id
+    def __migrations(self) -> list:
+        """
+        Methode which defines all schema versions of the MySQL database.
+        New tables, columns or indexes have to be added as a new migration with the next version.
+        DDL statements commit implicitly in MySQL, so every migration has to be safe to repeat.
+        :return: list of Migration objects
+        """
+        return [
+            Migration(
+                version=1,
+                description="create tables",
+                statements=[
+                    "CREATE TABLE IF NOT EXISTS tb_question_types(" "id_type INT PRIMARY KEY," "typeName VARCHAR(255) NOT NULL," "displayName VARCHAR(255) NOT NULL," "options BOOLEAN NOT NULL" ")",
+                    "CREATE TABLE IF NOT EXISTS tb_question_categories(" "id_categoryQ INT PRIMARY KEY," "name VARCHAR(255) UNIQUE NOT NULL," "description VARCHAR(255)" ")",
+                    "CREATE TABLE IF NOT EXISTS tb_questionnaire_categories(" "id_categoryQA INT PRIMARY KEY," "name VARCHAR(255) UNIQUE NOT NULL," "description VARCHAR(255)" ")",
+                    "CREATE TABLE IF NOT EXISTS tb_questions("
+                    "id_question INT PRIMARY KEY,"
+                    "text LONGTEXT NOT NULL,"
+                    "type INT NOT NULL,"
+                    "options VARCHAR(255) NOT NULL,"
+                    "required BOOLEAN NOT NULL,"
+                    "dependentOn INT NOT NULL,"
+                    "expectedAnswer VARCHAR(255) NOT NULL,"
+                    "abbrv VARCHAR(255) UNIQUE NOT NULL,"
+                    "score BOOLEAN NOT NULL,"
+                    "comment BOOLEAN NOT NULL,"
+                    "category INT NOT NULL"
+                    # 'FOREIGN KEY(type) REFERENCES tb_question_types(id_type),'
+                    # 'FOREIGN KEY(dependentOn) REFERENCES tb_questions(id_question),'
+                    # 'FOREIGN KEY(category) REFERENCES tb_question_Categories(id_categoryQ)'
+                    ")",
+                    "CREATE TABLE IF NOT EXISTS tb_questionnaires("
+                    "id_questionnaire INT PRIMARY KEY,"
+                    "name VARCHAR(255) NOT NULL,"
+                    "description VARCHAR(255),"
+                    "category INT NOT NULL,"
+                    "created TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,"
+                    "lastChanged TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP"
+                    # 'FOREIGN KEY(category) REFERENCES tb_questionnaire_Categories(id_categoryQA)'
+                    ")",
+                    "CREATE TABLE IF NOT EXISTS tb_collections("
+                    "id_Q INT NOT NULL,"
+                    "id_QA INT NOT NULL,"
+                    "position INT NOT NULL,"
+                    "required BOOLEAN NOT NULL,"
+                    "PRIMARY KEY (id_Q, id_QA)"
+                    # 'FOREIGN KEY(id_Q) REFERENCES tb_questions(id_question),'
+                    # 'FOREIGN KEY(id_QA) REFERENCES tb_questionnaires(id_questionnaire)'
+                    ")",
+                ],
+            ),
+            Migration(version=2, description="create secondary indexes", function=DatabaseMySQL.__createIndexes),
+            Migration(
+                version=3,
+                description="create row versions for the bidirectional synchronisation",
+                statements=[
+                    "CREATE TABLE IF NOT EXISTS tb_hub_version(" "id INT PRIMARY KEY," "version BIGINT NOT NULL" ")",
+                    "INSERT IGNORE INTO tb_hub_version(id, version) VALUES (1, 0)",
+                    "CREATE TABLE IF NOT EXISTS tb_tombstones("
+                    "tableName VARCHAR(64) NOT NULL,"
+                    "key1 INT NOT NULL,"
+                    "key2 INT NOT NULL,"
+                    "updatedAt BIGINT NOT NULL,"
+                    "version BIGINT NOT NULL,"
+                    "PRIMARY KEY (tableName, key1, key2),"
+                    "INDEX idx_tombstones_version (version)"
+                    ")",
+                ],
+                function=DatabaseMySQL.__createRowVersions,
+            ),
+            Migration(
+                version=4,
+                description="widen ids for the ids per workstation",
+                statements=[
+                    "ALTER TABLE tb_question_categories MODIFY id_categoryQ BIGINT NOT NULL",
+                    "ALTER TABLE tb_questionnaire_categories MODIFY id_categoryQA BIGINT NOT NULL",
+                    "ALTER TABLE tb_questions MODIFY id_question BIGINT NOT NULL, MODIFY dependentOn BIGINT NOT NULL, MODIFY category BIGINT NOT NULL",
+                    "ALTER TABLE tb_questionnaires MODIFY id_questionnaire BIGINT NOT NULL, MODIFY category BIGINT NOT NULL",
+                    "ALTER TABLE tb_collections MODIFY id_Q BIGINT NOT NULL, MODIFY id_QA BIGINT NOT NULL",
+                    "ALTER TABLE tb_tombstones MODIFY key1 BIGINT NOT NULL, MODIFY key2 BIGINT NOT NULL",
+                ],
+            ),
+        ]
+
+    def getSchemaVersion(self) -> int:
+        """
+        Methode to return the schema version of the database
+        :return: highest version in tb_schema_version, 0 for a new database
         """
-        if self.connected:
-            try:
-                self.c.execute(
-                    "INSERT INTO tb_questions(id_question, text, type, options, required, dependentON, expectedAnswer, abbrv, score, comment, category) VALUES ( %s,  %s,  %s,  %s,  %s,  %s,  %s,  %s,  %s,  %s, %s)",
-                    (idQuestion, text, questionType, options, required, dependent_on, expectedAnswer, abbrv, score, comment, category),
-                )
-                self.conn.commit()
-
-                return self.c.lastrowid
+        try:
+            self.c.execute("SELECT MAX(version) FROM tb_schema_version")
+            version = self.c.fetchone()[0]
 
-            except Exception as e:
-                self.logger.error("Error while insert database row into tb_questions: " + str(e))
+        except mysql.connector.Error as e:
+            if e.errno != errorcode.ER_NO_SUCH_TABLE:
                 raise
 
-        else:
-            self.logger.error("SQLite database not connect")
-            raise DatabaseNotConnectedError("MySQL database not connect")
+            self.c.execute("CREATE TABLE IF NOT EXISTS tb_schema_version(" "version INT PRIMARY KEY," "applied TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP" ")")
+            version = None
+
+        if version is None:
+            return 0
+        return version
 
-    def clearQuestions(self) -> bool:
+    def setSchemaVersion(self, version: int):
         """
-        Method to clear the tb_questions table
-        :return: True / exception
+        Methode to store the schema version of the database
+        :param version: new schema version
         """
-        if self.connected:
-            try:
-                self.c.execute("DELETE FROM tb_questions")
-                self.conn.commit()
-
-                return True
+        self.c.execute("INSERT INTO tb_schema_version(version) VALUES (%s)", (version,))
 
-            except Exception as e:
-                self.logger.error("Error while clear database rows from tb_questions: " + str(e))
-                raise
-        else:
-            self.logger.error("MySQL database not connect")
-            raise DatabaseNotConnectedError("MySQL database not connect")
-
-    def addQuestionCategory(self, idCategoryQ: int, name: str, description: str) -> int:
+    @contextmanager
+    def transaction(self):
         """
-        Method to add a new category into the tb_question_Categories table
-        :param idCategoryQ: id of QuestionCategory
-        :param name: name of QuestionCategory
-        :param description: description of QuestionCategory
-        :return: new row id
+        Context manager to commit all operations inside at once, on an exception they are rolled back
+        The connection is locked against the supervisor thread until the end of the transaction.
         """
-        if self.connected:
+        with self.lock:
             try:
-                self.c.execute("INSERT INTO tb_question_Categories(id_categoryQ, name, description) VALUES ( %s,  %s, %s)", (idCategoryQ, name, description))
-                self.conn.commit()
-
-                return self.c.lastrowid
-
+                yield self
             except Exception as e:
-                self.logger.error("Error while insert database row into tb_question_Categories: " + str(e))
+                self.logger.error("Error while transaction, rollback MySQL database: " + str(e))
+                self.conn.rollback()
                 raise
+            else:
+                self.conn.commit()
 
-        else:
-            self.logger.error("MySQL database not connect")
-            raise DatabaseNotConnectedError("MySQL database not connect")
-
-    def clearQuestionCategories(self) -> bool:
+    def __createIndexes(self):
         """
-        Method to clear the tb_question_Categories table
-        :return: True / exception
+        Methode to create the secondary indexes which are missing, also on existing databases
+        tb_collections lookups by id_Q are covered by its primary key (id_Q, id_QA).
         """
-        if self.connected:
-            try:
-                self.c.execute("DELETE FROM tb_question_Categories")
-                self.conn.commit()
+        lstIndexes = [
+            ("tb_collections", "idx_collections_questionnaire", "id_QA, position"),
+            ("tb_questions", "idx_questions_category", "category"),
+            ("tb_questions", "idx_questions_dependentOn", "dependentOn"),
+        ]
 
-                return True
+        try:
+            self.c.execute("SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = %s", (self.database,))
+            existingIndexes = [row[0] for row in self.c.fetchall()]
 
-            except Exception as e:
-                self.logger.error("Error while clear database rows from tb_question_Categories: " + str(e))
-                raise
-        else:
-            self.logger.error("MySQL database not connect")
-            raise DatabaseNotConnectedError("MySQL database not connect")
+            for table, name, columns in lstIndexes:
+                if name not in existingIndexes:
+                    self.c.execute("CREATE INDEX " + name + " ON " + table + "(" + columns + ")")
 
-    def addQuestionnaireCategory(self, idCategoryQA: int, name: str, description: str) -> int:
+        except Exception as e:
+            self.logger.error("Error while create indexes in MySQL database: " + str(e))
+            raise
+
+    def __createRowVersions(self):
         """
-        Method to add a new category into the tb_questionnaire_Categories table
-        :param idCategoryQA: id of QuestionnaireCategory
-        :param name: name of QuestionnaireCategory
-        :param description: description of QuestionnaireCategory
-        :return: new row id
+        Methode to add the columns updatedAt (UTC milliseconds of the last change, last writer wins)
+        and version (hub version of the last change, pulled incrementally) to the synchronised tables
         """
-        if self.connected:
-            try:
-                self.c.execute("INSERT INTO tb_questionnaire_Categories(id_categoryQA, name, description) VALUES ( %s,  %s, %s)", (idCategoryQA, name, description))
-                self.conn.commit()
-
-                return self.c.lastrowid
+        try:
+            self.c.execute("SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = %s AND COLUMN_NAME IN ('updatedAt', 'version')", (self.database,))
+            existingColumns = [(row[0].lower(), row[1]) for row in self.c.fetchall()]
 
-            except Exception as e:
-                self.logger.error("Error while insert database row into tb_Categories: " + str(e))
-                raise
+            for table in self.TABLE_KEYS:
+                if (table, "updatedAt") not in existingColumns:
+                    self.c.execute("ALTER TABLE " + table + " ADD COLUMN updatedAt BIGINT NOT NULL DEFAULT 0")
+                if (table, "version") not in existingColumns:
+                    self.c.execute("ALTER TABLE " + table + " ADD COLUMN version BIGINT NOT NULL DEFAULT 0, ADD INDEX idx_" + table + "_version (version)")
 
-        else:
-            self.logger.error("MySQL database not connect")
-            raise DatabaseNotConnectedError("MySQL database not connect")
+        except Exception as e:
+            self.logger.error("Error while create row versions in MySQL database: " + str(e))
+            raise
 
-    def clearQuestionnaireCategories(self) -> bool:
+    def getChecksums(self, table: str, rangeSize: int = 0) -> dict:
         """
-        Method to clear the tb_questionnaire_Categories table
-        :return: True / exception
+        Method to calculate the checksums of a synchronised table per range of its last key column on the server
+        :param table: name of table, see TABLE_COLUMNS
+        :param rangeSize: number of key values per range, 0 for one checksum of the whole table
+        :return: dict range -> (number of rows, XOR of the row checksums), empty for an empty table
         """
         if self.connected:
             try:
-                self.c.execute("DELETE FROM tb_questionnaire_Categories")
-                self.conn.commit()
+                column = self.TABLE_KEYS[table][-1]
+                aggregates = "COUNT(*), BIT_XOR(CRC32(CONCAT_WS('#', " + ", ".join(self.TABLE_COLUMNS[table]) + ")))"
 
-                return True
+                with self.lock:
+                    if rangeSize > 0:
+                        self.c.execute("SELECT " + column + " DIV %s AS bucket, " + aggregates + " FROM " + table + " GROUP BY bucket", (rangeSize,))
+                    else:
+                        self.c.execute("SELECT 0, " + aggregates + " FROM " + table + " HAVING COUNT(*) > 0")
+
+                    return {int(row[0]): (int(row[1]), int(row[2])) for row in self.c.fetchall()}
 
             except Exception as e:
-                self.logger.error("Error while clear database rows from tb_Categories: " + str(e))
+                self.logger.error("Error while calculate checksums of " + table + ": " + str(e))
                 raise
         else:
             self.logger.error("MySQL database not connect")
             raise DatabaseNotConnectedError("MySQL database not connect")
 
-    def addCollection(self, idQ: int, id_QA: int, position: int, required: int) -> int:
+    def getRowsInRanges(self, table: str, rangeSize: int, ranges: list) -> list:
         """
-        Method to add a new collection into the tb_collections table
-        :param idQ: id of question
-        :param id_QA: id of questionnaire
-        :return: new row id
+        Method to return the rows of a synchronised table within ranges of its last key column
+        :param table: name of table, see TABLE_COLUMNS
+        :param rangeSize: number of key values per range
+        :param ranges: list of range numbers, see getChecksums
+        :return: List of rows in the column order of TABLE_COLUMNS
         """
         if self.connected:
             try:
-                self.c.execute("INSERT INTO tb_collections(id_Q, id_QA, position, required) VALUES ( %s,  %s,  %s,  %s)", (idQ, id_QA, position, required))
-                self.conn.commit()
+                column = self.TABLE_KEYS[table][-1]
+                lstRows = []
 
-                return self.c.lastrowid
+                with self.lock:
+                    for bucket in ranges:
+                        self.c.execute(
+                            "SELECT " + ", ".join(self.TABLE_COLUMNS[table]) + " FROM " + table + " WHERE " + column + " >= %s AND " + column + " < %s",
+                            (bucket * rangeSize, (bucket + 1) * rangeSize),
+                        )
+                        lstRows.extend(self.c.fetchall())
+
+                return lstRows
 
             except Exception as e:
-                self.logger.error("Error while insert database row into tb_collections: " + str(e))
+                self.logger.error("Error while select database rows from " + table + ": " + str(e))
                 raise
-
         else:
             self.logger.error("MySQL database not connect")
             raise DatabaseNotConnectedError("MySQL database not connect")
 
-    def clearCollections(self) -> bool:
+    def nextVersion(self) -> int:
         """
-        Method to clear the tb_collections table
-        :return: True / exception
+        Method to take the next hub version for the changes of one transaction, use it inside transaction().
+        The row lock on tb_hub_version keeps the versions in commit order.
+        :return: new version
         """
-        if self.connected:
-            try:
-                self.c.execute("DELETE FROM tb_collections")
-                self.conn.commit()
+        self.c.execute("UPDATE tb_hub_version SET version = LAST_INSERT_ID(version + 1) WHERE id = 1")
+        self.c.execute("SELECT LAST_INSERT_ID()")
 
-                return True
+        return int(self.c.fetchone()[0])
 
-            except Exception as e:
-                self.logger.error("Error while clear database rows from tb_collections: " + str(e))
-                raise
-        else:
-            self.logger.error("MySQL database not connect")
-            raise DatabaseNotConnectedError("MySQL database not connect")
-
-    def addType(self, idType: int, name: str, displayName: str, options: int) -> int:
+    def getHubVersion(self) -> int:
         """
-        Method to add a new type into the tb_question_types table
-        :param idType: id of type
-        :param name: name of type
-        :param displayName: displayName of type
-        :param options: 1=true, 0=false
-        :return: new row id
+        Method to return the version of the last committed change, use it inside transaction()
+        :return: version
         """
+        self.c.execute("SELECT version FROM tb_hub_version WHERE id = 1")
 
-        if self.connected:
-            try:
-                self.c.execute("INSERT INTO tb_question_types(id_type, typeName, displayName, options) VALUES ( %s,  %s,  %s, %s)", (idType, name, displayName, options))
-                self.conn.commit()
+        return int(self.c.fetchone()[0])
 
-                return self.c.lastrowid
-
-            except Exception as e:
-                self.logger.error("Error while insert database row into tb_question_types: " + str(e))
-                raise
+    def getChangedRows(self, table: str, afterVersion: int) -> list:
+        """
+        Method to return the rows of a synchronised table changed after a version, use it inside transaction()
+        :param table: name of table, see TABLE_COLUMNS
+        :param afterVersion: last version already pulled
+        :return: List of rows in the column order of TABLE_COLUMNS
+        """
+        self.c.execute("SELECT " + ", ".join(self.TABLE_COLUMNS[table]) + " FROM " + table + " WHERE version > %s", (afterVersion,))
 
-        else:
-            self.logger.error("MySQL database not connect")
-            raise DatabaseNotConnectedError("MySQL database not connect")
+        return self.c.fetchall()
 
-    def clearTypes(self) -> bool:
+    def getTombstones(self, afterVersion: int) -> list:
         """
-        Method to clear the tb_question_types table
-        :return: True / exception
+        Method to return the rows deleted after a version, use it inside transaction()
+        :param afterVersion: last version already pulled
+        :return: List of (tableName, key1, key2, updatedAt)
         """
-        if self.connected:
-            try:
-                self.c.execute("DELETE FROM tb_question_types")
-                self.conn.commit()
+        self.c.execute("SELECT tableName, key1, key2, updatedAt FROM tb_tombstones WHERE version > %s", (afterVersion,))
 
-                return True
+        return self.c.fetchall()
 
-            except Exception as e:
-                self.logger.error("Error while clear database rows from tb_question_types: " + str(e))
-                raise
-        else:
-            self.logger.error("MySQL database not connect")
-            raise DatabaseNotConnectedError("MySQL database not connect")
+    def getTarget(self) -> str:
+        """
+        Method to return the name of this database as sync target
+        :return: user@host:port/database
+        """
+        return self.user + "@" + self.host + ":" + str(self.port) + "/" + self.database
 
-    def addQuestionnaire(self, idQuestionnaire: int, name: str, description: str, category: int) -> int:
+    def upsertRows(self, table: str, rows: list, version: int) -> list:
         """
-        Method to add a new questionnaire into the tb_questionnaires table
-        :param idQuestionnaire: id of questionnaire
-        :param name: name of questionnaire
-        :param description: description of questionnaire
-        :param category: category id of questionnaire
-        :return: new row id
+        Method to insert or update rows of a synchronised table, use it inside transaction()
+        An existing row is only updated if the new row has an equal or newer updatedAt (last writer wins).
+        A row deleted at or after its updatedAt is not written again, the tombstone of a row written after its delete
+        is removed, see dropDeletedRows.
+        A row taking the value of a UNIQUE column of another row is not written, otherwise ON DUPLICATE KEY UPDATE
+        would update the other row, see orderUniqueRows.
+        :param table: name of table, see TABLE_COLUMNS
+        :param rows: list of rows in the column order of TABLE_COLUMNS
+        :param version: hub version of the change, see nextVersion
+        :return: list of the rows not written because of a UNIQUE column
         """
         if self.connected:
             try:
-                self.c.execute("INSERT INTO tb_questionnaires(id_questionnaire, name, description, category) VALUES ( %s,  %s,  %s, %s)", (idQuestionnaire, name, description, category))
-                self.conn.commit()
+                columns = self.TABLE_COLUMNS[table]
+                keys = self.TABLE_KEYS[table]
+                newer = "VALUES(updatedAt) >= updatedAt"
+                lstConflicts = []
+
+                if len(rows) > 0:
+                    self.c.execute(
+                        "SELECT key1, key2, updatedAt FROM tb_tombstones WHERE tableName = %s AND key1 IN (" + ", ".join(["%s"] * len(rows)) + ")", [table] + [row[0] for row in rows]
+                    )
+                    rows, lstRevived = self.dropDeletedRows(table, rows, self.c.fetchall())
+
+                if table in self.UNIQUE_COLUMNS and len(rows) > 0:
+                    uniqueColumn = self.UNIQUE_COLUMNS[table]
+                    uniqueIndex = columns.index(uniqueColumn)
+                    self.c.execute(
+                        "SELECT " + keys[0] + ", " + uniqueColumn + ", updatedAt FROM " + table + " WHERE " + keys[0] + " IN (" + ", ".join(["%s"] * len(rows)) + ") OR "
+                        + uniqueColumn + " IN (" + ", ".join(["%s"] * len(rows)) + ")",
+                        [row[0] for row in rows] + [row[uniqueIndex] for row in rows],
+                    )
+                    rows, lstConflicts = self.orderUniqueRows(table, rows, self.c.fetchall())
+
+                    for row in lstConflicts:
+                        self.logger.warning("Row " + str(row[0]) + " of " + table + " not synchronised, " + uniqueColumn + " " + str(row[uniqueIndex]) + " belongs to another row")
+
+                if len(rows) == 0:
+                    return lstConflicts
+
+                # MySQL assigns from left to right, updatedAt has to be compared before it is assigned
+                updates = [column + "=IF(" + newer + ", VALUES(" + column + "), " + column + ")" for column in columns if column not in keys and column != "updatedAt"]
+                updates.append("version=IF(" + newer + ", VALUES(version), version)")
+                updates.append("updatedAt=GREATEST(updatedAt, VALUES(updatedAt))")
+
+                self.c.executemany(
+                    "INSERT INTO " + table + "(" + ", ".join(columns) + ", version) VALUES (" + ", ".join(["%s"] * (len(columns) + 1)) + ") ON DUPLICATE KEY UPDATE " + ", ".join(updates),
+                    [tuple(row) + (version,) for row in rows],
+                )
+
+                setWritten = {self.tombstoneKey(table, row) for row in rows}
+                lstRevived = [(table,) + key for key in lstRevived if key in setWritten]
+                if len(lstRevived) > 0:
+                    self.c.executemany("DELETE FROM tb_tombstones WHERE tableName = %s AND key1 = %s AND key2 = %s", lstRevived)
 
-                return self.c.lastrowid
+                return lstConflicts
 
             except Exception as e:
-                self.logger.error("Error while insert database row into tb_questionnaires: " + str(e))
+                self.logger.error("Error while upsert database rows into " + table + ": " + str(e))
                 raise
-
         else:
             self.logger.error("MySQL database not connect")
             raise DatabaseNotConnectedError("MySQL database not connect")
 
-    def clearQuestionnaires(self) -> bool:
-        """
-        Method to clear the tb_questionnaires table
+    @classmethod
+    def orderUniqueRows(cls, table: str, rows: list, existingRows: list) -> tuple:
+        """
+        Method to find the rows of an upsert whose value of the UNIQUE column belongs to another row.
+        The other rows are ordered so a value released by a renamed row is taken afterwards, rows older than
+        the existing row are left out as the upsert would not change them. Values are compared case-insensitive
+        like the collation of the column.
+        :param table: name of table, see UNIQUE_COLUMNS
+        :param rows: list of rows in the column order of TABLE_COLUMNS
+        :param existingRows: list of (key, unique value, updatedAt) of the existing rows with a key or value of the rows
+        :return: (rows to upsert in this order, rows not to upsert because of the UNIQUE column)
+        """
+        uniqueIndex = cls.TABLE_COLUMNS[table].index(cls.UNIQUE_COLUMNS[table])
+
+        dictHolders = {}
+        dictValues = {}
+        dictUpdatedAt = {}
+        for key, value, updatedAt in existingRows:
+            dictHolders[str(value).lower()] = key
+            dictValues[key] = str(value).lower()
+            dictUpdatedAt[key] = updatedAt
+
+        lstPending = [row for row in rows if row[0] not in dictUpdatedAt or row[-1] >= dictUpdatedAt[row[0]]]
+        lstOrdered = []
+
+        while len(lstPending) > 0:
+            lstWaiting = []
+
+            for row in lstPending:
+                value = str(row[uniqueIndex]).lower()
+                if dictHolders.get(value, row[0]) != row[0]:
+                    lstWaiting.append(row)
+                    continue
+
+                dictHolders.pop(dictValues.get(row[0]), None)
+                dictHolders[value] = row[0]
+                dictValues[row[0]] = value
+                lstOrdered.append(row)
+
+            if len(lstWaiting) == len(lstPending):
+                break
+            lstPending = lstWaiting
+
+        return lstOrdered, lstPending
+
+    @classmethod
+    def tombstoneKey(cls, table: str, row) -> tuple:
+        """
+        Method to build the key of the tombstone of a row
+        :param table: name of table, see TABLE_KEYS
+        :param row: row in the column order of TABLE_COLUMNS
+        :return: (key1, key2), key2 is 0 for tables with one key column
+        """
+        return (row[0], row[1] if len(cls.TABLE_KEYS[table]) > 1 else 0)
+
+    @classmethod
+    def dropDeletedRows(cls, table: str, rows: list, tombstones: list) -> tuple:
+        """
+        Method to find the rows of an upsert which were deleted at or after their updatedAt.
+        Without it an older edit of an offline workstation would bring a newer delete back to life.
+        :param table: name of table, see TABLE_KEYS
+        :param rows: list of rows in the column order of TABLE_COLUMNS
+        :param tombstones: list of (key1, key2, updatedAt) of the tombstones of the table with a key of the rows
+        :return: (rows to upsert, keys (key1, key2) of the tombstones outdated by these rows)
+        """
+        dictDeletedAt = {(key1, key2): updatedAt for key1, key2, updatedAt in tombstones}
+        lstRows = []
+        lstRevived = []
+
+        for row in rows:
+            key = cls.tombstoneKey(table, row)
+            deletedAt = dictDeletedAt.get(key)
+
+            if deletedAt is None:
+                lstRows.append(row)
+            elif row[-1] > deletedAt:
+                lstRows.append(row)
+                lstRevived.append(key)
+
+        return lstRows, lstRevived
+
+    def deleteRows(self, table: str, deletes: list, version: int) -> bool:
+        """
+        Method to delete rows of a synchronised table by primary key, use it inside transaction()
+        A row changed after the delete is kept (last writer wins), a tombstone tells the other workstations about the delete.
+        :param table: name of table, see TABLE_KEYS
+        :param deletes: list of (key1, key2, updatedAt), key2 is None for tables with one key column
+        :param version: hub version of the change, see nextVersion
         :return: True / exception
         """
         if self.connected:
             try:
-                self.c.execute("DELETE FROM tb_questionnaires")
-                self.conn.commit()
+                keyColumns = self.TABLE_KEYS[table]
+
+                self.c.executemany(
+                    "DELETE FROM " + table + " WHERE " + " AND ".join(column + "=%s" for column in keyColumns) + " AND updatedAt <= %s",
+                    [(key1, key2)[: len(keyColumns)] + (updatedAt,) for key1, key2, updatedAt in deletes],
+                )
+                self.c.executemany(
+                    "INSERT INTO tb_tombstones(tableName, key1, key2, updatedAt, version) VALUES (%s, %s, %s, %s, %s) "
+                    "ON DUPLICATE KEY UPDATE version=IF(VALUES(updatedAt) >= updatedAt, VALUES(version), version), updatedAt=GREATEST(updatedAt, VALUES(updatedAt))",
+                    [(table, key1, key2 or 0, updatedAt, version) for key1, key2, updatedAt in deletes],
+                )
 
                 return True
 
             except Exception as e:
-                self.logger.error("Error while clear database rows from tb_questionnaires: " + str(e))
+                self.logger.error("Error while delete database rows from " + table + ": " + str(e))
                 raise
         else:
             self.logger.error("MySQL database not connect")
@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 
+import secrets
 import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
 
-from database.DatabaseExceptions import DatabaseNotConnectedError
+from database.DatabaseExceptions import DatabaseNotConnectedError, FullTextSearchNotAvailableError
+from database.DatabaseMigrations import DatabaseMigrations, Migration
 
 
 class DatabaseSQLite:
@@ -11,16 +16,43 @@ class DatabaseSQLite:
     DatabaseController class will handle connections between MHF and a SQLite database
     """
 
-    def __init__(self, logger, pathSQLiteDatabase: Path, questionTypes: list = []):
+    # allowed values of the tuning pragmas, None = any integer
+    PRAGMAS: dict = {
+        "journal_mode": ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+        "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+        "cache_size": None,
+        "mmap_size": None,
+        "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+    }
+
+    # primary key columns of the synchronised tables, the last one is used for range checksums
+    TABLE_KEYS: dict = {
+        "tb_question_types": ("id_type",),
+        "tb_question_categories": ("id_categoryQ",),
+        "tb_questionnaire_categories": ("id_categoryQA",),
+        "tb_questions": ("id_question",),
+        "tb_questionnaires": ("id_questionnaire",),
+        "tb_collections": ("id_Q", "id_QA"),
+    }
+
+    # tables whose new rows get ids of the workstation, the question types are seeded with equal ids everywhere
+    ID_TABLES: tuple = ("tb_question_categories", "tb_questionnaire_categories", "tb_questions", "tb_questionnaires")
+    # ids of a workstation are its site id shifted by SITE_SHIFT plus a counter, so two workstations never create the same id
+    SITE_SHIFT: int = 32
+    SITE_BITS: int = 30
+
+    def __init__(self, logger, pathSQLiteDatabase: Path, questionTypes: list = [], pragmas: dict = None):
         """
         Constructor
         :keyword logger logger Object
         :param pathSQLiteDatabase: path of databasefile e.g. data/mhf.db
         :param questionTypes: List of Questiontypes ("typeName", "displayName", options)
+        :param pragmas: tuning profile set at connect time, e.g. {"journal_mode": "WAL", "synchronous": "NORMAL"}
         """
         self.logger: logger = logger
         self.connected: bool = False
         self.lstQuestionTypes: list = questionTypes
+        self.transactionDepth: int = 0
 
         if not pathSQLiteDatabase.parent.is_dir():
             self.logger.warning("Data directory not exist, will be created.")
@@ -38,12 +70,15 @@ class DatabaseSQLite:
             self.logger.error("Error while connection to SQLITE database: " + str(e))
             raise
 
-        self.__createTables()
+        if pragmas:
+            self.__setPragmas(pragmas)
 
         self.connected = True
 
-        self.__createTypes()
-        self.__createCategories()
+        self.__createTables()
+
+        self.fullTextSearch: bool = self.__hasTable("tb_questions_fts")
+        self.substringSearch: bool = self.__hasTable("tb_questions_trigram")
 
     def __enter__(self):
         return self
@@ -55,114 +90,443 @@ class DatabaseSQLite:
             self.logger.error("Error while disconnect SQLITE database: " + str(e))
             raise
 
+    def __setPragmas(self, pragmas: dict):
+        """
+        Method to apply the tuning profile to the connection, unknown or invalid settings are skipped
+        :param pragmas: dict of pragma name and value
+        """
+        for name, value in pragmas.items():
+            if name not in self.PRAGMAS:
+                self.logger.warning("Unknown SQLite pragma will be skipped: " + str(name))
+                continue
+
+            allowedValues = self.PRAGMAS[name]
+            try:
+                if allowedValues is None:
+                    value = int(value)
+                else:
+                    value = str(value).strip().upper()
+                    if value not in allowedValues:
+                        raise ValueError("allowed are " + ", ".join(allowedValues))
+
+                self.c.execute("PRAGMA " + name + "=" + str(value))
+                self.c.fetchall()
+
+            except Exception as e:
+                self.logger.warning("Error while set SQLite pragma " + str(name) + ", will be skipped: " + str(e))
+
+    @contextmanager
+    def transaction(self, write: bool = True):
+        """
+        Context manager to bundle all write operations inside into one commit.
+        On an exception every change since the start of the transaction is rolled back.
+        Nested transactions are part of the outermost one.
+        A write transaction takes the write lock at the start, otherwise the first write after a read fails
+        in WAL mode as soon as another connection has committed in between (SQLITE_BUSY_SNAPSHOT).
+        :param write: False for a read-only transaction, which only reads from one snapshot and does not block writers
+        """
+        if not self.connected:
+            self.logger.error("SQLite database not connect")
+            raise DatabaseNotConnectedError("SQLite database not connect")
+
+        if self.transactionDepth == 0 and not self.conn.in_transaction:
+            # explicit BEGIN, otherwise DDL statements are committed immediately
+            self.c.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+
+        self.transactionDepth += 1
+        try:
+            yield self
+        except Exception as e:
+            self.transactionDepth -= 1
+            if self.transactionDepth == 0:
+                self.logger.error("Error while transaction, rollback SQLITE database: " + str(e))
+                self.conn.rollback()
+            raise
+        else:
+            self.transactionDepth -= 1
+            if self.transactionDepth == 0:
+                self.conn.commit()
+
+    def __commit(self):
+        """
+        Method to commit the last write operation, unless it is part of a transaction
+        """
+        if self.transactionDepth == 0:
+            self.conn.commit()
+
     def __createTables(self):
         """
-        Method which create all needed Tables if they not exist
+        Method which brings the database to the latest schema version by applying the missing migrations
         :return: True or raise Exception
         """
-        try:
+        DatabaseMigrations(self.logger, self.__migrations()).migrate(self)
+
+        return True
+
+    def __migrations(self) -> list:
+        """
+        Method which defines all schema versions of the SQLite database.
+        New tables, columns or indexes have to be added as a new migration with the next version.
+        :return: list of Migration objects
+        """
+        return [
+            Migration(
+                version=1,
+                description="create tables",
+                statements=[
+                    "CREATE TABLE IF NOT EXISTS tb_question_types(" "id_type INTEGER PRIMARY KEY AUTOINCREMENT," "typeName TEXT NOT NULL," "displayName TEXT NOT NULL," "options INTEGER NOT NULL" ")",
+                    "CREATE TABLE IF NOT EXISTS tb_question_categories(" "id_categoryQ INTEGER PRIMARY KEY AUTOINCREMENT," "name TEXT UNIQUE NOT NULL," "description TEXT" ")",
+                    "CREATE TABLE IF NOT EXISTS tb_questionnaire_categories(" "id_categoryQA INTEGER PRIMARY KEY AUTOINCREMENT," "name TEXT UNIQUE NOT NULL," "description TEXT" ")",
+                    "CREATE TABLE IF NOT EXISTS tb_questions("
+                    "id_question INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    "text TEXT NOT NULL,"
+                    "type INTEGER NOT NULL,"
+                    "options TEXT NOT NULL,"
+                    "required INTEGER NOT NULL,"
+                    "dependentOn INTEGER NOT NULL,"
+                    "expectedAnswer TEXT NOT NULL,"
+                    "abbrv TEXT UNIQUE NOT NULL,"
+                    "score INTEGER NOT NULL,"
+                    "comment INTEGER NOT NULL,"
+                    "category INTEGER NOT NULL,"
+                    "FOREIGN KEY(type) REFERENCES tb_question_types(id_type),"
+                    "FOREIGN KEY(dependentOn) REFERENCES tb_questions(id_question),"
+                    "FOREIGN KEY(category) REFERENCES tb_question_Categories(id_categoryQ)"
+                    ")",
+                    "CREATE TABLE IF NOT EXISTS tb_questionnaires("
+                    "id_questionnaire INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    "name TEXT NOT NULL,"
+                    "description TEXT,"
+                    "category INTEGER NOT NULL,"
+                    "created TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,"
+                    "lastChanged TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,"
+                    "FOREIGN KEY(category) REFERENCES tb_questionnaire_Categories(id_categoryQA)"
+                    ")",
+                    "CREATE TABLE IF NOT EXISTS tb_collections("
+                    "id_Q INTEGER NOT NULL,"
+                    "id_QA INTEGER NOT NULL,"
+                    "position INTEGER NOT NULL,"
+                    "required INTEGER NOT NULL,"
+                    "PRIMARY KEY (id_Q, id_QA),"
+                    "FOREIGN KEY(id_Q) REFERENCES tb_questions(id_question),"
+                    "FOREIGN KEY(id_QA) REFERENCES tb_questionnaires(id_questionnaire)"
+                    ")",
+                ],
+            ),
+            Migration(
+                version=2,
+                description="create secondary indexes",
+                statements=[
+                    "CREATE INDEX IF NOT EXISTS idx_collections_questionnaire ON tb_collections(id_QA, position)",
+                    "CREATE INDEX IF NOT EXISTS idx_questions_category ON tb_questions(category)",
+                    "CREATE INDEX IF NOT EXISTS idx_questions_dependentOn ON tb_questions(dependentOn)",
+                ],
+            ),
+            Migration(version=3, description="create question types and default categories", function=DatabaseSQLite.__createTypesAndCategories),
+            Migration(version=4, description="create full-text search index of questions", function=DatabaseSQLite.__createFullTextSearch),
+            Migration(
+                version=5,
+                description="create change log for the synchronisation",
+                statements=[
+                    "CREATE TABLE IF NOT EXISTS tb_changelog("
+                    "seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    "tableName TEXT NOT NULL,"
+                    "key1 INTEGER NOT NULL,"
+                    "key2 INTEGER,"
+                    "operation TEXT NOT NULL"
+                    ")",
+                    "CREATE TABLE IF NOT EXISTS tb_sync_state(" "target TEXT PRIMARY KEY," "seq INTEGER NOT NULL" ")",
+                ],
+                function=DatabaseSQLite.__createChangeLogTriggers,
+            ),
+            Migration(
+                version=6,
+                description="create row versions for the bidirectional synchronisation",
+                statements=[
+                    "ALTER TABLE tb_changelog ADD COLUMN changedAt INTEGER NOT NULL DEFAULT 0",
+                    "ALTER TABLE tb_sync_state ADD COLUMN pulledVersion INTEGER NOT NULL DEFAULT 0",
+                ],
+                function=DatabaseSQLite.__createRowVersions,
+            ),
+            Migration(
+                version=7,
+                description="create ids per workstation for the synchronisation",
+                statements=["CREATE TABLE IF NOT EXISTS tb_id_sequence(" "tableName TEXT PRIMARY KEY," "lastId INTEGER NOT NULL" ")"],
+                function=DatabaseSQLite.__createIdSequences,
+            ),
+            Migration(
+                version=8,
+                description="create sync conflicts",
+                statements=[
+                    "CREATE TABLE IF NOT EXISTS tb_sync_conflicts("
+                    "target TEXT NOT NULL,"
+                    "tableName TEXT NOT NULL,"
+                    "key1 INTEGER NOT NULL,"
+                    "key2 INTEGER,"
+                    "reason TEXT NOT NULL,"
+                    "detectedAt INTEGER NOT NULL"
+                    ")",
+                    "CREATE INDEX IF NOT EXISTS idx_sync_conflicts_target ON tb_sync_conflicts(target, tableName, key1)",
+                ],
+            ),
+            Migration(version=9, description="create substring search index of questions", function=DatabaseSQLite.__createSubstringSearch),
+        ]
+
+    def __createFullTextSearch(self):
+        """
+        Method which create the FTS5 index over text, abbreviation and options of the questions.
+        Triggers keep the index in sync with tb_questions. Skipped if SQLite is compiled without FTS5.
+        """
+        self.c.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if not self.c.fetchone()[0]:
+            self.logger.warning("SQLite is compiled without FTS5, questions will be searched without index")
+            return
+
+        self.c.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS tb_questions_fts USING fts5("
+            "text, abbrv, options,"
+            "content='tb_questions', content_rowid='id_question',"
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3'"
+            ")"
+        )
+        self.c.execute(
+            "CREATE TRIGGER IF NOT EXISTS tr_questions_fts_insert AFTER INSERT ON tb_questions BEGIN "
+            "INSERT INTO tb_questions_fts(rowid, text, abbrv, options) VALUES (new.id_question, new.text, new.abbrv, new.options); "
+            "END"
+        )
+        self.c.execute(
+            "CREATE TRIGGER IF NOT EXISTS tr_questions_fts_delete AFTER DELETE ON tb_questions BEGIN "
+            "INSERT INTO tb_questions_fts(tb_questions_fts, rowid, text, abbrv, options) VALUES ('delete', old.id_question, old.text, old.abbrv, old.options); "
+            "END"
+        )
+        self.c.execute(
+            "CREATE TRIGGER IF NOT EXISTS tr_questions_fts_update AFTER UPDATE ON tb_questions BEGIN "
+            "INSERT INTO tb_questions_fts(tb_questions_fts, rowid, text, abbrv, options) VALUES ('delete', old.id_question, old.text, old.abbrv, old.options); "
+            "INSERT INTO tb_questions_fts(rowid, text, abbrv, options) VALUES (new.id_question, new.text, new.abbrv, new.options); "
+            "END"
+        )
+        self.c.execute("INSERT INTO tb_questions_fts(tb_questions_fts) VALUES ('rebuild')")
+
+    def __createSubstringSearch(self):
+        """
+        Method which create the FTS5 trigram index over text and abbreviation of the questions for substring searches,
+        e.g. "nehmen" in "einnehmen". Triggers keep the index in sync with tb_questions, the stamp of updatedAt does not rewrite it.
+        Skipped if SQLite is compiled without FTS5 or is older than 3.34 without the trigram tokenizer.
+        """
+        self.c.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if not self.c.fetchone()[0] or sqlite3.sqlite_version_info < (3, 34, 0):
+            self.logger.warning("SQLite has no FTS5 trigram tokenizer, questions will be searched without substring index")
+            return
+
+        self.c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS tb_questions_trigram USING fts5(" "text, abbrv," "content='tb_questions', content_rowid='id_question'," "tokenize='trigram'" ")")
+        self.c.execute(
+            "CREATE TRIGGER IF NOT EXISTS tr_questions_trigram_insert AFTER INSERT ON tb_questions BEGIN "
+            "INSERT INTO tb_questions_trigram(rowid, text, abbrv) VALUES (new.id_question, new.text, new.abbrv); "
+            "END"
+        )
+        self.c.execute(
+            "CREATE TRIGGER IF NOT EXISTS tr_questions_trigram_delete AFTER DELETE ON tb_questions BEGIN "
+            "INSERT INTO tb_questions_trigram(tb_questions_trigram, rowid, text, abbrv) VALUES ('delete', old.id_question, old.text, old.abbrv); "
+            "END"
+        )
+        self.c.execute(
+            "CREATE TRIGGER IF NOT EXISTS tr_questions_trigram_update AFTER UPDATE OF text, abbrv ON tb_questions BEGIN "
+            "INSERT INTO tb_questions_trigram(tb_questions_trigram, rowid, text, abbrv) VALUES ('delete', old.id_question, old.text, old.abbrv); "
+            "INSERT INTO tb_questions_trigram(rowid, text, abbrv) VALUES (new.id_question, new.text, new.abbrv); "
+            "END"
+        )
+        self.c.execute("INSERT INTO tb_questions_trigram(tb_questions_trigram) VALUES ('rebuild')")
+
+    def __createChangeLogTriggers(self):
+        """
+        Method which create the triggers writing every change of the synchronised tables into tb_changelog
+        """
+        for table, keys in self.TABLE_KEYS.items():
+            newKey2 = "new." + keys[1] if len(keys) > 1 else "NULL"
+            oldKey2 = "old." + keys[1] if len(keys) > 1 else "NULL"
+
+            self.c.execute(
+                "CREATE TRIGGER IF NOT EXISTS tr_" + table + "_changelog_insert AFTER INSERT ON " + table + " BEGIN "
+                "INSERT INTO tb_changelog(tableName, key1, key2, operation) VALUES ('" + table + "', new." + keys[0] + ", " + newKey2 + ", 'I'); "
+                "END"
+            )
+            self.c.execute(
+                "CREATE TRIGGER IF NOT EXISTS tr_" + table + "_changelog_update AFTER UPDATE ON " + table + " BEGIN "
+                "INSERT INTO tb_changelog(tableName, key1, key2, operation) SELECT '" + table + "', old." + keys[0] + ", " + oldKey2 + ", 'D' "
+                "WHERE old." + keys[0] + " IS NOT new." + keys[0] + " OR " + oldKey2 + " IS NOT " + newKey2 + "; "
+                "INSERT INTO tb_changelog(tableName, key1, key2, operation) VALUES ('" + table + "', new." + keys[0] + ", " + newKey2 + ", 'U'); "
+                "END"
+            )
             self.c.execute(
-                "CREATE TABLE IF NOT EXISTS tb_question_types(" "id_type INTEGER PRIMARY KEY AUTOINCREMENT," "typeName TEXT NOT NULL," "displayName TEXT NOT NULL," "options INTEGER NOT NULL" ")"
+                "CREATE TRIGGER IF NOT EXISTS tr_" + table + "_changelog_delete AFTER DELETE ON " + table + " BEGIN "
+                "INSERT INTO tb_changelog(tableName, key1, key2, operation) VALUES ('" + table + "', old." + keys[0] + ", " + oldKey2 + ", 'D'); "
+                "END"
             )
 
-            self.c.execute("CREATE TABLE IF NOT EXISTS tb_question_categories(" "id_categoryQ INTEGER PRIMARY KEY AUTOINCREMENT," "name TEXT UNIQUE NOT NULL," "description TEXT" ")")
+    def __createRowVersions(self):
+        """
+        Method which add the column updatedAt (UTC milliseconds of the last change) to the synchronised tables.
+        Triggers stamp every local insert and update, rows written with their own updatedAt (pulled rows) keep it.
+        Deletes are recorded in tb_changelog with their time for the last-writer-wins resolution.
+        """
+        now = "CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)"
 
-            self.c.execute("CREATE TABLE IF NOT EXISTS tb_questionnaire_categories(" "id_categoryQA INTEGER PRIMARY KEY AUTOINCREMENT," "name TEXT UNIQUE NOT NULL," "description TEXT" ")")
+        for table, keys in self.TABLE_KEYS.items():
+            where = " AND ".join(column + "=new." + column for column in keys)
+            oldKey2 = "old." + keys[1] if len(keys) > 1 else "NULL"
 
+            self.c.execute("ALTER TABLE " + table + " ADD COLUMN updatedAt INTEGER NOT NULL DEFAULT 0")
             self.c.execute(
-                "CREATE TABLE IF NOT EXISTS tb_questions("
-                "id_question INTEGER PRIMARY KEY AUTOINCREMENT,"
-                "text TEXT NOT NULL,"
-                "type INTEGER NOT NULL,"
-                "options TEXT NOT NULL,"
-                "required INTEGER NOT NULL,"
-                "dependentOn INTEGER NOT NULL,"
-                "expectedAnswer TEXT NOT NULL,"
-                "abbrv TEXT UNIQUE NOT NULL,"
-                "score INTEGER NOT NULL,"
-                "comment INTEGER NOT NULL,"
-                "category INTEGER NOT NULL,"
-                "FOREIGN KEY(type) REFERENCES tb_question_types(id_type),"
-                "FOREIGN KEY(dependentOn) REFERENCES tb_questions(id_question),"
-                "FOREIGN KEY(category) REFERENCES tb_question_Categories(id_categoryQ)"
-                ")"
+                "CREATE TRIGGER IF NOT EXISTS tr_" + table + "_stamp_insert AFTER INSERT ON " + table + " WHEN new.updatedAt = 0 BEGIN "
+                "UPDATE " + table + " SET updatedAt = " + now + " WHERE " + where + "; "
+                "END"
+            )
+            self.c.execute(
+                "CREATE TRIGGER IF NOT EXISTS tr_" + table + "_stamp_update AFTER UPDATE ON " + table + " WHEN new.updatedAt = old.updatedAt BEGIN "
+                "UPDATE " + table + " SET updatedAt = " + now + " WHERE " + where + "; "
+                "END"
             )
 
+            self.c.execute("DROP TRIGGER IF EXISTS tr_" + table + "_changelog_delete")
             self.c.execute(
-                "CREATE TABLE IF NOT EXISTS tb_questionnaires("
-                "id_questionnaire INTEGER PRIMARY KEY AUTOINCREMENT,"
-                "name TEXT NOT NULL,"
-                "description TEXT,"
-                "category INTEGER NOT NULL,"
-                "created TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,"
-                "lastChanged TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,"
-                "FOREIGN KEY(category) REFERENCES tb_questionnaire_Categories(id_categoryQA)"
-                ")"
+                "CREATE TRIGGER tr_" + table + "_changelog_delete AFTER DELETE ON " + table + " BEGIN "
+                "INSERT INTO tb_changelog(tableName, key1, key2, operation, changedAt) VALUES ('" + table + "', old." + keys[0] + ", " + oldKey2 + ", 'D', " + now + "); "
+                "END"
             )
 
+        if self.__hasTable("tb_questions_fts"):
+            # the stamp of updatedAt must not rewrite the index
+            self.c.execute("DROP TRIGGER IF EXISTS tr_questions_fts_update")
             self.c.execute(
-                "CREATE TABLE IF NOT EXISTS tb_collections("
-                "id_Q INTEGER NOT NULL,"
-                "id_QA INTEGER NOT NULL,"
-                "position INTEGER NOT NULL,"
-                "required INTEGER NOT NULL,"
-                "PRIMARY KEY (id_Q, id_QA),"
-                "FOREIGN KEY(id_Q) REFERENCES tb_questions(id_question),"
-                "FOREIGN KEY(id_QA) REFERENCES tb_questionnaires(id_questionnaire)"
-                ")"
+                "CREATE TRIGGER tr_questions_fts_update AFTER UPDATE OF text, abbrv, options ON tb_questions BEGIN "
+                "INSERT INTO tb_questions_fts(tb_questions_fts, rowid, text, abbrv, options) VALUES ('delete', old.id_question, old.text, old.abbrv, old.options); "
+                "INSERT INTO tb_questions_fts(rowid, text, abbrv, options) VALUES (new.id_question, new.text, new.abbrv, new.options); "
+                "END"
             )
 
-        except Exception as e:
-            self.logger.error("Error while create tables in SQLITE database: " + str(e))
-            raise
+    def __createIdSequences(self):
+        """
+        Method which draw the random site id of this workstation and start the id sequences of the tables in ID_TABLES.
+        Rows are created with ids of the site, so rows created on different workstations never share an id.
+        The ids of the existing rows are kept.
+        """
+        siteId = secrets.randbelow((1 << self.SITE_BITS) - 1) + 1
 
-        return True
+        for table in self.ID_TABLES:
+            self.c.execute("INSERT OR IGNORE INTO tb_id_sequence(tableName, lastId) VALUES (?, ?)", (table, siteId << self.SITE_SHIFT))
 
-    def __createTypes(self):
+    def __nextId(self, table: str) -> int:
         """
-        Method which create all possible question types
+        Method to take the next id of this workstation for a new row, part of the transaction of the insert
+        :param table: name of table, see ID_TABLES
+        :return: new id
         """
+        self.c.execute("UPDATE tb_id_sequence SET lastId = lastId + 1 WHERE tableName=?", (table,))
+        self.c.execute("SELECT lastId FROM tb_id_sequence WHERE tableName=?", (table,))
 
-        for value in self.lstQuestionTypes:
-            if self.connected:
-                try:
-                    # Check if the type already exist
-                    self.c.execute("SELECT COUNT(typeName) FROM tb_question_types WHERE typeName=?", (value[0],))
-                    if self.c.fetchone()[0] == 0:
-                        self.addType(value[0], value[1], value[2])
+        return self.c.fetchone()[0]
 
-                except Exception as e:
-                    self.logger.error("Error while SELECT database rows from tb_question_types: " + str(e))
-                    raise
+    def __hasTable(self, name: str) -> bool:
+        """
+        Method to check if a table exists, e.g. an optional search index
+        :param name: name of the table
+        :return: True if the table exists
+        """
+        self.c.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name=?", (name,))
 
-            else:
-                self.logger.error("SQLite database not connect")
-                raise DatabaseNotConnectedError("SQLite database not connect")
+        return self.c.fetchone()[0] == 1
 
-        return True
+    def getSchemaVersion(self) -> int:
+        """
+        Method to return the schema version of the database
+        :return: version stored in PRAGMA user_version, 0 for a new database
+        """
+        self.c.execute("PRAGMA user_version")
+
+        return self.c.fetchone()[0]
 
-    def __createCategories(self):
+    def setSchemaVersion(self, version: int):
         """
-        Method which create the standard categories
+        Method to store the schema version of the database
+        :param version: new schema version
         """
+        self.c.execute("PRAGMA user_version=" + str(int(version)))
 
-        try:
-            self.c.execute("SELECT COUNT(id_categoryQ) FROM tb_question_Categories WHERE id_categoryQ=1 AND name=?", ("Allgemein",))
-            if self.c.fetchone()[0] == 0:
-                self.addQuestionCategory("Allgemein", "")
+    def getStatistics(self) -> dict:
+        """
+        Method to return the number of rows per table and the size of the database file
+        :return: dict with the row count per table name, "tb_changelog" = changes not yet acknowledged,
+        "tb_sync_conflicts" = rows the sync target did not accept, "size" and "free" in bytes, "schemaVersion" and "fullTextSearch"
+        """
+        dictStatistics = {}
 
-        except Exception as e:
-            self.logger.error("Error while SELECT database rows from tb_question_Categories: " + str(e))
-            raise
+        for table in list(self.TABLE_KEYS) + ["tb_changelog", "tb_sync_conflicts"]:
+            self.c.execute("SELECT COUNT(*) FROM " + table)
+            dictStatistics[table] = self.c.fetchone()[0]
 
-        try:
-            self.c.execute("SELECT COUNT(id_categoryQA) FROM tb_questionnaire_Categories WHERE id_categoryQA=1 AND name=?", ("Allgemein",))
-            if self.c.fetchone()[0] == 0:
-                self.addQuestionnaireCategory("Allgemein", "")
+        self.c.execute("PRAGMA page_size")
+        pageSize = self.c.fetchone()[0]
+        self.c.execute("PRAGMA page_count")
+        dictStatistics["size"] = self.c.fetchone()[0] * pageSize
+        self.c.execute("PRAGMA freelist_count")
+        dictStatistics["free"] = self.c.fetchone()[0] * pageSize
 
-        except Exception as e:
-            self.logger.error("Error while SELECT database rows from tb_questionnaire_Categories: " + str(e))
-            raise
+        dictStatistics["schemaVersion"] = self.getSchemaVersion()
+        dictStatistics["fullTextSearch"] = self.fullTextSearch
+
+        return dictStatistics
+
+    def vacuum(self) -> bool:
+        """
+        Method to compact the database file: merges the full-text search index, rebuilds the file without free pages,
+        updates the query planner statistics and truncates the write-ahead log. Not allowed inside transaction().
+        :return: True / exception
+        """
+        if self.connected:
+            if self.transactionDepth > 0:
+                raise RuntimeError("VACUUM is not allowed inside a transaction")
+
+            try:
+                if self.fullTextSearch:
+                    self.c.execute("INSERT INTO tb_questions_fts(tb_questions_fts) VALUES ('optimize')")
+                if self.substringSearch:
+                    self.c.execute("INSERT INTO tb_questions_trigram(tb_questions_trigram) VALUES ('optimize')")
+                self.conn.commit()
+
+                self.c.execute("VACUUM")
+                self.c.execute("PRAGMA optimize")
+                self.c.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self.c.fetchall()
+
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while vacuum SQLITE database: " + str(e))
+                raise
+        else:
+            self.logger.error("SQLite database not connect")
+            raise DatabaseNotConnectedError("SQLite database not connect")
+
+    def __createTypesAndCategories(self):
+        """
+        Method which create all possible question types and the standard categories if they not exist
+        """
+        if len(self.lstQuestionTypes) == 0:
+            raise ValueError("No question types given to initialise the database")
+
+        for value in self.lstQuestionTypes:
+            self.c.execute(
+                "INSERT INTO tb_question_types(typeName, displayName, options) SELECT ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM tb_question_types WHERE typeName=?)",
+                (value[0], value[1], value[2], value[0]),
+            )
+
+        self.c.execute(
+            "INSERT INTO tb_question_Categories(name, description) SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM tb_question_Categories WHERE id_categoryQ=1 AND name=?)", ("Allgemein", "", "Allgemein")
+        )
+        self.c.execute(
+            "INSERT INTO tb_questionnaire_Categories(name, description) SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM tb_questionnaire_Categories WHERE id_categoryQA=1 AND name=?)",
+            ("Allgemein", "", "Allgemein"),
+        )
 
     def addQuestion(self, text: str, questionType: int, options: str, required: int, dependent_on: int, expectedAnswer: str, abbrv: str, score: int, comment: int, category: int) -> int:
         """
@@ -181,9 +545,11 @@ class DatabaseSQLite:
         """
         if self.connected:
             try:
+                idQuestion = self.__nextId("tb_questions")
                 self.c.execute(
-                    "INSERT INTO tb_questions(text, type, options, required, dependentON, expectedAnswer, abbrv, score, comment, category) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    "INSERT INTO tb_questions(id_question, text, type, options, required, dependentON, expectedAnswer, abbrv, score, comment, category) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
                     (
+                        idQuestion,
                         text,
                         questionType,
                         options,
@@ -196,9 +562,9 @@ class DatabaseSQLite:
                         category,
                     ),
                 )
-                self.conn.commit()
+                self.__commit()
 
-                return self.c.lastrowid
+                return idQuestion
 
             except Exception as e:
                 self.logger.error("Error while insert database row into tb_questions: " + str(e))
@@ -244,7 +610,7 @@ class DatabaseSQLite:
                         id_question,
                     ),
                 )
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -264,7 +630,7 @@ class DatabaseSQLite:
         if self.connected:
             try:
                 self.c.execute("DELETE FROM tb_questions WHERE id_question=?", (questionId,))
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -288,6 +654,74 @@ class DatabaseSQLite:
 
         return lstRows
 
+    def getQuestionById(self, questionId: int):
+        """
+        Method to return one row from the tb_questions table by id
+        :param questionId: question row id
+        return: row or None
+        """
+        self.c.execute("SELECT * FROM tb_questions WHERE id_question=?", (questionId,))
+
+        return self.c.fetchone()
+
+    def searchQuestions(self, match: str, category: int = None, limit: int = -1) -> list:
+        """
+        Method to search the full-text index of questions.
+        With a limit the best matches come first, otherwise all matches are ordered by id,
+        because ranking has to score every match and is slow for common words.
+        :param match: FTS5 query e.g. '"schwanger"*'
+        :param category: category id to filter, None for all categories
+        :param limit: maximum number of results, -1 for all
+        return: List of question ids
+        """
+        if not self.fullTextSearch:
+            raise FullTextSearchNotAvailableError("SQLite full-text search index not available")
+
+        order = "f.rank" if limit >= 0 else "f.rowid"
+
+        if category is None:
+            self.c.execute("SELECT f.rowid FROM tb_questions_fts f WHERE tb_questions_fts MATCH ? ORDER BY " + order + " LIMIT ?", (match, limit))
+        else:
+            self.c.execute(
+                "SELECT f.rowid FROM tb_questions_fts f JOIN tb_questions q ON q.id_question = f.rowid WHERE tb_questions_fts MATCH ? AND q.category = ? ORDER BY " + order + " LIMIT ?",
+                (match, category, limit),
+            )
+
+        return [row[0] for row in self.c.fetchall()]
+
+    def searchQuestionsBySubstring(self, text: str, category: int = None, limit: int = -1) -> list:
+        """
+        Method to search the trigram index of questions for text and abbreviations containing the text, case is folded
+        :param text: text of at least 3 characters
+        :param category: category id to filter, None for all categories
+        :param limit: maximum number of results, -1 for all
+        return: List of question ids ordered by id
+        """
+        if not self.substringSearch:
+            raise FullTextSearchNotAvailableError("SQLite substring search index not available")
+
+        match = '"' + text.replace('"', '""') + '"'
+
+        if category is None:
+            self.c.execute("SELECT rowid FROM tb_questions_trigram WHERE tb_questions_trigram MATCH ? ORDER BY rowid LIMIT ?", (match, limit))
+        else:
+            self.c.execute(
+                "SELECT f.rowid FROM tb_questions_trigram f JOIN tb_questions q ON q.id_question = f.rowid WHERE tb_questions_trigram MATCH ? AND q.category = ? ORDER BY f.rowid LIMIT ?",
+                (match, category, limit),
+            )
+
+        return [row[0] for row in self.c.fetchall()]
+
+    def getQuestionByAbbrv(self, abbrv: str):
+        """
+        Method to return one row from the tb_questions table by abbreviation
+        :param abbrv: unique abbreviation of question
+        return: row or None
+        """
+        self.c.execute("SELECT * FROM tb_questions WHERE abbrv=?", (abbrv,))
+
+        return self.c.fetchone()
+
     def addQuestionCategory(self, name: str, description: str) -> int:
         """
         Method to add a new category into the tb_question_Categories table
@@ -297,10 +731,11 @@ class DatabaseSQLite:
         """
         if self.connected:
             try:
-                self.c.execute("INSERT INTO tb_question_Categories(name, description) VALUES (?, ?)", (name, description))
-                self.conn.commit()
+                idCategory = self.__nextId("tb_question_categories")
+                self.c.execute("INSERT INTO tb_question_Categories(id_categoryQ, name, description) VALUES (?, ?, ?)", (idCategory, name, description))
+                self.__commit()
 
-                return self.c.lastrowid
+                return idCategory
 
             except Exception as e:
                 self.logger.error("Error while insert database row into tb_question_Categories: " + str(e))
@@ -328,7 +763,7 @@ class DatabaseSQLite:
                         id_categoryQ,
                     ),
                 )
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -348,7 +783,7 @@ class DatabaseSQLite:
         if self.connected:
             try:
                 self.c.execute("DELETE FROM tb_question_Categories WHERE id_categoryQ=?", (categoryId,))
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -381,16 +816,18 @@ class DatabaseSQLite:
         """
         if self.connected:
             try:
+                idCategory = self.__nextId("tb_questionnaire_categories")
                 self.c.execute(
-                    "INSERT INTO tb_questionnaire_Categories(name, description) VALUES (?, ?)",
+                    "INSERT INTO tb_questionnaire_Categories(id_categoryQA, name, description) VALUES (?, ?, ?)",
                     (
+                        idCategory,
                         name,
                         description,
                     ),
                 )
-                self.conn.commit()
+                self.__commit()
 
-                return self.c.lastrowid
+                return idCategory
 
             except Exception as e:
                 self.logger.error("Error while insert database row into tb_Categories: " + str(e))
@@ -418,7 +855,7 @@ class DatabaseSQLite:
                         id_categoryQA,
                     ),
                 )
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -438,7 +875,7 @@ class DatabaseSQLite:
         if self.connected:
             try:
                 self.c.execute("DELETE FROM tb_questionnaire_Categories WHERE id_categoryQA=?", (categoryId,))
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -480,7 +917,7 @@ class DatabaseSQLite:
                         required,
                     ),
                 )
-                self.conn.commit()
+                self.__commit()
 
                 return self.c.lastrowid
 
@@ -492,6 +929,27 @@ class DatabaseSQLite:
             self.logger.error("SQLite database not connect")
             raise DatabaseNotConnectedError("SQLite database not connect")
 
+    def addCollections(self, collections: list) -> bool:
+        """
+        Method to add several collections with one statement into the tb_collections table
+        :param collections: List of rows (id_Q, id_QA, position, required)
+        :return: True / exception
+        """
+        if self.connected:
+            try:
+                self.c.executemany("INSERT INTO tb_collections(id_Q, id_QA, position, required) VALUES (?, ?, ?, ?)", collections)
+                self.__commit()
+
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while insert database rows into tb_collections: " + str(e))
+                raise
+
+        else:
+            self.logger.error("SQLite database not connect")
+            raise DatabaseNotConnectedError("SQLite database not connect")
+
     def removeCollection(self, id_Q: int, id_QA: int) -> bool:
         """
         Method to remove a collection from the tb_collections table
@@ -508,7 +966,7 @@ class DatabaseSQLite:
                         id_QA,
                     ),
                 )
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -528,7 +986,7 @@ class DatabaseSQLite:
         if self.connected:
             try:
                 self.c.execute("DELETE FROM tb_collections WHERE id_QA=?", (id_QA,))
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -541,13 +999,27 @@ class DatabaseSQLite:
 
     def getCollections(self) -> list:
         """
-        Method to return all rows from the tb_collections table
+        Method to return all rows from the tb_collections table, ordered by questionnaire and position
         return: List of rows
         """
 
         lstRows = []
 
-        for row in self.c.execute("SELECT * FROM tb_collections"):
+        for row in self.c.execute("SELECT * FROM tb_collections ORDER BY id_QA, position"):
+            lstRows.append(row)
+
+        return lstRows
+
+    def getCollectionsForQuestionnaire(self, id_QA: int) -> list:
+        """
+        Method to return all rows of one questionnaire from the tb_collections table, ordered by position
+        :param id_QA: id of questionnaire
+        return: List of rows
+        """
+
+        lstRows = []
+
+        for row in self.c.execute("SELECT * FROM tb_collections WHERE id_QA=? ORDER BY position", (id_QA,)):
             lstRows.append(row)
 
         return lstRows
@@ -571,7 +1043,7 @@ class DatabaseSQLite:
                         options,
                     ),
                 )
-                self.conn.commit()
+                self.__commit()
 
                 return self.c.lastrowid
 
@@ -606,17 +1078,19 @@ class DatabaseSQLite:
         """
         if self.connected:
             try:
+                idQuestionnaire = self.__nextId("tb_questionnaires")
                 self.c.execute(
-                    "INSERT INTO tb_questionnaires(name, description, category) VALUES (?, ?, ?)",
+                    "INSERT INTO tb_questionnaires(id_questionnaire, name, description, category) VALUES (?, ?, ?, ?)",
                     (
+                        idQuestionnaire,
                         name,
                         description,
                         category,
                     ),
                 )
-                self.conn.commit()
+                self.__commit()
 
-                return self.c.lastrowid
+                return idQuestionnaire
 
             except Exception as e:
                 self.logger.error("Error while insert database row into tb_questionnaires: " + str(e))
@@ -640,7 +1114,7 @@ class DatabaseSQLite:
                 self.c.execute(
                     "UPDATE tb_questionnaires SET name=?, description=?, category=?, lastChanged=CURRENT_TIMESTAMP WHERE id_questionnaire=?", (name, description, category, id_questionnaire)
                 )
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -660,7 +1134,7 @@ class DatabaseSQLite:
         if self.connected:
             try:
                 self.c.execute("DELETE FROM tb_questionnaires WHERE id_questionnaire=?", (questionnaireId,))
-                self.conn.commit()
+                self.__commit()
 
                 return True
 
@@ -683,3 +1157,305 @@ class DatabaseSQLite:
             lstRows.append(row)
 
         return lstRows
+
+    def getQuestionnaireById(self, questionnaireId: int):
+        """
+        Method to return one row from the tb_questionnaires table by id
+        :param questionnaireId: questionnaire row id
+        return: row or None
+        """
+        self.c.execute("SELECT * FROM tb_questionnaires WHERE id_questionnaire=?", (questionnaireId,))
+
+        return self.c.fetchone()
+
+    def getLastChangeSeq(self) -> int:
+        """
+        Method to return the sequence number of the last change in the tb_changelog table
+        return: sequence number, 0 if there are no changes
+        """
+        self.c.execute("SELECT seq FROM sqlite_sequence WHERE name='tb_changelog'")
+        row = self.c.fetchone()
+
+        if row is None:
+            return 0
+        return row[0]
+
+    def getChanges(self, afterSeq: int, limit: int = 1000) -> list:
+        """
+        Method to return the changes after the given sequence number from the tb_changelog table
+        :param afterSeq: last sequence number already processed
+        :param limit: maximum number of rows
+        return: List of rows (seq, tableName, key1, key2, operation, changedAt) ordered by seq
+        """
+        lstRows = []
+
+        for row in self.c.execute("SELECT seq, tableName, key1, key2, operation, changedAt FROM tb_changelog WHERE seq > ? ORDER BY seq LIMIT ?", (afterSeq, limit)):
+            lstRows.append(row)
+
+        return lstRows
+
+    def removeChanges(self, uptoSeq: int) -> bool:
+        """
+        Method to remove processed changes from the tb_changelog table
+        :param uptoSeq: last sequence number to remove
+        :return: True / exception
+        """
+        if self.connected:
+            try:
+                self.c.execute("DELETE FROM tb_changelog WHERE seq <= ?", (uptoSeq,))
+                self.__commit()
+
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while delete database rows from tb_changelog: " + str(e))
+                raise
+        else:
+            self.logger.error("SQLite database not connect")
+            raise DatabaseNotConnectedError("SQLite database not connect")
+
+    def getSyncState(self, target: str):
+        """
+        Method to return the last change acknowledged by a sync target
+        :param target: name of the sync target e.g. user@host:port/database
+        return: sequence number or None if the target was never synchronised
+        """
+        self.c.execute("SELECT seq FROM tb_sync_state WHERE target=?", (target,))
+        row = self.c.fetchone()
+
+        if row is None:
+            return None
+        return row[0]
+
+    def removeAcknowledgedChanges(self) -> bool:
+        """
+        Method to remove the changes from the tb_changelog table which are acknowledged by all sync targets.
+        Without sync target all changes are kept, they are shipped to the first target.
+        :return: True / exception
+        """
+        self.c.execute("SELECT MIN(seq) FROM tb_sync_state")
+        uptoSeq = self.c.fetchone()[0]
+
+        if uptoSeq is None:
+            return True
+
+        return self.removeChanges(uptoSeq)
+
+    def getPullState(self, target: str) -> int:
+        """
+        Method to return the version of the sync target up to which its changes are pulled
+        :param target: name of the sync target e.g. user@host:port/database
+        return: version, 0 if nothing was pulled
+        """
+        self.c.execute("SELECT pulledVersion FROM tb_sync_state WHERE target=?", (target,))
+        row = self.c.fetchone()
+
+        if row is None:
+            return 0
+        return row[0]
+
+    def setPullState(self, target: str, version: int) -> bool:
+        """
+        Method to store the version of the sync target up to which its changes are pulled
+        :param target: name of the sync target e.g. user@host:port/database
+        :param version: version of the sync target
+        :return: True / exception
+        """
+        if self.connected:
+            try:
+                self.c.execute(
+                    "INSERT INTO tb_sync_state(target, seq, pulledVersion) VALUES (?, 0, ?) ON CONFLICT(target) DO UPDATE SET pulledVersion=excluded.pulledVersion", (target, version)
+                )
+                self.__commit()
+
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while update database row from tb_sync_state: " + str(e))
+                raise
+        else:
+            self.logger.error("SQLite database not connect")
+            raise DatabaseNotConnectedError("SQLite database not connect")
+
+    def setSyncState(self, target: str, seq: int) -> bool:
+        """
+        Method to store the last change acknowledged by a sync target
+        :param target: name of the sync target e.g. user@host:port/database
+        :param seq: sequence number of the last acknowledged change
+        :return: True / exception
+        """
+        if self.connected:
+            try:
+                self.c.execute("INSERT INTO tb_sync_state(target, seq) VALUES (?, ?) ON CONFLICT(target) DO UPDATE SET seq=excluded.seq", (target, seq))
+                self.__commit()
+
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while update database row from tb_sync_state: " + str(e))
+                raise
+        else:
+            self.logger.error("SQLite database not connect")
+            raise DatabaseNotConnectedError("SQLite database not connect")
+
+    def getSyncConflicts(self, target: str = None) -> list:
+        """
+        Method to return the rows a sync target did not accept
+        :param target: name of the sync target e.g. user@host:port/database, None for all targets
+        return: list of (target, tableName, key1, key2, reason, detectedAt) ordered by time of detection
+        """
+        if target is None:
+            self.c.execute("SELECT target, tableName, key1, key2, reason, detectedAt FROM tb_sync_conflicts ORDER BY detectedAt, tableName, key1, key2")
+        else:
+            self.c.execute("SELECT target, tableName, key1, key2, reason, detectedAt FROM tb_sync_conflicts WHERE target=? ORDER BY detectedAt, tableName, key1, key2", (target,))
+
+        return self.c.fetchall()
+
+    def updateSyncConflicts(self, target: str, resolved: list, conflicts: list) -> bool:
+        """
+        Method to store the rows a sync target did not accept, a row detected again keeps the time of its first detection
+        :param target: name of the sync target e.g. user@host:port/database
+        :param resolved: list of (tableName, key1, key2) accepted by the target or deleted
+        :param conflicts: list of (tableName, key1, key2, reason) not accepted by the target
+        :return: True / exception
+        """
+        if self.connected:
+            try:
+                with self.transaction():
+                    self.c.executemany("DELETE FROM tb_sync_conflicts WHERE target=? AND tableName=? AND key1=? AND key2 IS ?", [(target,) + tuple(key) for key in resolved])
+
+                    for tableName, key1, key2, reason in conflicts:
+                        self.c.execute("UPDATE tb_sync_conflicts SET reason=? WHERE target=? AND tableName=? AND key1=? AND key2 IS ?", (reason, target, tableName, key1, key2))
+                        if self.c.rowcount == 0:
+                            self.c.execute(
+                                "INSERT INTO tb_sync_conflicts(target, tableName, key1, key2, reason, detectedAt) VALUES (?, ?, ?, ?, ?, ?)",
+                                (target, tableName, key1, key2, reason, int(time.time() * 1000)),
+                            )
+
+                return True
+
+            except Exception as e:
+                self.logger.error("Error while update database rows from tb_sync_conflicts: " + str(e))
+                raise
+        else:
+            self.logger.error("SQLite database not connect")
+            raise DatabaseNotConnectedError("SQLite database not connect")
+
+    def getRowByKey(self, table: str, key: tuple):
+        """
+        Method to return one row of a synchronised table by its primary key
+        :param table: name of table, see TABLE_KEYS
+        :param key: values of the primary key columns
+        return: row or None
+        """
+        keys = self.TABLE_KEYS[table]
+        self.c.execute("SELECT * FROM " + table + " WHERE " + " AND ".join(column + "=?" for column in keys), tuple(key[: len(keys)]))
+
+        return self.c.fetchone()
+
+    @staticmethod
+    def rowChecksum(row) -> int:
+        """
+        Method to calculate the checksum of a row, equal to CRC32(CONCAT_WS('#', ...)) in MySQL
+        :param row: row of a synchronised table
+        :return: CRC32 of the row
+        """
+        return zlib.crc32("#".join(str(value) for value in row if value is not None).encode("utf-8"))
+
+    def getChecksums(self, table: str, rangeSize: int = 0) -> dict:
+        """
+        Method to calculate the checksums of a synchronised table per range of its last key column
+        :param table: name of table, see TABLE_KEYS
+        :param rangeSize: number of key values per range, 0 for one checksum of the whole table
+        return: dict range -> (number of rows, XOR of the row checksums), empty for an empty table
+        """
+        column = self.TABLE_KEYS[table][-1]
+        dictChecksums = {}
+
+        for row in self.c.execute("SELECT " + column + ", * FROM " + table):
+            bucket = row[0] // rangeSize if rangeSize > 0 else 0
+            count, checksum = dictChecksums.get(bucket, (0, 0))
+            dictChecksums[bucket] = (count + 1, checksum ^ self.rowChecksum(row[1:]))
+
+        return dictChecksums
+
+    def getRowsInRanges(self, table: str, rangeSize: int, ranges: list) -> list:
+        """
+        Method to return the rows of a synchronised table within ranges of its last key column
+        :param table: name of table, see TABLE_KEYS
+        :param rangeSize: number of key values per range
+        :param ranges: list of range numbers, see getChecksums
+        return: List of rows
+        """
+        column = self.TABLE_KEYS[table][-1]
+        lstRows = []
+
+        for bucket in ranges:
+            for row in self.c.execute("SELECT * FROM " + table + " WHERE " + column + " >= ? AND " + column + " < ?", (bucket * rangeSize, (bucket + 1) * rangeSize)):
+                lstRows.append(row)
+
+        return lstRows
+
+    def applyRemoteChanges(self, dictRows: dict, lstDeletes: list, replaceEqual: bool = False) -> int:
+        """
+        Method to apply the rows and deletes of another database in one transaction, the last writer by updatedAt wins.
+        The applied changes are not recorded in tb_changelog, so they are not shipped back.
+        A row deleted locally after its updatedAt and a row violating a unique constraint,
+        e.g. an abbreviation used by another question, are skipped.
+        :param dictRows: dict table -> rows in the column order of the table, tables in dependency order
+        :param lstDeletes: list of (table, key1, key2, updatedAt) of deleted rows
+        :param replaceEqual: True to replace also rows with equal updatedAt
+        :return: number of changed rows
+        """
+        if self.connected:
+            try:
+                count = 0
+
+                with self.transaction():
+                    lastSeq = self.getLastChangeSeq()
+
+                    dictLocalDeletes = {}
+                    for table, key1, key2, changedAt in self.c.execute("SELECT tableName, key1, key2, MAX(changedAt) FROM tb_changelog WHERE operation='D' GROUP BY tableName, key1, key2"):
+                        dictLocalDeletes[(table, key1, key2)] = changedAt
+
+                    for table, key1, key2, updatedAt in lstDeletes:
+                        keys = self.TABLE_KEYS[table]
+                        self.c.execute(
+                            "DELETE FROM " + table + " WHERE " + " AND ".join(column + "=?" for column in keys) + " AND updatedAt < ?", (key1, key2)[: len(keys)] + (updatedAt,)
+                        )
+                        count += self.c.rowcount
+
+                    for table, lstRows in dictRows.items():
+                        if len(lstRows) == 0:
+                            continue
+
+                        keys = self.TABLE_KEYS[table]
+                        columns = [row[1] for row in self.c.execute("PRAGMA table_info(" + table + ")")]
+                        statement = (
+                            "INSERT INTO " + table + "(" + ", ".join(columns) + ") VALUES (" + ", ".join(["?"] * len(columns)) + ") "
+                            "ON CONFLICT(" + ", ".join(keys) + ") DO UPDATE SET " + ", ".join(column + "=excluded." + column for column in columns if column not in keys) + " "
+                            "WHERE excluded.updatedAt " + (">=" if replaceEqual else ">") + " " + table + ".updatedAt"
+                        )
+
+                        for row in lstRows:
+                            key = (table,) + (tuple(row[: len(keys)]) + (None,))[:2]
+                            if dictLocalDeletes.get(key, -1) >= row[-1]:
+                                continue
+
+                            try:
+                                self.c.execute(statement, tuple(row))
+                                count += self.c.rowcount
+
+                            except sqlite3.IntegrityError as e:
+                                self.logger.warning("Warning while apply database row of " + table + ", row skipped: " + str(e))
+
+                    self.c.execute("DELETE FROM tb_changelog WHERE seq > ?", (lastSeq,))
+
+                return count
+
+            except Exception as e:
+                self.logger.error("Error while apply remote changes: " + str(e))
+                raise
+        else:
+            self.logger.error("SQLite database not connect")
+            raise DatabaseNotConnectedError("SQLite database not connect")
@@ -291,6 +291,8 @@ class Ui_MainWindow(object):
         self.actionHilfe_ffnen.setObjectName("actionHilfe_ffnen")
         self.actionDatei_importieren = QtWidgets.QAction(MainWindow)
         self.actionDatei_importieren.setObjectName("actionDatei_importieren")
+        self.actionOrdner_importieren = QtWidgets.QAction(MainWindow)
+        self.actionOrdner_importieren.setObjectName("actionOrdner_importieren")
         self.actionFragebogen_exportieren = QtWidgets.QAction(MainWindow)
         self.actionFragebogen_exportieren.setObjectName("actionFragebogen_exportieren")
         self.actionFragebogen_Kategorien = QtWidgets.QAction(MainWindow)
@@ -309,6 +311,7 @@ class Ui_MainWindow(object):
         self.menuDatei.addSeparator()
         self.menuDatei.addAction(self.actionFragebogen_ffnen)
         self.menuDatei.addAction(self.actionDatei_importieren)
+        self.menuDatei.addAction(self.actionOrdner_importieren)
         self.menuDatei.addAction(self.actionFragebogen_exportieren)
         self.menuDatei.addSeparator()
         self.menuDatei.addAction(self.actionProgramm_beenden_2)
@@ -362,6 +365,7 @@ class Ui_MainWindow(object):
         self.actionProgramm_beenden_2.setText(_translate("MainWindow", "Programm beenden"))
         self.actionHilfe_ffnen.setText(_translate("MainWindow", "Hilfe öffnen"))
         self.actionDatei_importieren.setText(_translate("MainWindow", "Fragebogen importieren"))
+        self.actionOrdner_importieren.setText(_translate("MainWindow", "Ordner importieren"))
         self.actionFragebogen_exportieren.setText(_translate("MainWindow", "Fragebogen exportieren"))
         self.actionFragebogen_Kategorien.setText(_translate("MainWindow", "Fragebogen-Kategorien"))
         self.actionNewQuestionnaireCategory.setText(_translate("MainWindow", "Neue Fragebogen-Kat. erstellen"))
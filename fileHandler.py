@@ -1,4 +1,5 @@
 import json
+from json.encoder import encode_basestring
 import os
 import configparser
 from pathlib import Path
@@ -6,19 +7,26 @@ import logging
 import time
 
 from Config import Config
+from JSONStreamReader import JSONStreamReader
 from Question import Question
 from QuestionCategory import QuestionCategory
 from QuestionType import QuestionType
 from Questionnaire import Questionnaire
 from QuestionnaireCategory import QuestionnaireCategory
+from SessionCodec import SessionCodec
 
 
 class FileHandlerStash:
     SESSION_FILE_PATH: Path = Path(os.getcwd()) / Path("session.lock")
+    SESSION_JOURNAL_PATH: Path = Path(os.getcwd()) / Path("session.journal")
     CONFIG_FILE_PATH: Path = Path(os.getcwd()) / Path("config/config.ini")
     TYPES: list = []
     QUESTION_CATEGORIES: list = []
     QUESTIONNAIRE_CATEGORIES: list = []
+    TYPES_BY_NAME: dict = {}
+    QUESTION_CATEGORIES_BY_ID: dict = {}
+    QUESTIONNAIRE_CATEGORIES_BY_ID: dict = {}
+    READ_CHUNK_SIZE: int = 65536
     LOGGER: logging.Logger = None
 
 
@@ -32,63 +40,94 @@ def readFromFile(pathToFile: Path) -> Questionnaire:
         Questionnaire: The read questionnaire
     """
     FileHandlerStash.LOGGER.debug("Reading from file: " + str(pathToFile))
-    jsonObj = readJSONObjFromFile(pathToFile)
-    jsonQuestions = jsonObj["question"]
     questions: list = []
     FileHandlerStash.LOGGER.debug("Creating question list")
-    for q in jsonQuestions:
-        question: Question
-        if q["required"] == "true":
-            required = True
-        else:
-            required = False
-        if q["score"] == "true":
-            score = True
-        else:
-            score = False
-        if q["comment"] == "true":
-            comment = True
-        else:
-            comment = False
-        if q["options"] == "none":
-            question: Question = Question(
-                text=q["text"],
-                type=getTypeByTypeName(q["type"]),
-                options=[],
-                required=required,
-                dependent_on=q["dependent_on"],
-                expected_answer=q["expected_answer"],
-                abbreviation=q["abbrv"],
-                score=score,
-                comment=comment,
-                category=getQuestionCategoryByID(),
-            )
-            questions.insert(int(q["number"]), question)
-        else:
-            optionKeys: list = []
-            options: list = []
-            for o in q["options"]:
-                optionKeys.append(o)
-            for o in optionKeys:
-                options.append(q["options"][o])
-            question: Question = Question(
-                text=q["text"],
-                type=getTypeByTypeName(q["type"]),
-                options=options,
-                required=required,
-                dependent_on=q["dependent_on"],
-                expected_answer=q["expected_answer"],
-                abbreviation=q["abbrv"],
-                score=score,
-                comment=comment,
-                category=getQuestionCategoryByID(),
-            )
-            questions.insert(int(q["number"]), question)
+    for q in iterJSONQuestionsFromFile(pathToFile):
+        questions.insert(int(q["number"]), questionFromJSON(q))
     FileHandlerStash.LOGGER.debug("Creating questionnaire")
     questionnaire: Questionnaire = Questionnaire(name=pathToFile.stem, questions=questions, category=getQuestionnaireCategoryByID())
     return questionnaire
 
 
+def iterQuestionsFromFile(pathToFile: Path):
+    """Generator to read the questions of the given JSON file one by one in the order of the file
+
+    Args:
+        pathToFile (Path): Path to the file, which should be read from
+
+    Yields:
+        Question: The next read question
+    """
+    for q in iterJSONQuestionsFromFile(pathToFile):
+        yield questionFromJSON(q)
+
+
+def iterJSONQuestionsFromFile(pathToFile: Path):
+    """Generator to read the elements of the question array of the given JSON file without loading the whole file
+
+    Args:
+        pathToFile (Path): Path to the file, which should be read from
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        KeyError: If the file has no question array
+
+    Yields:
+        dict: The next JSON object of the question array
+    """
+    FileHandlerStash.LOGGER.debug("Checking if given file exists")
+    if not pathToFile.exists():
+        raise FileNotFoundError
+
+    FileHandlerStash.LOGGER.debug("File existed. Streaming questions from: " + str(pathToFile))
+    with open(pathToFile, "r", encoding="utf-8") as file:
+        yield from JSONStreamReader(file, FileHandlerStash.READ_CHUNK_SIZE).iterArray("question")
+
+
+def readJSONQuestionsFromFile(pathToFile: Path) -> list:
+    """Function to read the question array of the given JSON file, ordered like readFromFile orders the questions.
+    It uses neither the logger nor the lookup tables, so it can run in a worker process
+
+    Args:
+        pathToFile (Path): Path to the file, which should be read from
+
+    Returns:
+        list: The JSON objects of the question array
+    """
+    questions: list = []
+    with open(pathToFile, "r", encoding="utf-8") as file:
+        for q in JSONStreamReader(file, FileHandlerStash.READ_CHUNK_SIZE).iterArray("question"):
+            questions.insert(int(q["number"]), q)
+    return questions
+
+
+def questionFromJSON(q: dict) -> Question:
+    """Function to create a question from one JSON object of the question array
+
+    Args:
+        q (dict): The JSON object of the question
+
+    Returns:
+        Question: The created question
+    """
+    if q["options"] == "none":
+        options: list = []
+    else:
+        options: list = list(q["options"].values())
+    return Question(
+        text=q["text"],
+        type=getTypeByTypeName(q["type"]),
+        options=options,
+        required=q["required"] == "true",
+        dependent_on=q["dependent_on"],
+        expected_answer=q["expected_answer"],
+        abbreviation=q["abbrv"],
+        score=q["score"] == "true",
+        comment=q["comment"] == "true",
+        category=getQuestionCategoryByID(),
+    )
+
+
 def writeToFile(pathToFile: Path, questionnaire: Questionnaire):
     """Function to write the questionnaire in the given JSON format to the given file
 
@@ -99,70 +138,77 @@ def writeToFile(pathToFile: Path, questionnaire: Questionnaire):
     FileHandlerStash.LOGGER.debug("Writing to file: " + str(pathToFile))
     if len(questionnaire.questions) == 0:
         raise Exception("No questions in questionnaire.")
-    questions: list = questionnaire.questions
-    FileHandlerStash.LOGGER.debug("Building JSON string")
-    jsonStr = '{"question":['
-    q1Q = questions[0]
-    q1Str = '{"number": "' + str(1) + '","text": "' + str(q1Q.text) + '","type": "' + str(q1Q.type.typeName)
-    if len(q1Q.options) == 0:
-        q1Str += '","options": "' + "none" + '"'
-    else:
-        optionsStr = '","options": {'
-        o1Str = '"' + str(q1Q.options[0]) + '": "' + str(q1Q.options[0]) + '"'
-        optionsStr += o1Str
-        for n in range(1, len(q1Q.options)):
-            o = q1Q.options[n]
-            optionsStr += ',"' + str(o) + '": "' + str(o) + '"'
-        optionsStr += "}"
-        q1Str += optionsStr
-    q1Str += (
-        ',"required": "'
-        + str(q1Q.required).lower()
-        + '","dependent_on": "'
-        + str(q1Q.dependent_on)
-        + '","expected_answer": "'
-        + str(q1Q.expected_answer)
-        + '","abbrv": "'
-        + str(q1Q.abbreviation)
-        + '","score": "'
-        + str(q1Q.score).lower()
-        + '","comment": "'
-        + str(q1Q.comment).lower()
-        + '"}'
-    )
-    jsonStr += q1Str
-    for n in range(1, len(questions)):
-        q: Question = questions[n]
-        questionStr = ',{"number": "' + str(n + 1) + '","text": "' + str(q.text) + '","type": "' + str(q.type.typeName)
-        if len(q.options) == 0:
-            questionStr += '","options": "' + "none" + '"'
+    FileHandlerStash.LOGGER.debug("Encoding questions")
+    with open(pathToFile, "w", encoding="utf-8") as file:
+        writeQuestionnaireToStream(file, questionnaire)
+
+
+def writeQuestionnaireToStream(file, questionnaire: Questionnaire):
+    """Function to write the questionnaire in the given JSON format to an open text stream.
+    Every question is encoded and written on its own, the content equals json.dump with an indent of 2.
+
+    Args:
+        file: The text stream, e.g. a file or an entry of a zip archive
+        questionnaire (Questionnaire): The questionnaire, that should be written to the stream
+    """
+    file.write('{\n  "question": [\n    ')
+    for n, q in enumerate(questionnaire.questions):
+        if n > 0:
+            file.write(",\n    ")
+        file.write(encodeJSONObject(questionToJSON(q, n + 1), "    "))
+    file.write("\n  ]\n}")
+
+
+def encodeJSONObject(obj: dict, indent: str = "") -> str:
+    """Function to encode a JSON object of strings and nested objects of strings like json.dumps with an indent of 2.
+    json.dumps falls back to its pure Python encoder for indented output, here only the C string encoder is used.
+
+    Args:
+        obj (dict): The object, its keys and values have to be strings or objects of strings
+        indent (str): The indent of the line the object starts in
+
+    Returns:
+        str: The encoded object
+    """
+    if len(obj) == 0:
+        return "{}"
+    innerIndent = indent + "  "
+    items: list = []
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            value = encodeJSONObject(value, innerIndent)
         else:
-            optionsStr = '","options": {'
-            o1Str = '"' + str(q.options[0]) + '": "' + str(q.options[0]) + '"'
-            optionsStr += o1Str
-            for n in range(1, len(q.options)):
-                o = q.options[n]
-                optionsStr += ',"' + str(o) + '": "' + str(o) + '"'
-            optionsStr += "}"
-            questionStr += optionsStr
-        questionStr += (
-            ',"required": "'
-            + str(q.required).lower()
-            + '","dependent_on": "'
-            + str(q.dependent_on)
-            + '","expected_answer": "'
-            + str(q.expected_answer)
-            + '","abbrv": "'
-            + str(q.abbreviation)
-            + '","score": "'
-            + str(q.score).lower()
-            + '","comment": "'
-            + str(q.comment).lower()
-            + '"}'
-        )
-        jsonStr += questionStr
-    jsonStr += "]}"
-    writeJSONObjToFile(pathToFile, json.loads(jsonStr))
+            value = encode_basestring(value)
+        items.append(innerIndent + encode_basestring(key) + ": " + value)
+    return "{\n" + ",\n".join(items) + "\n" + indent + "}"
+
+
+def questionToJSON(q: Question, number: int) -> dict:
+    """Function to create the JSON object of the question array for a question
+
+    Args:
+        q (Question): The question
+        number (int): The number of the question in the questionnaire, starting with 1
+
+    Returns:
+        dict: The JSON object of the question
+    """
+    if len(q.options) == 0:
+        options = "none"
+    else:
+        options = {str(o): str(o) for o in q.options}
+    return {
+        "number": str(number),
+        "text": str(q.text),
+        "type": str(q.type.typeName),
+        "options": options,
+        "required": str(q.required).lower(),
+        "dependent_on": str(q.dependent_on),
+        "expected_answer": str(q.expected_answer),
+        "abbrv": str(q.abbreviation),
+        "score": str(q.score).lower(),
+        "comment": str(q.comment).lower(),
+    }
 
 
 def readJSONObjFromFile(pathToFile: Path) -> object:
@@ -225,13 +271,20 @@ def removeSessionFile():
 
     FileHandlerStash.LOGGER.debug("Session file existed. Removing it")
     os.remove(FileHandlerStash.SESSION_FILE_PATH)
+    if FileHandlerStash.SESSION_JOURNAL_PATH.exists():
+        os.remove(FileHandlerStash.SESSION_JOURNAL_PATH)
+
 
+def readSessionFile(getQuestionById=None) -> Questionnaire:
+    """Reads the content of the SessionFile, either a binary snapshot of the SessionCodec or the JSON format
 
-def readSessionFile() -> Questionnaire:
-    """Reads the content of the SessionFile
+    Args:
+        getQuestionById (function, optional): Function(id) returning the question of the database,
+            it completes the questions of a binary snapshot. Defaults to None.
 
     Raises:
         FileNotFoundError: If there is no SessionFile
+        ValueError: If the SessionFile is empty or damaged
 
     Returns:
         Questionnaire: The questionnaire read from the SessionFile
@@ -241,38 +294,77 @@ def readSessionFile() -> Questionnaire:
         raise FileNotFoundError
 
     FileHandlerStash.LOGGER.debug("Session file exitsed. Reading from session file")
-    with open(FileHandlerStash.SESSION_FILE_PATH, "r", encoding="utf-8") as file:
-        jO = json.load(file)
-        questions: list = []
-        FileHandlerStash.LOGGER.debug("Building questions list")
-        for q in jO["questions"]:
-            options: list = []
-            for o in q["options"]:
-                options.append(o)
-            question: Question = Question(
-                text=q["text"],
-                type=getTypeByTypeName(q["type"]["typeName"]),
-                options=options,
-                required=q["required"],
-                dependent_on=q["dependent_on"],
-                expected_answer=q["expected_answer"],
-                abbreviation=q["abbreviation"],
-                score=q["score"],
-                comment=q["comment"],
-                category=getQuestionCategoryByID(q["category"]["id"]),
-                id=q["id"],
-            )
-            questions.append(question)
-        FileHandlerStash.LOGGER.debug("Building and returning questionnaire")
-        return Questionnaire(
-            name=jO["name"],
-            id=jO["id"],
-            description=jO["description"],
-            creationDate=jO["creationDate"],
-            lastEdited=jO["lastEdited"],
-            questions=questions,
-            category=getQuestionnaireCategoryByID(jO["category"]["id"]),
+    with open(FileHandlerStash.SESSION_FILE_PATH, "rb") as file:
+        data = file.read()
+    if SessionCodec.isBinary(data):
+        jO = SessionCodec.decode(data, getQuestionById)
+        for questionId in jO["missingQuestions"]:
+            FileHandlerStash.LOGGER.warning("Question of session no longer in database, skipped: " + str(questionId))
+    else:
+        jO = json.loads(data.decode("utf-8"))
+    if "sessionKeys" in jO and FileHandlerStash.SESSION_JOURNAL_PATH.exists():
+        FileHandlerStash.LOGGER.debug("Applying session journal")
+        applySessionJournal(jO)
+    questions: list = []
+    FileHandlerStash.LOGGER.debug("Building questions list")
+    for q in jO["questions"]:
+        options: list = []
+        for o in q["options"]:
+            options.append(o)
+        question: Question = Question(
+            text=q["text"],
+            type=getTypeByTypeName(q["type"]["typeName"]),
+            options=options,
+            required=q["required"],
+            dependent_on=q["dependent_on"],
+            expected_answer=q["expected_answer"],
+            abbreviation=q["abbreviation"],
+            score=q["score"],
+            comment=q["comment"],
+            category=getQuestionCategoryByID(q["category"]["id"]),
+            id=q["id"],
         )
+        questions.append(question)
+    FileHandlerStash.LOGGER.debug("Building and returning questionnaire")
+    return Questionnaire(
+        name=jO["name"],
+        id=jO["id"],
+        description=jO["description"],
+        creationDate=jO["creationDate"],
+        lastEdited=jO["lastEdited"],
+        questions=questions,
+        category=getQuestionnaireCategoryByID(jO["category"]["id"]),
+    )
+
+
+def applySessionJournal(jO: dict):
+    """Applies the records of the session journal to the questionnaire read from the SessionFile.
+    A record holds the changed questionnaire fields, the changed questions by session key and the question order,
+    an incomplete last record of a crash is ignored. Records of another generation than the SessionFile were written
+    before it and are skipped
+
+    Args:
+        jO (dict): The JSON object of the SessionFile, it is changed in place
+    """
+    dictQuestions: dict = dict(zip(jO["sessionKeys"], jO["questions"]))
+    order: list = jO["sessionKeys"]
+    with open(FileHandlerStash.SESSION_JOURNAL_PATH, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                FileHandlerStash.LOGGER.warning("Ignoring incomplete record of session journal")
+                break
+            if record.get("generation") != jO.get("generation"):
+                continue
+            jO.update(record.get("questionnaire", {}))
+            for key, q in record.get("questions", {}).items():
+                dictQuestions[int(key)] = q
+            order = record.get("order", order)
+    # questions skipped by the SessionCodec are missing
+    order = [key for key in order if key in dictQuestions]
+    jO["questions"] = [dictQuestions[key] for key in order]
+    jO["sessionKeys"] = order
 
 
 def writeToSessionFile(questionnaire: Questionnaire) -> bool:
@@ -285,11 +377,30 @@ def writeToSessionFile(questionnaire: Questionnaire) -> bool:
         bool: True, if the writing was successfull
     """
     FileHandlerStash.LOGGER.debug("Writing questionnaire to session file")
-    with open(FileHandlerStash.SESSION_FILE_PATH, "w", encoding="utf-8") as file:
-        file.write(questionnaire.toJSON())
+    writeFileAtomic(FileHandlerStash.SESSION_FILE_PATH, questionnaire.toJSON())
     return True
 
 
+def writeFileAtomic(pathToFile: Path, content):
+    """Writes the content to a temporary file and replaces the given file with it,
+    so a crash leaves either the old or the new content and never a partly written file
+
+    Args:
+        pathToFile (Path): Path to the file, which should be replaced
+        content (str | bytes): The new content of the file
+    """
+    tempPath: Path = pathToFile.with_name(pathToFile.name + ".tmp")
+    if isinstance(content, bytes):
+        file = open(tempPath, "wb")
+    else:
+        file = open(tempPath, "w", encoding="utf-8")
+    with file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tempPath, pathToFile)
+
+
 def createLogger(maxFileCount: int) -> logging.Logger:
     """Creates a logger and a logging.FileHandler and removes the oldest logfile to keep max 5 logfiles
 
@@ -324,6 +435,7 @@ def setTypes(types: list):
     FileHandlerStash.LOGGER.debug("Setting types")
     for typeName in types:
         FileHandlerStash.TYPES.append(typeName)
+        FileHandlerStash.TYPES_BY_NAME.setdefault(typeName.typeName, typeName)
 
 
 def setQuestionCategories(categories: list):
@@ -335,6 +447,7 @@ def setQuestionCategories(categories: list):
     FileHandlerStash.LOGGER.debug("Setting question categories")
     for category in categories:
         FileHandlerStash.QUESTION_CATEGORIES.append(category)
+        FileHandlerStash.QUESTION_CATEGORIES_BY_ID.setdefault(category.id, category)
 
 
 def setQuestionnaireCategories(categories: list):
@@ -346,6 +459,7 @@ def setQuestionnaireCategories(categories: list):
     FileHandlerStash.LOGGER.debug("Setting questionnaire categories")
     for category in categories:
         FileHandlerStash.QUESTIONNAIRE_CATEGORIES.append(category)
+        FileHandlerStash.QUESTIONNAIRE_CATEGORIES_BY_ID.setdefault(category.id, category)
 
 
 def getTypeByTypeName(typeName: str) -> QuestionType:
@@ -357,10 +471,7 @@ def getTypeByTypeName(typeName: str) -> QuestionType:
     Returns:
         QuestionType: The found type object
     """
-    FileHandlerStash.LOGGER.debug("Getting QuestionType for typeName: " + typeName)
-    for type in FileHandlerStash.TYPES:
-        if typeName == type.typeName:
-            return type
+    return FileHandlerStash.TYPES_BY_NAME.get(typeName)
 
 
 def getQuestionCategoryByID(catID: int = 1) -> QuestionCategory:
@@ -372,14 +483,11 @@ def getQuestionCategoryByID(catID: int = 1) -> QuestionCategory:
     Returns:
         QuestionCategory: The found category
     """
-    FileHandlerStash.LOGGER.debug("Getting question category for ID: " + str(catID))
-    default = None
-    for category in FileHandlerStash.QUESTION_CATEGORIES:
-        if category.id == catID:
-            return category
-        if category.id == 1:
-            default = category
-    return default
+    categories: dict = FileHandlerStash.QUESTION_CATEGORIES_BY_ID
+    category = categories.get(catID)
+    if category is None:
+        category = categories.get(1)
+    return category
 
 
 def getQuestionnaireCategoryByID(catID: int = 1) -> QuestionnaireCategory:
@@ -391,14 +499,11 @@ def getQuestionnaireCategoryByID(catID: int = 1) -> QuestionnaireCategory:
     Returns:
         QuestionnaireCategory: The found category
     """
-    FileHandlerStash.LOGGER.debug("Getting questionnaire category for ID: " + str(catID))
-    default = None
-    for category in FileHandlerStash.QUESTIONNAIRE_CATEGORIES:
-        if category.id == catID:
-            return category
-        if category.id == 1:
-            default = category
-    return default
+    categories: dict = FileHandlerStash.QUESTIONNAIRE_CATEGORIES_BY_ID
+    category = categories.get(catID)
+    if category is None:
+        category = categories.get(1)
+    return category
 
 
 def createConfigFile():
@@ -409,7 +514,7 @@ def createConfigFile():
     Path(Path(os.getcwd()) / Path("config/")).mkdir(exist_ok=True)
     if not FileHandlerStash.CONFIG_FILE_PATH.exists():
         parser: configparser.ConfigParser = configparser.ConfigParser()
-        parser["DEFAULT"] = {"UseQuestionAnswerLimit": "no", "QuestionAnswerLimit": "-1", "UseRecoveryPoints": "yes", "ShowTutorialDialog": "yes"}
+        parser["DEFAULT"] = {"UseQuestionAnswerLimit": "no", "QuestionAnswerLimit": "-1", "UseRecoveryPoints": "yes", "UseSessionJournal": "yes", "UseBinarySession": "yes", "ShowTutorialDialog": "yes"}
         parser["DATABASE"] = {
             "UseNetworkDatabase": "no",
             "LocalDatabase": "data/mhf.db",
@@ -418,6 +523,11 @@ def createConfigFile():
             "NetworkDatabaseUser": "",
             "NetworkDatabasePassword": "",
             "NetworkDatabase": "",
+            "SQLiteJournalMode": "WAL",
+            "SQLiteSynchronous": "NORMAL",
+            "SQLiteCacheSize": "-16000",
+            "SQLiteMmapSize": "268435456",
+            "SQLiteTempStore": "MEMORY",
         }
         parser["USER INTERFACE"] = {"UseCustomColorCodes": "no", "CustomColorCodes": "FF, FF, FF", "UserIcon": Path(os.getcwd()) / Path("data/logo.png")}
         parser["DEBUGGING"] = {"LogFileMaxCount": "5"}
@@ -438,6 +548,8 @@ def readConfigFile() -> Config:
     config: Config = Config()
     config.useQuestionAnswerLimit = parser.get("DEFAULT", "UseQuestionAnswerLimit") == "yes"
     config.useRecoveryPoints = parser.get("DEFAULT", "UseRecoveryPoints") == "yes"
+    config.useSessionJournal = parser.get("DEFAULT", "UseSessionJournal", fallback="yes") == "yes"
+    config.useBinarySession = parser.get("DEFAULT", "UseBinarySession", fallback="yes") == "yes"
     config.useNetworkDatabase = parser.get("DATABASE", "UseNetworkDatabase") == "yes"
     config.useCustomColorCodes = parser.get("USER INTERFACE", "UseCustomColorCodes") == "yes"
     config.showTutorialDialog = parser.get("DEFAULT", "ShowTutorialDialog") == "yes"
@@ -451,6 +563,14 @@ def readConfigFile() -> Config:
     config.networkDatabasePassword = parser.get("DATABASE", "NetworkDatabasePassword")
     config.networkDatabase = parser.get("DATABASE", "NetworkDatabase")
 
+    # older config files have no tuning profile, keep the defaults then
+    # the values are checked when they are applied, an invalid value is logged and skipped there
+    config.sqliteJournalMode = parser.get("DATABASE", "SQLiteJournalMode", fallback=config.sqliteJournalMode)
+    config.sqliteSynchronous = parser.get("DATABASE", "SQLiteSynchronous", fallback=config.sqliteSynchronous)
+    config.sqliteCacheSize = parser.get("DATABASE", "SQLiteCacheSize", fallback=config.sqliteCacheSize)
+    config.sqliteMmapSize = parser.get("DATABASE", "SQLiteMmapSize", fallback=config.sqliteMmapSize)
+    config.sqliteTempStore = parser.get("DATABASE", "SQLiteTempStore", fallback=config.sqliteTempStore)
+
     config.customColorCodes = parser.get("USER INTERFACE", "CustomColorCodes")
 
     config.userIcon = Path(parser.get("USER INTERFACE", "UserIcon"))
@@ -1,3 +1,29 @@
 from distutils.core import setup
 
-setup(name="Medical History Form", version="1.0", description="Medical History Form editor", requires=["PyQt5"])
+setup(
+    name="Medical History Form",
+    version="1.0",
+    description="Medical History Form editor",
+    requires=["PyQt5"],
+    # headless command line interface for batch jobs, needs no PyQt5
+    py_modules=[
+        "CommandLine",
+        "Config",
+        "DatabaseController",
+        "JSONStreamReader",
+        "Question",
+        "QuestionCategory",
+        "QuestionType",
+        "Questionnaire",
+        "QuestionnaireCategory",
+        "QuestionnaireExporter",
+        "QuestionnaireImporter",
+        "SessionCodec",
+        "SyncEngine",
+        "SyncQueue",
+        "TrigramIndex",
+        "fileHandler",
+    ],
+    packages=["database"],
+    scripts=["mhf"],
+)
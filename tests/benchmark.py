@@ -0,0 +1,351 @@
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from DatabaseController import DatabaseController
+from Question import Question
+from Questionnaire import Questionnaire
+from TrigramIndex import TrigramIndex
+from fileHandler import FileHandlerStash, writeJSONObjToFile, writeToFile
+from tests.support import LOGGER, fillDatabase
+
+
+def measurePeakMemory(function) -> int:
+    """
+    Function to measure the peak of the memory allocated by Python during one run
+    :param function: function without arguments
+    :return: bytes
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(function, repeat: int = 3) -> float:
+    """
+    Function to measure the best time of several runs
+    :param function: function without arguments
+    :param repeat: number of runs
+    :return: seconds of the fastest run
+    """
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def createDatabase(directory: Path, questionCount: int, questionnaireCount: int = 0) -> DatabaseController:
+    """
+    Function to create a filled database, see fillDatabase, a database of the same size from an earlier benchmark is reused
+    :param directory: directory of the database file
+    :param questionCount: number of questions
+    :param questionnaireCount: number of questionnaires with 20 questions each
+    :return: DatabaseController
+    """
+    pathDatabase = directory / ("bench" + str(questionCount) + "_" + str(questionnaireCount) + ".db")
+    exists = pathDatabase.exists()
+    database = DatabaseController(logger=LOGGER, pathSQLiteDatabase=pathDatabase)
+    if not exists:
+        fillDatabase(database, questionCount, questionnaireCount)
+    return database
+
+
+def loadQuestionsCold(database: DatabaseController) -> list:
+    """
+    Function to load all questions without cache, like opening the library after the start
+    :param database: DatabaseController
+    :return: list of question objects
+    """
+    database._DatabaseController__clearCache()
+    return database.getQuestions()
+
+
+def loadQuestionsNestedScan(database: DatabaseController) -> list:
+    """
+    Function with the replaced assembly of getQuestions, type, category and dependency are found by linear scans
+    :param database: DatabaseController
+    :return: list of question objects
+    """
+    lstQuestions = []
+    lstTypes = database.getTypes()
+    lstQuestionCategories = database.getQuestionCategories()
+    lstQuestionRows = database.databaseSQLite.getQuestions()
+
+    for row in lstQuestionRows:
+        currentType = next((questionType for questionType in lstTypes if questionType.id == row[2]), None)
+        currentCategory = next((category for category in lstQuestionCategories if category.id == row[10]), None)
+
+        currentDependentOn = "none"
+        if row[5] != -1:
+            currentDependentOn = next((questionRow[7] for questionRow in lstQuestionRows if questionRow[0] == row[5]), "none")
+
+        lstQuestions.append(
+            Question(
+                id=row[0],
+                text=row[1],
+                type=currentType,
+                options=json.loads(row[3]),
+                required=bool(row[4]),
+                dependent_on=currentDependentOn,
+                expected_answer=row[6],
+                abbreviation=row[7],
+                score=bool(row[8]),
+                comment=bool(row[9]),
+                category=currentCategory,
+            )
+        )
+
+    return lstQuestions
+
+
+def loadQuestionnairesCold(database: DatabaseController) -> list:
+    """
+    Function to load all questionnaires without cache, like opening the questionnaire list after the start
+    :param database: DatabaseController
+    :return: list of questionnaire objects
+    """
+    database._DatabaseController__clearCache()
+    return database.getQuestionnaires()
+
+
+def loadQuestionnairesNestedLoop(database: DatabaseController) -> list:
+    """
+    Function with the replaced assembly of getQuestionnaires, every questionnaire scans all collections and all questions
+    :param database: DatabaseController
+    :return: list of questionnaire objects
+    """
+    lstQuestionnaireCategory = database.getQuestionnaireCategories()
+    lstQuestions = database.getQuestions()
+    lstColletionRows = database.databaseSQLite.getCollections()
+
+    lstQuestionnaires = []
+
+    for questionnaireRow in database.databaseSQLite.getQuestionnaire():
+        currentCategory = next((category for category in lstQuestionnaireCategory if category.id == questionnaireRow[3]), None)
+
+        currentQuestions = []
+        for collectionRow in lstColletionRows:
+            if collectionRow[1] == questionnaireRow[0]:
+                for question in lstQuestions:
+                    if question.id == collectionRow[0]:
+                        currentQuestions.insert(collectionRow[2], question)
+
+        lstQuestionnaires.append(
+            Questionnaire(
+                id=questionnaireRow[0],
+                name=questionnaireRow[1],
+                description=questionnaireRow[2],
+                questions=currentQuestions,
+                category=currentCategory,
+                creationDate=questionnaireRow[4],
+                lastEdited=questionnaireRow[5],
+            )
+        )
+
+    return lstQuestionnaires
+
+
+def buildSearchIndex(database: DatabaseController) -> TrigramIndex:
+    """
+    Function to build the trigram index like the first search of the DatabaseController
+    :param database: DatabaseController
+    :return: trigram index of question text and abbreviation
+    """
+    searchIndex = TrigramIndex()
+    for question in database.getQuestions():
+        searchIndex.add(question.id, question.text + "\n" + question.abbreviation)
+    return searchIndex
+
+
+def searchQuestionsSubstringScan(lstQuestions: list, query: str) -> list:
+    """
+    Function with the replaced search without full-text index, every question text is scanned for the query
+    :param lstQuestions: list of question objects
+    :param query: search text
+    :return: list of question ids
+    """
+    key = query.lower()
+    return [question.id for question in lstQuestions if key in question.text.lower()]
+
+
+# search texts of the benchmark, one question, about one percent and all questions of fillDatabase
+SEARCH_QUERIES: tuple = ("Frage 4711:", "Gruppe 42 ", "Medikamente")
+
+
+def writeToFileConcatenated(pathToFile: Path, questionnaire: Questionnaire):
+    """
+    Function with the replaced export, the JSON is concatenated as string, parsed and dumped again
+    :param pathToFile: path of the JSON file
+    :param questionnaire: questionnaire to export
+    """
+    jsonStr = '{"question":['
+    for n, q in enumerate(questionnaire.questions):
+        questionStr = ("," if n > 0 else "") + '{"number": "' + str(n + 1) + '","text": "' + str(q.text) + '","type": "' + str(q.type.typeName)
+        if len(q.options) == 0:
+            questionStr += '","options": "' + "none" + '"'
+        else:
+            questionStr += '","options": {' + ",".join('"' + str(o) + '": "' + str(o) + '"' for o in q.options) + "}"
+        questionStr += (
+            ',"required": "'
+            + str(q.required).lower()
+            + '","dependent_on": "'
+            + str(q.dependent_on)
+            + '","expected_answer": "'
+            + str(q.expected_answer)
+            + '","abbrv": "'
+            + str(q.abbreviation)
+            + '","score": "'
+            + str(q.score).lower()
+            + '","comment": "'
+            + str(q.comment).lower()
+            + '"}'
+        )
+        jsonStr += questionStr
+    jsonStr += "]}"
+    writeJSONObjToFile(pathToFile, json.loads(jsonStr))
+
+
+def benchLoad(directory: Path, scale: float):
+    """
+    Benchmark of loading all questions from 1k to 100k questions, the time per question stays constant
+    """
+    print("questions   getQuestions   per question   nested scan (replaced)")
+    for count in (1000, 3000, 10000, 30000, 100000):
+        count = max(100, int(count * scale))
+        database = createDatabase(directory, count)
+
+        seconds = measure(lambda: loadQuestionsCold(database))
+        before = measure(lambda: loadQuestionsNestedScan(database), repeat=1) if count <= 10000 else None
+
+        print(
+            format(count, ">9")
+            + format(seconds * 1000, ">12.1f")
+            + " ms"
+            + format(seconds / count * 1e6, ">12.2f")
+            + " µs"
+            + (format(before * 1000, ">16.1f") + " ms" if before is not None else format("-", ">19"))
+        )
+
+
+def benchQuestionnaires(directory: Path, scale: float):
+    """
+    Benchmark of assembling 100 to 1000 questionnaires with 20 questions each over 10k questions
+    """
+    questionCount = max(100, int(10000 * scale))
+    print("questionnaires   getQuestionnaires   nested loop (replaced)")
+    for count in (100, 300, 1000):
+        count = max(10, int(count * scale))
+        database = createDatabase(directory, questionCount, count)
+
+        seconds = measure(lambda: loadQuestionnairesCold(database))
+        before = measure(lambda: loadQuestionnairesNestedLoop(database), repeat=1)
+
+        print(format(count, ">14") + format(seconds * 1000, ">17.1f") + " ms" + format(before * 1000, ">22.1f") + " ms")
+
+
+def benchSearch(directory: Path, scale: float):
+    """
+    Benchmark of the trigram index against the substring scan over 10k and 100k questions
+    """
+    print("questions   build index   query          trigram index   substring scan (replaced)")
+    for count in (10000, 100000):
+        count = max(100, int(count * scale))
+        database = createDatabase(directory, count)
+        lstQuestions = database.getQuestions()
+
+        build = measure(lambda: buildSearchIndex(database), repeat=1)
+        searchIndex = buildSearchIndex(database)
+
+        for query in SEARCH_QUERIES:
+            seconds = measure(lambda: searchIndex.search(query, fuzzy=False), repeat=5)
+            before = measure(lambda: searchQuestionsSubstringScan(lstQuestions, query), repeat=5)
+
+            print(
+                format(count, ">9")
+                + format(build * 1000, ">11.0f")
+                + " ms   "
+                + format(repr(query), "<14")
+                + format(seconds * 1000, ">13.2f")
+                + " ms"
+                + format(before * 1000, ">24.2f")
+                + " ms"
+            )
+
+
+def benchExport(directory: Path, scale: float):
+    """
+    Benchmark of exporting one questionnaire of 1k to 100k questions against the replaced concatenating export
+    """
+    FileHandlerStash.LOGGER = LOGGER
+
+    print("questions   writeToFile   peak memory   concatenated (replaced)   peak memory")
+    for count in (1000, 10000, 100000):
+        count = max(100, int(count * scale))
+        database = createDatabase(directory, count)
+        questionnaire = Questionnaire(category=database.getQuestionnaireCategories()[0], name="Export", questions=database.getQuestions())
+        pathToFile = directory / ("export" + str(count) + ".json")
+
+        seconds = measure(lambda: writeToFile(pathToFile, questionnaire))
+        memory = measurePeakMemory(lambda: writeToFile(pathToFile, questionnaire))
+        before = measure(lambda: writeToFileConcatenated(pathToFile, questionnaire))
+        memoryBefore = measurePeakMemory(lambda: writeToFileConcatenated(pathToFile, questionnaire))
+
+        print(
+            format(count, ">9")
+            + format(seconds * 1000, ">11.1f")
+            + " ms"
+            + format(memory / 1e6, ">11.2f")
+            + " MB"
+            + format(before * 1000, ">23.1f")
+            + " ms"
+            + format(memoryBefore / 1e6, ">11.2f")
+            + " MB"
+        )
+
+
+BENCHMARKS: dict = {
+    "export": benchExport,
+    "load": benchLoad,
+    "questionnaires": benchQuestionnaires,
+    "search": benchSearch,
+}
+
+
+def main() -> int:
+    """
+    Function to run the benchmarks on generated databases in a temporary directory, e.g. python -m tests.benchmark load
+    :return: exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmark", description="Benchmarks of the database layer on generated databases")
+    parser.add_argument("benchmarks", nargs="*", help="benchmarks to run: " + ", ".join(sorted(BENCHMARKS)) + ", default: all")
+    parser.add_argument("--scale", type=float, default=1, help="factor of the database sizes, default: %(default)s")
+    args = parser.parse_args()
+
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error("unknown benchmark " + name)
+
+    directory = Path(tempfile.mkdtemp())
+    try:
+        for name in args.benchmarks or sorted(BENCHMARKS):
+            print("== " + name)
+            BENCHMARKS[name](directory, args.scale)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
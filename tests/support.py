@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+
+from DatabaseController import DatabaseController
+from Question import Question
+from SyncEngine import SyncEngine
+from database.DatabaseExceptions import DatabaseNotConnectedError
+from database.DatabaseMySQL import DatabaseMySQL
+from database.DatabaseSQLite import DatabaseSQLite
+
+LOGGER = logging.getLogger("tests")
+
+# database shipped with the repository, the tests work on copies of it
+PATH_SHIPPED_DATABASE = Path(__file__).resolve().parent.parent / "data" / "mhf.db"
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Base class of the tests working on SQLite databases in a temporary directory
+    """
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def createDatabase(self, name: str = "mhf.db", copyShipped: bool = False) -> DatabaseController:
+        """
+        Method to create a DatabaseController on a new database
+        :param name: file name of the database in the temporary directory
+        :param copyShipped: True to start with a copy of data/mhf.db
+        :return: DatabaseController
+        """
+        path = self.directory / "data" / name
+        if copyShipped:
+            path.parent.mkdir(exist_ok=True)
+            shutil.copy(PATH_SHIPPED_DATABASE, path)
+
+        return DatabaseController(logger=LOGGER, pathSQLiteDatabase=path)
+
+
+def createQuestion(database: DatabaseController, abbreviation: str, text: str = None, category=None, dependentOn: str = "none") -> Question:
+    """
+    Function to create an unsaved question of the first type
+    :param database: DatabaseController providing type and category
+    :param abbreviation: abbreviation of the question
+    :param text: question text, default derived from the abbreviation
+    :param category: question category, default the first one
+    :param dependentOn: abbreviation of the question this question is dependent on
+    :return: question object
+    """
+    return Question(
+        text=text or "Frage " + abbreviation,
+        type=database.getTypes()[0],
+        options=["ja", "nein"],
+        required=False,
+        dependent_on=dependentOn,
+        expected_answer="ja" if dependentOn != "none" else "none",
+        abbreviation=abbreviation,
+        score=False,
+        comment=False,
+        category=category or database.getQuestionCategories()[0],
+    )
+
+
+def fillDatabase(database: DatabaseController, questionCount: int, questionnaireCount: int = 0, questionsPerQuestionnaire: int = 20, categoryCount: int = 10):
+    """
+    Function to fill a new database in one transaction, faster than adding the objects one by one.
+    Every tenth question is dependent on the question before.
+    :param database: DatabaseController of a new database
+    :param questionCount: number of questions, ids 1 to questionCount
+    :param questionnaireCount: number of questionnaires, ids 1 to questionnaireCount
+    :param questionsPerQuestionnaire: number of questions per questionnaire, taken in turn from all questions
+    :param categoryCount: number of additional question categories
+    """
+    sqlite = database.databaseSQLite
+    questionType = database.getTypes()[0].id
+
+    with sqlite.transaction():
+        sqlite.c.executemany("INSERT INTO tb_question_categories(name, description) VALUES (?, '')", [("Kategorie " + str(i),) for i in range(categoryCount)])
+        sqlite.c.execute("SELECT id_categoryQ FROM tb_question_categories")
+        lstCategories = [row[0] for row in sqlite.c.fetchall()]
+
+        sqlite.c.executemany(
+            "INSERT INTO tb_questions(id_question, text, type, options, required, dependentOn, expectedAnswer, abbrv, score, comment, category) VALUES (?, ?, ?, ?, 0, ?, ?, ?, 0, 0, ?)",
+            [
+                (
+                    i,
+                    "Frage " + str(i) + ": Nehmen Sie seit Jahren Medikamente gegen Beschwerden der Gruppe " + str(i % 97) + " ein?",
+                    questionType,
+                    '["ja", "nein"]',
+                    i - 1 if i % 10 == 0 else -1,
+                    "ja" if i % 10 == 0 else "none",
+                    "frage" + str(i),
+                    lstCategories[i % len(lstCategories)],
+                )
+                for i in range(1, questionCount + 1)
+            ],
+        )
+
+        sqlite.c.executemany("INSERT INTO tb_questionnaires(id_questionnaire, name, description, category) VALUES (?, ?, '', 1)", [(i, "Bogen " + str(i)) for i in range(1, questionnaireCount + 1)])
+        sqlite.c.executemany(
+            "INSERT INTO tb_collections(id_Q, id_QA, position, required) VALUES (?, ?, ?, 0)",
+            [((i * questionsPerQuestionnaire + position) % questionCount + 1, i, position) for i in range(1, questionnaireCount + 1) for position in range(questionsPerQuestionnaire)],
+        )
+
+    database._DatabaseController__clearCache()
+
+
+class FakeHub:
+    """
+    In-memory stand-in of the MySQL hub with the methods of DatabaseMySQL used by the SyncEngine.
+    Every call waits latency seconds like the round trip to a server, the calls of several workers overlap
+    like the connections of a pool. Each call is atomic, transactions are neither isolated nor rolled back.
+    """
+
+    connected: bool = True
+
+    # column index of the UNIQUE column besides the primary key
+    UNIQUE_COLUMNS: dict = {"tb_question_categories": 1, "tb_questionnaire_categories": 1, "tb_questions": 7}
+
+    def __init__(self, latency: float = 0, target: str = "test@hub:3306/mhf"):
+        self.latency = latency
+        self.target = target
+        self.lock = threading.RLock()
+        self.calls = 0
+        # True to fail every call like a server which is not available
+        self.down = False
+
+        self.rows = {table: {} for table in DatabaseMySQL.TABLE_KEYS}
+        self.versions = {table: {} for table in DatabaseMySQL.TABLE_KEYS}
+        self.tombstones = {}
+        self.version = 0
+        # rows not written because of a UNIQUE column
+        self.conflicts = []
+
+        # closed by SyncEngine.close like the connection of a session
+        self.conn = self
+
+    def __roundTrip(self):
+        with self.lock:
+            self.calls += 1
+        if self.down:
+            raise DatabaseNotConnectedError("MySQL database not connect")
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def close(self):
+        pass
+
+    def openSession(self):
+        return self
+
+    def getTarget(self) -> str:
+        return self.target
+
+    @contextmanager
+    def transaction(self):
+        yield self
+
+    def nextVersion(self) -> int:
+        self.__roundTrip()
+        with self.lock:
+            self.version += 1
+            return self.version
+
+    def getHubVersion(self) -> int:
+        self.__roundTrip()
+        return self.version
+
+    def getChangedRows(self, table: str, afterVersion: int) -> list:
+        self.__roundTrip()
+        with self.lock:
+            return [row for key, row in self.rows[table].items() if self.versions[table][key] > afterVersion]
+
+    def getTombstones(self, afterVersion: int) -> list:
+        self.__roundTrip()
+        with self.lock:
+            return [(table, key1, key2, updatedAt) for (table, key1, key2), (updatedAt, version) in self.tombstones.items() if version > afterVersion]
+
+    def upsertRows(self, table: str, rows: list, version: int) -> list:
+        self.__roundTrip()
+        keyCount = len(DatabaseMySQL.TABLE_KEYS[table])
+        unique = self.UNIQUE_COLUMNS.get(table)
+        lstConflicts = []
+
+        with self.lock:
+            tombstones = [(key1, key2, updatedAt) for (tombstoneTable, key1, key2), (updatedAt, version) in self.tombstones.items() if tombstoneTable == table]
+            rows, lstRevived = DatabaseMySQL.dropDeletedRows(table, rows, tombstones)
+
+            if unique is not None:
+                setKeys = {row[0] for row in rows}
+                setValues = {str(row[unique]).lower() for row in rows}
+                existingRows = [(key[0], other[unique], other[-1]) for key, other in self.rows[table].items() if key[0] in setKeys or str(other[unique]).lower() in setValues]
+                rows, lstConflicts = DatabaseMySQL.orderUniqueRows(table, rows, existingRows)
+                self.conflicts += lstConflicts
+
+            for row in rows:
+                row = tuple(row)
+                key = row[:keyCount]
+                if key not in self.rows[table] and unique is not None:
+                    # ON DUPLICATE KEY UPDATE also hits the row with the same value of a UNIQUE column
+                    key = next((otherKey for otherKey, other in self.rows[table].items() if str(other[unique]).lower() == str(row[unique]).lower()), key)
+
+                existing = self.rows[table].get(key)
+                if existing is None or row[-1] >= existing[-1]:
+                    self.rows[table][key] = key + row[keyCount:]
+                    self.versions[table][key] = version
+
+            for key in set(lstRevived) & {DatabaseMySQL.tombstoneKey(table, row) for row in rows}:
+                del self.tombstones[(table,) + key]
+        return lstConflicts
+
+    def deleteRows(self, table: str, deletes: list, version: int) -> bool:
+        self.__roundTrip()
+        keyCount = len(DatabaseMySQL.TABLE_KEYS[table])
+
+        with self.lock:
+            for key1, key2, updatedAt in deletes:
+                key = (key1, key2)[:keyCount]
+                existing = self.rows[table].get(key)
+                if existing is not None and existing[-1] <= updatedAt:
+                    del self.rows[table][key]
+                    del self.versions[table][key]
+
+                tombstone = self.tombstones.get((table, key1, key2 or 0))
+                if tombstone is None or updatedAt >= tombstone[0]:
+                    self.tombstones[(table, key1, key2 or 0)] = (updatedAt, version)
+        return True
+
+    def getChecksums(self, table: str, rangeSize: int = 0) -> dict:
+        self.__roundTrip()
+        with self.lock:
+            lstRows = list(self.rows[table].items())
+
+        dictChecksums = {}
+        for key, row in lstRows:
+            bucket = key[-1] // rangeSize if rangeSize > 0 else 0
+            count, checksum = dictChecksums.get(bucket, (0, 0))
+            dictChecksums[bucket] = (count + 1, checksum ^ DatabaseSQLite.rowChecksum(row))
+        return dictChecksums
+
+    def getRowsInRanges(self, table: str, rangeSize: int, ranges: list) -> list:
+        self.__roundTrip()
+        with self.lock:
+            return [row for key, row in self.rows[table].items() if key[-1] // rangeSize in ranges]
+
+
+def syncWithHub(database: DatabaseController, hub: FakeHub, reconcile: bool = True, workers: int = 3) -> int:
+    """
+    Function to sync a database once with the hub like DatabaseController.syncOnceWithExtern
+    :param database: DatabaseController of the workstation
+    :param hub: FakeHub
+    :param reconcile: True to compare all tables by checksums
+    :param workers: number of worker threads of the SyncEngine
+    :return: number of changed rows in the SQLite database
+    """
+    syncEngine = SyncEngine(LOGGER, database.pathSQLiteDatabase, hub, workers=workers)
+    loop = asyncio.new_event_loop()
+    try:
+        count = loop.run_until_complete(syncEngine.syncAll(reconcile=reconcile))
+    finally:
+        syncEngine.close()
+        loop.close()
+
+    if count > 0:
+        database._DatabaseController__clearCache()
+    return count
@@ -0,0 +1,111 @@
+import json
+import sys
+import threading
+import unittest
+
+from Questionnaire import Questionnaire
+from QuestionnaireController import QuestionnaireController
+from fileHandler import FileHandlerStash
+from tests.support import LOGGER, DatabaseTestCase, createQuestion
+
+
+class TestCache(DatabaseTestCase):
+    """
+    The identity map of DatabaseController holds the saved state, only copies of its objects are handed out
+    """
+
+    def setUp(self):
+        super().setUp()
+        FileHandlerStash.LOGGER = LOGGER
+
+        self.database = self.createDatabase()
+        self.question = self.database.addQuestion(createQuestion(self.database, "med", text="Nehmen Sie Medikamente?"))
+        self.other = self.database.addQuestion(createQuestion(self.database, "allerg"))
+
+        category = self.database.getQuestionnaireCategories()[0]
+        self.first = self.database.addQuestionnaire(Questionnaire(category=category, name="Erster", questions=[self.question.copy(), self.other.copy()]))[0]
+        self.second = self.database.addQuestionnaire(Questionnaire(category=category, name="Zweiter", questions=[self.question.copy()]))[0]
+
+    def testChangedCopiesDoNotAlterCache(self):
+        for question in self.database.getQuestions():
+            question.text = "geändert"
+            question.options.append("vielleicht")
+        self.database.getQuestionById(self.question.id).required = True
+        self.database.searchQuestions("Medikamente")[0].abbreviation = "x"
+
+        question = self.database.getQuestionById(self.question.id)
+        self.assertEqual(question.text, "Nehmen Sie Medikamente?")
+        self.assertEqual(question.options, ["ja", "nein"])
+        self.assertFalse(question.required)
+        self.assertEqual(self.database.getQuestionByAbbreviation("med").id, self.question.id)
+
+    def testSavedObjectIsNotCached(self):
+        # the caller keeps its object after the save and may change it before the next save
+        self.question.text = "ungespeichert"
+        self.assertEqual(self.database.getQuestionById(self.question.id).text, "Nehmen Sie Medikamente?")
+
+        self.database.getQuestions()
+        edited = self.database.getQuestionById(self.question.id)
+        edited.text = "gespeichert"
+        self.database.editQuestion(edited)
+        edited.text = "danach geändert"
+        self.assertEqual(self.database.getQuestionById(self.question.id).text, "gespeichert")
+
+    def testQuestionnairesDoNotShareQuestions(self):
+        first, second = self.database.getQuestionnaires()
+        first.questions[0].required = True
+
+        self.assertFalse(second.questions[0].required)
+        self.assertFalse(self.database.getQuestionById(self.question.id).required)
+        self.assertFalse(self.database.getQuestionnaireById(first.id).questions[0].required)
+
+    def testExportRequirementDoesNotLeak(self):
+        questionnaire = self.database.getQuestionnaireById(self.first.id)
+        controller = QuestionnaireController(questionnaire=questionnaire, database=self.database, logger=LOGGER)
+        controller.toggleRequired(questionnaire.questions[0])
+
+        path = self.directory / "export.json"
+        controller.exportQuestionnaire(path)
+
+        exported = json.loads(path.read_text(encoding="utf-8"))["question"]
+        self.assertEqual(exported[0]["required"], "true")
+        self.assertEqual(exported[1]["required"], "false")
+
+        self.assertFalse(questionnaire.questions[0].required)
+        self.assertFalse(self.database.getQuestionById(self.question.id).required)
+        self.assertFalse(self.database.getQuestionnaireById(self.second.id).questions[0].required)
+
+    def testInvalidationFromSyncThread(self):
+        # the sync thread drops the caches after pulling changes while the GUI thread reads them
+        category = self.database.getQuestionnaireCategories()[0]
+        lstQuestions = [self.database.addQuestion(createQuestion(self.database, "q" + str(i))) for i in range(200)]
+        self.database.addQuestionnaires([Questionnaire(category=category, name="Bogen " + str(i), questions=[question.copy() for question in lstQuestions]) for i in range(20)])
+        stop = threading.Event()
+
+        def invalidate():
+            while not stop.is_set():
+                self.database._DatabaseController__clearCache()
+
+        switchInterval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        thread = threading.Thread(target=invalidate)
+        thread.start()
+        try:
+            for i in range(50):
+                self.assertEqual(len(self.database.getQuestionnaires()), 22)
+                self.assertEqual(len(self.database.getQuestionnaireById(self.first.id).questions), 2)
+                self.assertEqual([question.id for question in self.database.searchQuestions("Medikamente")], [self.question.id])
+
+                question = self.database.getQuestionById(self.other.id)
+                question.text = "Allergien " + str(i)
+                self.database.editQuestion(question)
+        finally:
+            stop.set()
+            thread.join()
+            sys.setswitchinterval(switchInterval)
+
+        self.assertEqual(self.database.getQuestionById(self.other.id).text, "Allergien 49")
+
+
+if __name__ == "__main__":
+    unittest.main()
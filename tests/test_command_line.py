@@ -0,0 +1,111 @@
+import contextlib
+import io
+import json
+import logging
+import subprocess
+import sys
+import unittest
+import zipfile
+from pathlib import Path
+
+from CommandLine import CommandLine
+from tests.support import DatabaseTestCase
+
+PATH_EXAMPLES = Path(__file__).resolve().parent.parent / "Example-JSONs"
+PATH_CONFIG = Path(__file__).resolve().parent.parent / "config" / "config.ini"
+
+
+class TestCommandLine(DatabaseTestCase):
+    """
+    The subcommands of mhf on a temporary database, without config file
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.database = self.directory / "data" / "mhf.db"
+
+    def runCommand(self, *lstArgs: str) -> tuple:
+        """
+        Method to run mhf with the temporary database
+        :param lstArgs: command and its arguments
+        :return: (exit code, printed output)
+        """
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            code = CommandLine.run(["--config", str(self.directory / "config.ini"), "--database", str(self.database)] + list(lstArgs))
+        return code, stdout.getvalue()
+
+    def testCommands(self):
+        code, output = self.runCommand("import", str(PATH_EXAMPLES), "--workers", "1")
+        self.assertEqual(code, 0, output)
+        self.assertIn("Imported 2 of 2 files completely", output)
+
+        code, output = self.runCommand("stats", "--json")
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(output)["tb_questionnaires"], 2)
+
+        code, output = self.runCommand("search", "Familienstand")
+        self.assertEqual(code, 0)
+        self.assertIn("Familienstand", output)
+
+        code, output = self.runCommand("export", str(self.directory / "export"), "--workers", "1")
+        self.assertEqual(code, 0, output)
+        self.assertEqual(sorted(path.suffix for path in (self.directory / "export").iterdir()), [".json", ".json"])
+
+        code, output = self.runCommand("export", str(self.directory / "export.zip"), "--workers", "1")
+        self.assertEqual(code, 0, output)
+        with zipfile.ZipFile(self.directory / "export.zip") as archive:
+            self.assertEqual(len(archive.namelist()), 2)
+
+        code, output = self.runCommand("vacuum")
+        self.assertEqual(code, 0)
+        self.assertIn("Compacted", output)
+
+    def testFailures(self):
+        missing = self.directory / "fehlt.json"
+        code, output = self.runCommand("import", str(missing))
+        self.assertEqual(code, 1)
+        self.assertIn(str(missing), output)
+
+        self.assertEqual(self.runCommand("search", "frage", "--category", "999")[0], 1)
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as context:
+                self.runCommand("unbekannt")
+        self.assertEqual(context.exception.code, 2)
+
+    def testInvalidTuningValues(self):
+        config = PATH_CONFIG.read_text().replace("sqlitecachesize = -16000", "sqlitecachesize = 16MB").replace("sqlitemmapsize = 268435456", "sqlitemmapsize = viel")
+        (self.directory / "config.ini").write_text(config)
+
+        with self.assertLogs("MainLogger", logging.WARNING) as logs:
+            code, output = self.runCommand("stats")
+
+        self.assertEqual(code, 0)
+        output = "\n".join(logs.output)
+        self.assertIn("Error while set SQLite pragma cache_size, will be skipped", output)
+        self.assertIn("Error while set SQLite pragma mmap_size, will be skipped", output)
+
+    def testNoPyQt5(self):
+        # a process of its own, other tests may have imported PyQt5 already
+        script = (
+            "import sys\n"
+            "from CommandLine import CommandLine\n"
+            "args = ['--config', sys.argv[1], '--database', sys.argv[2]]\n"
+            "codes = [CommandLine.run(args + command) for command in (['import', sys.argv[3], '--workers', '1'], ['stats'], ['search', 'frage'], ['export', sys.argv[4], '--workers', '1'], ['vacuum'])]\n"
+            "print(codes, 'PyQt5' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script, str(self.directory / "config.ini"), str(self.database), str(PATH_EXAMPLES), str(self.directory / "export")],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.splitlines()[-1], "[0, 0, 0, 0, 0] False")
+
+
+if __name__ == "__main__":
+    unittest.main()
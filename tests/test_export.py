@@ -0,0 +1,45 @@
+import unittest
+import zipfile
+
+from Questionnaire import Questionnaire
+from QuestionnaireExporter import QuestionnaireExporter
+from tests.support import LOGGER, DatabaseTestCase, createQuestion
+
+
+class TestExport(DatabaseTestCase):
+    """
+    Every questionnaire is exported to a file of its own, also if names collide
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.database = self.createDatabase()
+        self.exporter = QuestionnaireExporter(LOGGER, workers=1)
+        self.question = self.database.addQuestion(createQuestion(self.database, "frage"))
+
+    def addQuestionnaires(self, lstNames: list) -> list:
+        category = self.database.getQuestionnaireCategories()[0]
+        return [self.database.addQuestionnaire(Questionnaire(category=category, name=name, questions=[self.question.copy()]))[0] for name in lstNames]
+
+    def testFileNames(self):
+        lstQuestionnaires = [Questionnaire(category=None, name=name, id=questionnaireId) for name, questionnaireId in (("A (12)", 1), ("A", 5), ("A", 12), ("a", 12), ("B/C?", 7))]
+
+        self.assertEqual(QuestionnaireExporter.fileNames(lstQuestionnaires), ["A (12).json", "A.json", "A (12) (2).json", "a (12) (3).json", "B_C_.json"])
+
+    def testCollidingNames(self):
+        lstQuestionnaires = self.addQuestionnaires(["A", "A", "A"])
+        taken = self.addQuestionnaires(["A (" + str(lstQuestionnaires[1].id) + ")"])
+        lstQuestionnaires = taken + lstQuestionnaires
+
+        dictReport = self.exporter.exportToDirectory(lstQuestionnaires, self.directory / "export")
+        self.assertEqual(list(dictReport.values()), [None] * 4)
+        self.assertEqual(len(list((self.directory / "export").iterdir())), 4)
+
+        dictReport = self.exporter.exportToArchive(lstQuestionnaires, self.directory / "export.zip")
+        self.assertEqual(list(dictReport.values()), [None] * 4)
+        with zipfile.ZipFile(self.directory / "export.zip") as archive:
+            self.assertEqual(sorted(archive.namelist()), sorted(dictReport))
+
+
+if __name__ == "__main__":
+    unittest.main()
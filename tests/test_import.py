@@ -0,0 +1,76 @@
+import json
+import unittest
+
+from QuestionnaireImporter import QuestionnaireImporter
+from fileHandler import FileHandlerStash
+from tests.support import LOGGER, DatabaseTestCase
+
+
+class TestImport(DatabaseTestCase):
+    """
+    A batch of questionnaire files is imported in one transaction, questions are shared by abbreviation
+    """
+
+    def setUp(self):
+        super().setUp()
+        FileHandlerStash.LOGGER = LOGGER
+        self.database = self.createDatabase()
+        self.importer = QuestionnaireImporter(self.database, LOGGER, workers=1)
+
+    def writeForm(self, name: str, lstQuestions: list):
+        """
+        Method to write a form file of text questions
+        :param name: file name without suffix
+        :param lstQuestions: list of (abbreviation, type name)
+        :return: path of the file
+        """
+        path = self.directory / (name + ".json")
+        lstJSONQuestions = [
+            {
+                "number": str(number),
+                "text": "Frage " + abbreviation,
+                "type": typeName,
+                "options": "none",
+                "required": "false",
+                "dependent_on": "none",
+                "expected_answer": "none",
+                "abbrv": abbreviation,
+                "score": "false",
+                "comment": "false",
+            }
+            for number, (abbreviation, typeName) in enumerate(lstQuestions, start=1)
+        ]
+        path.write_text(json.dumps({"question": lstJSONQuestions}), encoding="utf-8")
+        return path
+
+    def testSharedAbbreviation(self):
+        first = self.writeForm("erster", [("gemeinsam", "text"), ("erste", "text")])
+        second = self.writeForm("zweiter", [("zweite", "text"), ("gemeinsam", "text")])
+        broken = self.writeForm("kaputt", [("kaputt", "unbekannt")])
+
+        dictReport = self.importer.importFiles([first, broken, second])
+
+        self.assertEqual(dictReport[first], ([], []))
+        self.assertEqual(dictReport[second], ([], []))
+        self.assertEqual(len(dictReport[broken][0]), 1)
+        self.assertIn("Unknown question type", dictReport[broken][0][0])
+
+        self.assertEqual(sorted(question.abbreviation for question in self.database.getQuestions()), ["erste", "gemeinsam", "zweite"])
+
+        dictQuestionnaires = {questionnaire.name: questionnaire for questionnaire in self.database.getQuestionnaires()}
+        self.assertEqual(sorted(dictQuestionnaires), ["erster", "zweiter"])
+        self.assertEqual([question.abbreviation for question in dictQuestionnaires["zweiter"].questions], ["zweite", "gemeinsam"])
+        self.assertEqual(dictQuestionnaires["erster"].questions[0].id, dictQuestionnaires["zweiter"].questions[1].id)
+
+    def testRepeatedWithinForm(self):
+        path = self.writeForm("doppelt", [("eins", "text"), ("zwei", "text"), ("eins", "text")])
+
+        lstErrors, lstNotes = self.importer.importFiles([path])[path]
+
+        self.assertEqual(lstErrors, [])
+        self.assertEqual(lstNotes, ["Question repeated within the form, added once: eins"])
+        self.assertEqual([question.abbreviation for question in self.database.getQuestionnaires()[0].questions], ["eins", "zwei"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import sqlite3
+import unittest
+
+from tests import support
+from tests.support import DatabaseTestCase
+
+
+class TestIndexes(DatabaseTestCase):
+    """
+    EXPLAIN QUERY PLAN checks of the secondary indexes, the lookups must neither scan a table nor sort
+    """
+
+    # queries of DatabaseSQLite and DatabaseController which need a secondary index
+    QUERIES: list = [
+        ("SELECT * FROM tb_collections WHERE id_QA=? ORDER BY position", (1,), "idx_collections_questionnaire"),
+        ("DELETE FROM tb_collections WHERE id_QA=?", (1,), "idx_collections_questionnaire"),
+        ("SELECT * FROM tb_collections ORDER BY id_QA, position", (), "idx_collections_questionnaire"),
+        ("SELECT COUNT(*) FROM tb_collections WHERE id_Q=?", (1,), "sqlite_autoindex_tb_collections_1"),
+        ("SELECT * FROM tb_questions WHERE category=?", (1,), "idx_questions_category"),
+        ("SELECT * FROM tb_questions WHERE dependentOn=?", (1,), "idx_questions_dependentOn"),
+    ]
+
+    def assertIndexUsed(self, connection, sql: str, args: tuple, index: str):
+        lstPlan = [row[3] for row in connection.execute("EXPLAIN QUERY PLAN " + sql, args)]
+        plan = " | ".join(lstPlan)
+
+        self.assertIn(index, plan, sql)
+        self.assertNotIn("TEMP B-TREE", plan, sql)
+        for step in lstPlan:
+            self.assertFalse(step.startswith("SCAN") and "USING" not in step, sql + " -> " + plan)
+
+    def testNewDatabase(self):
+        database = self.createDatabase()
+
+        for sql, args, index in self.QUERIES:
+            self.assertIndexUsed(database.databaseSQLite.conn, sql, args, index)
+
+    def testMigratedShippedDatabase(self):
+        # data/mhf.db predates the schema versions, the indexes are added on startup
+        self.assertEqual(sqlite3.connect(support.PATH_SHIPPED_DATABASE).execute("PRAGMA user_version").fetchone()[0], 0)
+
+        database = self.createDatabase(copyShipped=True)
+        self.assertGreaterEqual(database.databaseSQLite.getSchemaVersion(), 2)
+
+        for sql, args, index in self.QUERIES:
+            self.assertIndexUsed(database.databaseSQLite.conn, sql, args, index)
+
+if __name__ == "__main__":
+    unittest.main()
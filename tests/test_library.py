@@ -0,0 +1,53 @@
+import importlib.util
+import unittest
+from types import SimpleNamespace
+
+from QuestionCategory import QuestionCategory
+from QuestionController import QuestionController
+from tests.support import LOGGER, DatabaseTestCase, createQuestion
+
+
+class FakeTable:
+    """
+    Stand-in of the question table of the library, an item of every question shows its category and type name
+    """
+
+    def __init__(self, questions: list):
+        self.items = [SimpleNamespace(returnQuestion=lambda question=question: question) for question in questions]
+
+    def findItems(self, text: str, flags, column: int) -> list:
+        return [item for item in self.items if text.lower() in (item.returnQuestion().category.category, item.returnQuestion().type.displayName)[column].lower()]
+
+
+@unittest.skipUnless(importlib.util.find_spec("PyQt5"), "PyQt5 is not installed")
+class TestLibrarySearch(DatabaseTestCase):
+    """
+    The search of the library merges the search of the database with the category and type column of the table
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.database = self.createDatabase()
+
+    def testSearchTextAndCategory(self):
+        from GUI.Library import Library
+
+        category = self.database.addQuestionCategory(QuestionCategory(category="Medikamente", description=""))
+        question = self.database.addQuestion(createQuestion(self.database, "medis", text="Nehmen Sie Medikamente?", category=category))
+
+        lstFound = []
+        library = SimpleNamespace(
+            parent=SimpleNamespace(questionController=QuestionController(database=self.database, logger=LOGGER)),
+            ui=SimpleNamespace(tableQTab=FakeTable(self.database.getQuestions())),
+            updateAll=lambda: None,
+            updateQTab=lstFound.extend,
+        )
+
+        # the text matches in the database, the category in the table, the question is listed once
+        Library.searchQTab(library, "Medikamente")
+
+        self.assertEqual([found.id for found in lstFound], [question.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
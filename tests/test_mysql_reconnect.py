@@ -0,0 +1,145 @@
+import logging
+import re
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+import mysql.connector
+
+from database.DatabaseMySQL import DatabaseMySQL
+
+LOGGER = logging.getLogger("tests.mysql")
+
+
+class FakeServer:
+    """
+    Fake MySQL driver: a pool connects only while the server is up, the connections fail their ping while it is down
+    """
+
+    # newer than every migration, so the schema is not touched
+    SCHEMA_VERSION: int = 99
+
+    def __init__(self, up: bool = True):
+        self.up = up
+        self.attempts: list = []
+        self.connector = SimpleNamespace(pooling=SimpleNamespace(MySQLConnectionPool=self.createPool))
+
+    def check(self):
+        self.attempts.append(time.monotonic())
+        if not self.up:
+            raise mysql.connector.errors.InterfaceError("Can't connect to MySQL server")
+
+    def createPool(self, **kwargs):
+        self.check()
+        return SimpleNamespace(get_connection=lambda: FakeConnection(self))
+
+
+class FakeConnection:
+    def __init__(self, server: FakeServer):
+        self.server = server
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0):
+        self.server.check()
+
+    def cursor(self):
+        return SimpleNamespace(execute=lambda statement, params=None: None, fetchone=lambda: (FakeServer.SCHEMA_VERSION,), fetchall=lambda: [])
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FastDatabaseMySQL(DatabaseMySQL):
+    checkInterval: float = 0.01
+    minReconnectDelay: float = 0.02
+    maxReconnectDelay: float = 0.16
+
+
+class TestReconnect(unittest.TestCase):
+    """
+    The supervisor thread of DatabaseMySQL against a fake driver
+    """
+
+    def connect(self, server: FakeServer, databaseClass=FastDatabaseMySQL, onReconnect=None) -> DatabaseMySQL:
+        database = databaseClass(LOGGER, "localhost", 3306, "user", "password", "mhf", onReconnect=onReconnect, connector=server.connector, waitForConnection=True)
+        self.addCleanup(database.disconnet)
+        return database
+
+    @staticmethod
+    def waitFor(condition, timeout: float = 5) -> bool:
+        end = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > end:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def testServerDownWithoutWaiting(self):
+        with self.assertRaises(mysql.connector.Error):
+            FastDatabaseMySQL(LOGGER, "localhost", 3306, "user", "password", "mhf", connector=FakeServer(up=False).connector)
+
+    def testWaitForConnectionReturnsImmediately(self):
+        start = time.monotonic()
+        database = self.connect(FakeServer(up=False), databaseClass=DatabaseMySQL)
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertFalse(database.connected)
+        self.assertTrue(database.checkThread.is_alive())
+
+    def testExponentialBackoff(self):
+        server = FakeServer(up=False)
+
+        with self.assertLogs(LOGGER, logging.ERROR) as logs:
+            self.connect(server)
+            self.assertTrue(self.waitFor(lambda: len(server.attempts) >= 7))
+
+        lstDelays = [float(delay) for delay in re.findall(r"try to reconnect in ([0-9.]+) seconds", "\n".join(logs.output))]
+        self.assertEqual(lstDelays[:6], [0.02, 0.04, 0.08, 0.16, 0.16, 0.16])
+
+        # the first attempt is made by the constructor, every further attempt waits the delay logged after the one before
+        lstGaps = [later - earlier for earlier, later in zip(server.attempts[1:], server.attempts[2:])]
+        for gap, delay in zip(lstGaps, lstDelays):
+            self.assertGreaterEqual(gap, delay * 0.9)
+
+    def testOnReconnectAfterRecovery(self):
+        server = FakeServer(up=False)
+        reconnected = threading.Event()
+        database = self.connect(server, onReconnect=reconnected.set)
+
+        self.assertTrue(self.waitFor(lambda: len(server.attempts) >= 2))
+        self.assertFalse(reconnected.is_set())
+
+        server.up = True
+        self.assertTrue(reconnected.wait(5))
+        self.assertTrue(database.connected)
+
+        # a lost connection is recovered the same way
+        reconnected.clear()
+        server.up = False
+        self.assertTrue(self.waitFor(lambda: not database.connected))
+        server.up = True
+        self.assertTrue(reconnected.wait(5))
+        self.assertTrue(database.connected)
+
+    def testDisconnectDuringBackoff(self):
+        server = FakeServer(up=False)
+        database = self.connect(server, databaseClass=type("SlowDatabaseMySQL", (FastDatabaseMySQL,), {"minReconnectDelay": 30, "maxReconnectDelay": 60}))
+        self.assertTrue(self.waitFor(lambda: len(server.attempts) >= 1))
+
+        start = time.monotonic()
+        database.disconnet()
+        database.checkThread.join(5)
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(database.checkThread.is_alive())
+        self.assertEqual(len(server.attempts), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
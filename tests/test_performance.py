@@ -0,0 +1,88 @@
+import unittest
+
+from Questionnaire import Questionnaire
+from fileHandler import FileHandlerStash, writeToFile
+from tests.benchmark import (
+    SEARCH_QUERIES,
+    buildSearchIndex,
+    loadQuestionnairesCold,
+    loadQuestionnairesNestedLoop,
+    loadQuestionsCold,
+    measure,
+    measurePeakMemory,
+    searchQuestionsSubstringScan,
+    writeToFileConcatenated,
+)
+from tests.support import LOGGER, DatabaseTestCase, fillDatabase
+
+
+class TestPerformance(DatabaseTestCase):
+    """
+    Regression guards of the benchmarks in tests/benchmark.py on smaller databases, the bounds are generous
+    """
+
+    def createFilledDatabase(self, questionCount: int, questionnaireCount: int = 0):
+        database = self.createDatabase("bench" + str(questionCount) + ".db")
+        fillDatabase(database, questionCount, questionnaireCount)
+        return database
+
+    def testLoadQuestionsScalesLinear(self):
+        small = self.createFilledDatabase(2000)
+        large = self.createFilledDatabase(20000)
+
+        self.assertEqual(len(loadQuestionsCold(large)), 20000)
+        self.assertEqual(loadQuestionsCold(large)[19].dependent_on, "frage19")
+
+        # ten times the questions, linear is a factor of 10, the replaced nested scans were quadratic
+        ratio = measure(lambda: loadQuestionsCold(large)) / measure(lambda: loadQuestionsCold(small))
+        self.assertLess(ratio, 25)
+
+    def testAssembleQuestionnaires(self):
+        database = self.createFilledDatabase(10000, 1000)
+
+        lstQuestionnaires = loadQuestionnairesCold(database)
+        self.assertEqual(len(lstQuestionnaires), 1000)
+        self.assertTrue(all(len(questionnaire.questions) == 20 for questionnaire in lstQuestionnaires))
+
+        # same questions in the same order as the replaced assembly
+        small = self.createFilledDatabase(500, 50)
+        for questionnaire, reference in zip(loadQuestionnairesCold(small), loadQuestionnairesNestedLoop(small)):
+            self.assertEqual([question.id for question in questionnaire.questions], [question.id for question in reference.questions])
+
+        # assembling 20k collection entries costs about as much as loading the questions, the replaced nested loop took 50 times as long
+        ratio = measure(lambda: loadQuestionnairesCold(database)) / measure(lambda: loadQuestionsCold(database))
+        self.assertLess(ratio, 10)
+
+    def testTrigramSearch(self):
+        database = self.createFilledDatabase(20000)
+        lstQuestions = database.getQuestions()
+        searchIndex = buildSearchIndex(database)
+
+        for query in SEARCH_QUERIES:
+            with self.subTest(query=query):
+                self.assertEqual(searchIndex.search(query, fuzzy=False), searchQuestionsSubstringScan(lstQuestions, query))
+
+        # selective queries only check the questions of the rarest trigram, the scan checks all of them
+        for query in SEARCH_QUERIES[:2]:
+            seconds = measure(lambda: searchIndex.search(query, fuzzy=False), repeat=5)
+            before = measure(lambda: searchQuestionsSubstringScan(lstQuestions, query), repeat=5)
+            self.assertLess(seconds, before / 3, query)
+
+    def testExportQuestionnaire(self):
+        FileHandlerStash.LOGGER = LOGGER
+        database = self.createFilledDatabase(10000)
+        questionnaire = Questionnaire(category=database.getQuestionnaireCategories()[0], name="Export", questions=database.getQuestions())
+        pathFile = self.directory / "export.json"
+        pathFileBefore = self.directory / "exportConcatenated.json"
+
+        writeToFile(pathFile, questionnaire)
+        writeToFileConcatenated(pathFileBefore, questionnaire)
+        self.assertEqual(pathFile.read_bytes(), pathFileBefore.read_bytes())
+
+        # the questions are written one by one, the replaced export held the whole JSON string and its parsed object
+        self.assertLess(measurePeakMemory(lambda: writeToFile(pathFile, questionnaire)), 1e6)
+        self.assertLess(measure(lambda: writeToFile(pathFile, questionnaire)), measure(lambda: writeToFileConcatenated(pathFileBefore, questionnaire)))
+
+
+if __name__ == "__main__":
+    unittest.main()
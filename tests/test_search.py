@@ -0,0 +1,72 @@
+import unittest
+
+from tests.support import DatabaseTestCase, createQuestion
+
+
+class TestSearch(DatabaseTestCase):
+    """
+    The full-text search matches word prefixes, the trigram index adds the substring matches
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.database = self.createDatabase(copyShipped=True)
+
+    def testInfixMatches(self):
+        lstIds = [question.id for question in self.database.searchQuestions("nehmen")]
+
+        self.assertIn(16, lstIds)
+        self.assertEqual(lstIds, sorted(lstIds))
+        for questionId in lstIds:
+            question = self.database.getQuestionById(questionId)
+            self.assertIn("nehmen", (question.text + question.abbreviation + " ".join(question.options)).lower())
+
+    def testRankedWithLimit(self):
+        lstAll = [question.id for question in self.database.searchQuestions("nehmen")]
+        lstRanked = [question.id for question in self.database.searchQuestions("nehmen", limit=len(lstAll))]
+
+        self.assertEqual(sorted(lstRanked), lstAll)
+        # the substring match behind the word prefix matches
+        self.assertEqual(lstRanked[-1], 16)
+
+    def testNoDuplicates(self):
+        lstIds = [question.id for question in self.database.searchQuestions("seit wann")]
+        self.assertGreater(len(lstIds), 0)
+        self.assertEqual(len(lstIds), len(set(lstIds)))
+
+    def testTypoFallback(self):
+        question = self.database.addQuestion(createQuestion(self.database, "hoehe", text="Wie gross ist Ihre Wohnung?"))
+        self.assertIn(question.id, [found.id for found in self.database.searchQuestions("Wohnunh")])
+
+    def testIndexesOfSQLite(self):
+        self.assertTrue(self.database.databaseSQLite.substringSearch)
+
+        # a limited search neither loads all questions nor builds the in-memory trigram index
+        lstIds = [question.id for question in self.database.searchQuestions("nehmen", limit=50)]
+        self.assertIn(16, lstIds)
+        self.assertIsNone(self.database.cacheQuestions)
+        self.assertIsNone(self.database.searchIndex)
+
+        # the same questions once all questions are loaded
+        self.database.getQuestions()
+        self.assertEqual(lstIds, [question.id for question in self.database.searchQuestions("nehmen", limit=50)])
+
+    def testSubstringIndexFollowsEdits(self):
+        question = self.database.addQuestion(createQuestion(self.database, "wohnort", text="Wo wohnen Sie derzeit?"))
+        self.assertIn(question.id, [found.id for found in self.database.searchQuestions("ohnen sie")])
+
+        question.text = "Seit wann leben Sie dort?"
+        self.database.editQuestion(question)
+        sqlite = self.database.databaseSQLite
+        self.assertNotIn(question.id, sqlite.searchQuestionsBySubstring("ohnen sie"))
+        self.assertIn(question.id, sqlite.searchQuestionsBySubstring("EBEN SIE"))
+
+        self.database.removeQuestion(question)
+        self.assertNotIn(question.id, sqlite.searchQuestionsBySubstring("eben sie"))
+
+    def testLimit(self):
+        self.assertEqual(len(self.database.searchQuestions("nehmen", limit=2)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
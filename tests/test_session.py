@@ -0,0 +1,147 @@
+import struct
+import unittest
+from unittest import mock
+
+from QuestionCategory import QuestionCategory
+from Questionnaire import Questionnaire
+from QuestionnaireCategory import QuestionnaireCategory
+from SessionCodec import SessionCodec
+from SessionWriter import SessionWriter
+from fileHandler import FileHandlerStash, readSessionFile, setQuestionCategories, setQuestionnaireCategories, setTypes
+from tests.support import LOGGER, DatabaseTestCase, createQuestion
+
+
+class TestSessionCodec(DatabaseTestCase):
+    """
+    The binary session snapshot stores only the fields differing from the database
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.database = self.createDatabase()
+
+    def header(self, questionnaire: Questionnaire) -> dict:
+        return {
+            "name": questionnaire.name,
+            "id": questionnaire.id,
+            "description": questionnaire.description,
+            "creationDate": questionnaire.creationDate,
+            "lastEdited": questionnaire.lastEdited,
+            "category": questionnaire.category,
+        }
+
+    def testIdsOfWorkstation(self):
+        # category ids of a workstation exceed 32 bits
+        category = self.database.addQuestionCategory(QuestionCategory(category="Neu", description=""))
+        questionnaireCategory = self.database.addQuestionnaireCategory(QuestionnaireCategory(name="Neu", description=""))
+        question = self.database.addQuestion(createQuestion(self.database, "frage", category=category))
+        self.assertGreater(category.id, 2**31)
+
+        questionnaire = Questionnaire(name="Bogen", category=questionnaireCategory, questions=[question])
+        data = SessionCodec.encode(self.header(questionnaire), questionnaire.questions, [0])
+        jO = SessionCodec.decode(data)
+
+        self.assertEqual(jO["category"]["id"], questionnaireCategory.id)
+        self.assertEqual(jO["questions"][0]["category"]["id"], category.id)
+        self.assertEqual(jO["questions"][0]["id"], question.id)
+
+    def testChangedFieldsOnly(self):
+        question = self.database.addQuestion(createQuestion(self.database, "frage", text="gespeichert"))
+        questionnaire = Questionnaire(name="Bogen", category=self.database.getQuestionnaireCategories()[0], questions=[self.database.getQuestionById(question.id)])
+        unchanged = SessionCodec.encode(self.header(questionnaire), questionnaire.questions, [0], self.database.getCachedQuestion)
+
+        # edited in place in the questionnaire, the database keeps the saved state
+        questionnaire.questions[0].text = "ungespeichert"
+        questionnaire.questions[0].options.append("vielleicht")
+        data = SessionCodec.encode(self.header(questionnaire), questionnaire.questions, [0], self.database.getCachedQuestion)
+        self.assertGreater(len(data), len(unchanged))
+
+        jO = SessionCodec.decode(data, self.database.getQuestionById)
+        self.assertEqual(jO["questions"][0]["text"], "ungespeichert")
+        self.assertEqual(jO["questions"][0]["options"], ["ja", "nein", "vielleicht"])
+        self.assertEqual(jO["questions"][0]["abbreviation"], "frage")
+        self.assertEqual(self.database.getQuestionById(question.id).text, "gespeichert")
+
+    def testReferenceIsSessionQuestion(self):
+        question = self.database.addQuestion(createQuestion(self.database, "frage", text="gespeichert"))
+        question.text = "ungespeichert"
+        questionnaire = Questionnaire(name="Bogen", category=self.database.getQuestionnaireCategories()[0], questions=[question])
+
+        # a reference returning the object of the session itself must not hide its changes
+        data = SessionCodec.encode(self.header(questionnaire), questionnaire.questions, [0], lambda questionId: question)
+        self.assertEqual(SessionCodec.decode(data, self.database.getQuestionById)["questions"][0]["text"], "ungespeichert")
+
+    def testVersion1(self):
+        def packStr(value: str) -> bytes:
+            return struct.pack("<I", len(value.encode("utf-8"))) + value.encode("utf-8")
+
+        data = SessionCodec.MAGIC + b"\x01" + packStr("Bogen") + struct.pack("<q", -1) + packStr("") + packStr("heute") + packStr("heute") + struct.pack("<iI", 1, 0)
+        jO = SessionCodec.decode(data)
+
+        self.assertEqual(jO["name"], "Bogen")
+        self.assertEqual(jO["category"]["id"], 1)
+        self.assertEqual(jO["questions"], [])
+
+
+class TestSessionJournal(DatabaseTestCase):
+    """
+    The session writer appends changes to the journal and compacts it into a new session file
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.database = self.createDatabase()
+        self.pathSession = self.directory / "session.lock"
+        self.pathJournal = self.directory / "session.journal"
+
+        self.enterContext(mock.patch.object(FileHandlerStash, "LOGGER", LOGGER))
+        self.enterContext(mock.patch.object(FileHandlerStash, "SESSION_FILE_PATH", self.pathSession))
+        self.enterContext(mock.patch.object(FileHandlerStash, "SESSION_JOURNAL_PATH", self.pathJournal))
+        setTypes(types=self.database.getTypes())
+        setQuestionCategories(categories=self.database.getQuestionCategories())
+        setQuestionnaireCategories(categories=self.database.getQuestionnaireCategories())
+
+        question = self.database.addQuestion(createQuestion(self.database, "frage", text="gespeichert"))
+        self.questionnaire = Questionnaire(category=self.database.getQuestionnaireCategories()[0], name="Bogen", questions=[self.database.getQuestionById(question.id)])
+
+    def createWriter(self, binary: bool) -> SessionWriter:
+        writer = SessionWriter(logger=LOGGER, pathSessionFile=self.pathSession, pathJournalFile=self.pathJournal, debounce=0, compactAfter=1, binary=binary, reference=self.database.getCachedQuestion)
+        self.addCleanup(writer.close)
+        return writer
+
+    def write(self, writer: SessionWriter, text: str):
+        self.questionnaire.questions[0].text = text
+        writer.update(self.questionnaire)
+        writer.flush()
+
+    def assertRestored(self, text: str):
+        self.assertEqual(readSessionFile(getQuestionById=self.database.getQuestionById).questions[0].text, text)
+
+    def testJournalIsReplayed(self):
+        for binary in (True, False):
+            with self.subTest(binary=binary):
+                writer = self.createWriter(binary)
+                self.write(writer, "erste")
+                self.write(writer, "zweite")
+
+                self.assertGreater(self.pathJournal.stat().st_size, 0)
+                self.assertRestored("zweite")
+
+    def testCrashWhileCompacting(self):
+        for binary in (True, False):
+            with self.subTest(binary=binary):
+                writer = self.createWriter(binary)
+                self.write(writer, "erste")
+                self.write(writer, "zweite")
+                journal = self.pathJournal.read_bytes()
+
+                # the compaction writes a new session file, the crash happens before the journal is emptied
+                self.write(writer, "dritte")
+                self.assertEqual(self.pathJournal.stat().st_size, 0)
+                self.pathJournal.write_bytes(journal)
+
+                self.assertRestored("dritte")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import json
+import unittest
+
+from JSONStreamReader import JSONStreamReader
+
+
+class TestJSONStreamReader(unittest.TestCase):
+    """
+    Elements of the array are decoded like json.loads, however the file is split into chunks
+    """
+
+    CHUNK_SIZES: tuple = (1, 2, 3, 5, 9, 64, 65536)
+
+    def assertStreamed(self, document: str, key: str = "question"):
+        expected = json.loads(document)[key]
+
+        for chunkSize in self.CHUNK_SIZES:
+            with self.subTest(chunkSize=chunkSize):
+                file = io.TextIOWrapper(io.BytesIO(document.encode("utf-8")), encoding="utf-8")
+                self.assertEqual(list(JSONStreamReader(file, chunkSize).iterArray(key)), expected)
+
+    def testNumbers(self):
+        self.assertStreamed('{"question": [1234567, 2.5e10, -0.125, 7E-3, 0, 1e+2]}')
+
+    def testNumberAtEndOfArray(self):
+        self.assertStreamed('{"question":[12.75]}')
+
+    def testObjects(self):
+        self.assertStreamed(
+            '{"title": "Bogen", "question": [{"number": 0, "options": ["ja", "nein"], "score": 1.5, "required": true}, '
+            '{"number": 1, "options": [], "comment": null, "nested": {"a": [1, {"b": false}]}}], "count": 2}'
+        )
+
+    def testStringsWithEscapes(self):
+        self.assertStreamed('{"question": ["Zeile\\nzwei", "\\"zitiert\\"", "\\u00e4\\u00f6\\u00fc", "Backslash \\\\", "\\ud83d\\ude00"]}')
+
+    def testMultibyteCharacters(self):
+        self.assertStreamed('{"question": ["Größe", "Ärztin", "€ 12", "😀 Schmerz", {"ä": "ß"}]}')
+
+    def testWhitespaceAndOtherKeys(self):
+        self.assertStreamed('  {\n  "other" : [1, 2] ,\n  "question" : [ \n 1 , "a" , [ ] , { } ] ,\n "after": 3.5 }\n ')
+
+    def testEmptyArray(self):
+        self.assertStreamed('{"question": []}')
+
+    def testMissingKey(self):
+        with self.assertRaises(KeyError):
+            list(JSONStreamReader(io.StringIO('{"other": []}'), 3).iterArray("question"))
+
+    def testInvalidDocument(self):
+        for document in ('{"question": [1, 2}', '{"question": [1] } extra', '{"question": [1.]}', "[1, 2]"):
+            with self.subTest(document=document):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(JSONStreamReader(io.StringIO(document), 3).iterArray("question"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,277 @@
+import logging
+import threading
+import time
+import unittest
+
+from Questionnaire import Questionnaire
+from QuestionCategory import QuestionCategory
+from SyncQueue import SyncQueue
+from database.DatabaseExceptions import DatabaseNotConnectedError
+from database.DatabaseMySQL import DatabaseMySQL
+from database.DatabaseSQLite import DatabaseSQLite
+from tests.support import LOGGER, DatabaseTestCase, FakeHub, createQuestion, syncWithHub
+
+
+class TestSync(DatabaseTestCase):
+    """
+    Two workstations synchronised over one hub
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.hub = FakeHub()
+        self.first = self.createDatabase("first.db")
+        self.second = self.createDatabase("second.db")
+
+    def syncAll(self):
+        syncWithHub(self.first, self.hub)
+        syncWithHub(self.second, self.hub)
+        syncWithHub(self.first, self.hub)
+
+    def testRowsCreatedOnBothWorkstations(self):
+        for database, name in ((self.first, "erste"), (self.second, "zweite")):
+            category = database.addQuestionCategory(QuestionCategory(category="Kategorie " + name, description=""))
+            question = database.addQuestion(createQuestion(database, name, text="Frage " + name, category=category))
+            database.addQuestionnaire(Questionnaire(category=database.getQuestionnaireCategories()[0], name="Bogen " + name, questions=[question]))
+
+        self.syncAll()
+
+        for database in (self.first, self.second):
+            self.assertEqual(sorted(question.text for question in database.getQuestions()), ["Frage erste", "Frage zweite"])
+            self.assertEqual(sorted(category.category for category in database.getQuestionCategories()), ["Allgemein", "Kategorie erste", "Kategorie zweite"])
+
+            lstQuestionnaires = sorted(database.getQuestionnaires(), key=lambda questionnaire: questionnaire.name)
+            self.assertEqual([questionnaire.name for questionnaire in lstQuestionnaires], ["Bogen erste", "Bogen zweite"])
+            self.assertEqual([[question.abbreviation for question in questionnaire.questions] for questionnaire in lstQuestionnaires], [["erste"], ["zweite"]])
+
+        first = self.first.getQuestionByAbbreviation("erste")
+        second = self.first.getQuestionByAbbreviation("zweite")
+        self.assertEqual(first.category.category, "Kategorie erste")
+        self.assertEqual(second.category.category, "Kategorie zweite")
+        self.assertNotEqual(first.id >> DatabaseSQLite.SITE_SHIFT, second.id >> DatabaseSQLite.SITE_SHIFT)
+
+    def testIdsOfWorkstation(self):
+        lstIds = [self.first.addQuestion(createQuestion(self.first, "q" + str(i))).id for i in range(3)]
+
+        self.assertEqual(lstIds, list(range(lstIds[0], lstIds[0] + 3)))
+        self.assertGreater(lstIds[0] >> DatabaseSQLite.SITE_SHIFT, 0)
+        # the seeded default category keeps its id on every workstation
+        self.assertEqual([category.id for category in self.first.getQuestionnaireCategories()], [1])
+
+    def testChangesArePulled(self):
+        question = self.first.addQuestion(createQuestion(self.first, "frage"))
+        self.syncAll()
+
+        edited = self.second.getQuestionById(question.id)
+        edited.text = "geändert"
+        self.second.editQuestion(edited)
+        self.syncAll()
+        self.assertEqual(self.first.getQuestionById(question.id).text, "geändert")
+
+        self.first.removeQuestion(self.first.getQuestionById(question.id))
+        self.syncAll()
+        self.assertIsNone(self.second.getQuestionById(question.id))
+
+    def testOlderEditDoesNotReviveLaterDelete(self):
+        question = self.first.addQuestion(createQuestion(self.first, "frage"))
+        self.syncAll()
+
+        # the second workstation edits offline, the first one deletes afterwards and syncs
+        edited = self.second.getQuestionById(question.id)
+        edited.text = "geändert"
+        self.second.editQuestion(edited)
+        time.sleep(0.01)
+        self.first.removeQuestion(self.first.getQuestionById(question.id))
+        syncWithHub(self.first, self.hub)
+
+        syncWithHub(self.second, self.hub)
+        syncWithHub(self.first, self.hub)
+
+        self.assertNotIn((question.id,), self.hub.rows["tb_questions"])
+        self.assertIn(("tb_questions", question.id, 0), self.hub.tombstones)
+        self.assertIsNone(self.first.getQuestionById(question.id))
+        self.assertIsNone(self.second.getQuestionById(question.id))
+
+    def testNewerEditAfterDeleteIsKept(self):
+        question = self.first.addQuestion(createQuestion(self.first, "frage"))
+        self.syncAll()
+
+        self.first.removeQuestion(self.first.getQuestionById(question.id))
+        time.sleep(0.01)
+        edited = self.second.getQuestionById(question.id)
+        edited.text = "geändert"
+        self.second.editQuestion(edited)
+        syncWithHub(self.first, self.hub)
+        syncWithHub(self.second, self.hub)
+        syncWithHub(self.first, self.hub)
+
+        self.assertNotIn(("tb_questions", question.id, 0), self.hub.tombstones)
+        self.assertEqual(self.first.getQuestionById(question.id).text, "geändert")
+        self.assertEqual(self.second.getQuestionById(question.id).text, "geändert")
+
+    def testOutboxIsReplayedAfterOutage(self):
+        edited = self.first.addQuestion(createQuestion(self.first, "bleibt"))
+        removed = self.first.addQuestion(createQuestion(self.first, "weg"))
+        self.syncAll()
+
+        edited.text = "geändert"
+        self.first.editQuestion(edited)
+        self.first.removeQuestion(removed)
+        created = self.first.addQuestion(createQuestion(self.first, "neu"))
+
+        self.hub.down = True
+        with self.assertRaises(DatabaseNotConnectedError):
+            syncWithHub(self.first, self.hub)
+
+        # a restart of the workstation keeps the changes not acknowledged
+        self.first = self.createDatabase("first.db")
+        self.hub.down = False
+        self.syncAll()
+
+        for database in (self.first, self.second):
+            self.assertEqual(database.getQuestionById(edited.id).text, "geändert")
+            self.assertIsNone(database.getQuestionById(removed.id))
+            self.assertEqual(database.getQuestionById(created.id).abbreviation, "neu")
+        self.assertEqual(self.first.getStatistics()["tb_changelog"], 0)
+
+    def testChangesBeforeFirstSyncAreKept(self):
+        first = self.createDatabase("first-shipped.db", copyShipped=True)
+        second = self.createDatabase("second-shipped.db", copyShipped=True)
+        syncWithHub(first, self.hub)
+
+        # the second workstation never synchronised, its delete outlives a restart and reaches the hub
+        second.removeQuestion(second.getQuestionById(16))
+        second = self.createDatabase("second-shipped.db")
+        syncWithHub(second, self.hub)
+        syncWithHub(first, self.hub)
+
+        self.assertNotIn((16,), self.hub.rows["tb_questions"])
+        self.assertIsNone(second.getQuestionById(16))
+        self.assertIsNone(first.getQuestionById(16))
+
+    def testUniqueAbbreviationOnBothWorkstations(self):
+        first = self.first.addQuestion(createQuestion(self.first, "gleich", text="Frage der ersten"))
+        syncWithHub(self.first, self.hub)
+
+        second = self.second.addQuestion(createQuestion(self.second, "gleich", text="Frage der zweiten"))
+        other = self.second.addQuestion(createQuestion(self.second, "andere"))
+        self.syncAll()
+        self.assertEqual({row[0] for row in self.hub.conflicts}, {second.id})
+
+        # the row of the first workstation is not overwritten, the conflict does not block the other rows
+        self.assertEqual(self.hub.rows["tb_questions"][(first.id,)][1], "Frage der ersten")
+        self.assertNotIn((second.id,), self.hub.rows["tb_questions"])
+        self.assertEqual(self.first.getQuestionById(first.id).text, "Frage der ersten")
+        self.assertEqual(self.first.getQuestionById(other.id).abbreviation, "andere")
+        self.assertEqual(self.second.getQuestionById(second.id).text, "Frage der zweiten")
+
+        edited = self.second.getQuestionById(other.id)
+        edited.text = "geändert"
+        self.second.editQuestion(edited)
+        self.syncAll()
+        self.assertEqual(self.first.getQuestionById(other.id).text, "geändert")
+
+    def testConflictIsRecordedAndHoldsBackCollections(self):
+        self.first.addQuestion(createQuestion(self.first, "gleich", text="Frage der ersten"))
+        syncWithHub(self.first, self.hub)
+
+        second = self.second.addQuestion(createQuestion(self.second, "gleich", text="Frage der zweiten"))
+        questionnaire, lstErrors = self.second.addQuestionnaire(Questionnaire(category=self.second.getQuestionnaireCategories()[0], name="Bogen", questions=[second]))
+        self.syncAll()
+
+        lstConflicts = self.second.getSyncConflicts()
+        self.assertCountEqual(
+            [(target, tableName, key1, key2) for target, tableName, key1, key2, reason, detectedAt in lstConflicts],
+            [(self.hub.target, "tb_questions", second.id, None), (self.hub.target, "tb_collections", second.id, questionnaire.id)],
+        )
+        self.assertEqual(self.second.getStatistics()["tb_sync_conflicts"], 2)
+        # no collection of the hub points at a missing question
+        self.assertEqual(self.hub.rows["tb_collections"], {})
+        self.assertEqual(self.first.getQuestionnaires()[0].questions, [])
+
+        # a later sync ships the rows again, the conflicts are kept with the time of their first detection
+        self.syncAll()
+        self.assertEqual(sorted(self.second.getSyncConflicts()), sorted(lstConflicts))
+
+        # renaming the question resolves the conflict, the collection held back is shipped with it
+        second.abbreviation = "zweite"
+        self.second.editQuestion(second)
+        syncWithHub(self.second, self.hub, reconcile=False)
+        syncWithHub(self.first, self.hub, reconcile=False)
+
+        self.assertEqual(self.second.getSyncConflicts(), [])
+        self.assertEqual([question.abbreviation for question in self.first.getQuestionnaires()[0].questions], ["zweite"])
+
+    def testSyncThreadWarnsAboutConflicts(self):
+        self.first.addQuestion(createQuestion(self.first, "gleich", text="Frage der ersten"))
+        syncWithHub(self.first, self.hub)
+        self.second.addQuestion(createQuestion(self.second, "gleich", text="Frage der zweiten"))
+
+        syncQueue = SyncQueue(debounce=0.01)
+        thread = threading.Thread(target=self.second.syncDatabases, args=(syncQueue, self.hub))
+
+        with self.assertLogs(LOGGER, logging.WARNING) as logs:
+            thread.start()
+            syncQueue.putAll()
+
+            end = time.monotonic() + 5
+            while not any("because of conflicts" in line for line in logs.output) and time.monotonic() < end:
+                time.sleep(0.01)
+
+            syncQueue.close()
+            thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertIn("1 rows not synchronised because of conflicts", "\n".join(logs.output))
+        self.assertNotIn("Warning while sync databases", "\n".join(logs.output))
+
+    def testRenameReleasesAbbreviation(self):
+        question = self.first.addQuestion(createQuestion(self.first, "alt"))
+        self.syncAll()
+
+        # one pushed batch renames a question and creates another one with its old abbreviation
+        question.abbreviation = "neu"
+        self.first.editQuestion(question)
+        created = self.first.addQuestion(createQuestion(self.first, "alt", text="Neue Frage"))
+        self.syncAll()
+
+        self.assertEqual(self.second.getQuestionById(question.id).abbreviation, "neu")
+        self.assertEqual(self.second.getQuestionById(created.id).text, "Neue Frage")
+
+
+class TestOrderUniqueRows(unittest.TestCase):
+    """
+    Rows of a MySQL upsert taking the UNIQUE value of another row
+    """
+
+    @staticmethod
+    def row(questionId: int, abbreviation: str, updatedAt: int) -> tuple:
+        return (questionId, "Frage", 1, "[]", 0, -1, "none", abbreviation, 0, 0, 1, updatedAt)
+
+    def testNewRowWithExistingValue(self):
+        rows, conflicts = DatabaseMySQL.orderUniqueRows("tb_questions", [self.row(2, "Gleich", 5), self.row(3, "frei", 5)], [(1, "gleich", 1)])
+
+        self.assertEqual([row[0] for row in rows], [3])
+        self.assertEqual([row[0] for row in conflicts], [2])
+
+    def testReleasedValueIsTakenAfterwards(self):
+        rows, conflicts = DatabaseMySQL.orderUniqueRows("tb_questions", [self.row(2, "alt", 5), self.row(1, "neu", 5)], [(1, "alt", 1)])
+
+        self.assertEqual([row[0] for row in rows], [1, 2])
+        self.assertEqual(conflicts, [])
+
+    def testSwappedValues(self):
+        rows, conflicts = DatabaseMySQL.orderUniqueRows("tb_questions", [self.row(1, "b", 5), self.row(2, "a", 5)], [(1, "a", 1), (2, "b", 1)])
+
+        self.assertEqual(rows, [])
+        self.assertEqual([row[0] for row in conflicts], [1, 2])
+
+    def testOlderRowIsLeftOut(self):
+        rows, conflicts = DatabaseMySQL.orderUniqueRows("tb_questions", [self.row(1, "b", 0)], [(1, "a", 1), (2, "b", 1)])
+
+        self.assertEqual(rows, [])
+        self.assertEqual(conflicts, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import time
+import unittest
+
+from SyncQueue import SyncQueue
+from tests.support import LOGGER, DatabaseTestCase, FakeHub, fillDatabase, syncWithHub
+
+
+class TestSyncLatency(DatabaseTestCase):
+    """
+    Latency-injection harness of the SyncEngine: the fake hub answers every call after a round trip of 50 ms,
+    several workers have to overlap the round trips of the tables
+    """
+
+    ROUND_TRIP: float = 0.05
+
+    def setUp(self):
+        super().setUp()
+        self.database = self.createDatabase()
+        fillDatabase(self.database, questionCount=2000, questionnaireCount=100)
+
+    def measure(self, workers: int) -> float:
+        """
+        Method to copy the database to a new hub
+        :param workers: number of worker threads of the SyncEngine
+        :return: seconds
+        """
+        hub = FakeHub(latency=self.ROUND_TRIP, target="test@hub:3306/workers" + str(workers))
+
+        start = time.perf_counter()
+        syncWithHub(self.database, hub, reconcile=True, workers=workers)
+        seconds = time.perf_counter() - start
+
+        for table in SyncQueue.ORDER:
+            self.database.databaseSQLite.c.execute("SELECT COUNT(*) FROM " + table)
+            self.assertEqual(len(hub.rows[table]), self.database.databaseSQLite.c.fetchone()[0], table)
+
+        rows = sum(len(hub.rows[table]) for table in SyncQueue.ORDER)
+        LOGGER.info(str(workers) + " workers: " + str(hub.calls) + " round trips, " + format(seconds, ".2f") + " s, " + format(rows / seconds, ".0f") + " rows/s")
+        return seconds
+
+    def testRoundTripsOverlap(self):
+        single = self.measure(workers=1)
+        pooled = self.measure(workers=3)
+
+        self.assertLess(pooled, single * 0.7)
+
+    def testChangesAfterCopy(self):
+        hub = FakeHub(latency=self.ROUND_TRIP)
+        syncWithHub(self.database, hub)
+
+        question = self.database.getQuestionById(1)
+        question.text = "geändert"
+        self.database.editQuestion(question)
+
+        # only the change log is shipped and the changes are pulled, no table is compared again
+        calls = hub.calls
+        syncWithHub(self.database, hub, reconcile=False)
+        self.assertEqual(hub.rows["tb_questions"][(1,)][1], "geändert")
+        self.assertLessEqual(hub.calls - calls, 2 + 2 + len(SyncQueue.ORDER))
+
+
+if __name__ == "__main__":
+    unittest.main()
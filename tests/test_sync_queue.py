@@ -0,0 +1,89 @@
+import threading
+import time
+import unittest
+
+from SyncQueue import SyncQueue
+
+
+class TestSyncQueue(unittest.TestCase):
+    """
+    A burst of changes is collected and returned once, in dependency order
+    """
+
+    def testBurstIsCoalesced(self):
+        queue = SyncQueue(debounce=0.1, maxDelay=5)
+
+        for i in range(50):
+            queue.put("tb_questions")
+
+        self.assertEqual(queue.get(timeout=1), ["tb_questions"])
+        self.assertEqual(queue.get(timeout=0.2), [])
+
+    def testDuplicateTables(self):
+        queue = SyncQueue(debounce=0.05)
+        queue.put("tb_collections", "tb_questions", "tb_collections")
+        queue.put("tb_questions")
+
+        self.assertEqual(queue.get(timeout=1), ["tb_questions", "tb_collections"])
+
+    def testDependencyOrder(self):
+        queue = SyncQueue(debounce=0.05)
+        queue.put("tb_collections", "tb_questionnaires", "tb_questions", "tb_question_categories", "tb_question_types")
+
+        self.assertEqual(queue.get(timeout=1), ["tb_question_types", "tb_question_categories", "tb_questions", "tb_questionnaires", "tb_collections"])
+
+        queue.putAll()
+        self.assertEqual(queue.get(timeout=1), list(SyncQueue.ORDER))
+
+    def testDebounceWaitsForQuietPeriod(self):
+        queue = SyncQueue(debounce=0.2, maxDelay=5)
+        start = time.monotonic()
+        queue.put("tb_questions")
+
+        self.assertEqual(queue.get(timeout=1), ["tb_questions"])
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def testMaxDelayBoundsContinuousBurst(self):
+        queue = SyncQueue(debounce=0.1, maxDelay=0.3)
+        stop = threading.Event()
+
+        def burst():
+            while not stop.wait(0.02):
+                queue.put("tb_questions")
+
+        thread = threading.Thread(target=burst)
+        start = time.monotonic()
+        queue.put("tb_questions")
+        thread.start()
+
+        try:
+            self.assertEqual(queue.get(timeout=2), ["tb_questions"])
+            seconds = time.monotonic() - start
+        finally:
+            stop.set()
+            thread.join()
+
+        # the debounce time never passes during the burst
+        self.assertGreaterEqual(seconds, 0.25)
+        self.assertLess(seconds, 1)
+
+    def testCloseWakesBlockedGet(self):
+        queue = SyncQueue()
+        lstResults = []
+        thread = threading.Thread(target=lambda: lstResults.append(queue.get()))
+        thread.start()
+
+        time.sleep(0.05)
+        queue.close()
+        thread.join(1)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(lstResults, [None])
+
+        # changes after closing are dropped
+        queue.put("tb_questions")
+        self.assertIsNone(queue.get(timeout=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import sqlite3
+import threading
+import unittest
+
+from Questionnaire import Questionnaire
+from database.DatabaseSQLite import DatabaseSQLite
+from tests.support import LOGGER, DatabaseTestCase, createQuestion
+
+
+class TestTransactions(DatabaseTestCase):
+    """
+    Concurrent connections on one database in WAL mode, e.g. the GUI and the sync workers
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.database = self.createDatabase()
+        self.path = self.directory / "data" / "mhf.db"
+
+    def connect(self) -> DatabaseSQLite:
+        database = DatabaseSQLite(logger=LOGGER, pathSQLiteDatabase=self.path, pragmas={"journal_mode": "WAL"})
+        self.addCleanup(database.conn.close)
+        return database
+
+    def connectInThread(self) -> DatabaseSQLite:
+        # sqlite3 connections are bound to the thread which created them
+        return DatabaseSQLite(logger=LOGGER, pathSQLiteDatabase=self.path, pragmas={"journal_mode": "WAL"})
+
+    def testWriteAfterReadWithConcurrentCommit(self):
+        first = self.connect()
+        readDone = threading.Event()
+        lstErrors = []
+
+        def writeConcurrently():
+            with self.connectInThread() as second:
+                readDone.wait()
+                try:
+                    with second.transaction():
+                        second.c.execute("INSERT INTO tb_question_categories (name) VALUES ('zweite')")
+                except Exception as e:
+                    lstErrors.append(e)
+
+        thread = threading.Thread(target=writeConcurrently)
+        thread.start()
+
+        # read, let the other connection try to commit, then write: the pattern of editQuestionnaire
+        with first.transaction():
+            first.c.execute("SELECT COUNT(*) FROM tb_question_categories")
+            count = first.c.fetchone()[0]
+            readDone.set()
+            thread.join(0.2)
+            first.c.execute("INSERT INTO tb_question_categories (name) VALUES ('erste')")
+
+        thread.join()
+        self.assertEqual(lstErrors, [])
+
+        first.c.execute("SELECT COUNT(*) FROM tb_question_categories")
+        self.assertEqual(first.c.fetchone()[0], count + 2)
+
+    def testReadTransactionDoesNotBlockWriters(self):
+        first = self.connect()
+        second = self.connect()
+
+        with first.transaction(write=False):
+            first.c.execute("SELECT COUNT(*) FROM tb_question_categories")
+            count = first.c.fetchone()[0]
+
+            with second.transaction():
+                second.c.execute("INSERT INTO tb_question_categories (name) VALUES ('neu')")
+
+            # the read transaction keeps its snapshot
+            first.c.execute("SELECT COUNT(*) FROM tb_question_categories")
+            self.assertEqual(first.c.fetchone()[0], count)
+
+
+class TestQuestionnaireSave(DatabaseTestCase):
+    """
+    A questionnaire is saved with its questions and collections in one transaction
+    """
+
+    TABLES: tuple = ("tb_questionnaires", "tb_questions", "tb_collections")
+
+    def setUp(self):
+        super().setUp()
+        self.database = self.createDatabase()
+        self.sqlite = self.database.databaseSQLite
+
+    def countRows(self) -> dict:
+        dictCounts = {}
+        for table in self.TABLES:
+            self.sqlite.c.execute("SELECT COUNT(*) FROM " + table)
+            dictCounts[table] = self.sqlite.c.fetchone()[0]
+        return dictCounts
+
+    def failThirdCollection(self):
+        # the insert of the collections fails after two rows are written
+        self.sqlite.c.execute("CREATE TEMP TRIGGER fail_collection BEFORE INSERT ON tb_collections WHEN new.position = 3 BEGIN SELECT RAISE(ABORT, 'collection failed'); END")
+
+    def assertCacheCleared(self):
+        self.assertIsNone(self.database.cacheQuestions)
+        self.assertIsNone(self.database.cacheQuestionnaires)
+        self.assertIsNone(self.database.cacheCollections)
+
+    def testAddIsRolledBack(self):
+        questionnaire = Questionnaire(category=self.database.getQuestionnaireCategories()[0], name="Bogen", questions=[createQuestion(self.database, "q" + str(i)) for i in range(3)])
+        self.database.getQuestions()
+        self.database.getQuestionnaires()
+        self.failThirdCollection()
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.database.addQuestionnaire(questionnaire)
+
+        self.assertEqual(self.countRows(), {table: 0 for table in self.TABLES})
+        self.assertCacheCleared()
+        self.assertEqual(self.database.getQuestions(), [])
+        self.assertEqual(self.database.getQuestionnaires(), [])
+
+    def testEditIsRolledBack(self):
+        lstQuestions = [self.database.addQuestion(createQuestion(self.database, "q" + str(i))) for i in range(2)]
+        questionnaire = self.database.addQuestionnaire(Questionnaire(category=self.database.getQuestionnaireCategories()[0], name="Bogen", questions=lstQuestions))[0]
+        before = self.countRows()
+        self.failThirdCollection()
+
+        edited = self.database.getQuestionnaireById(questionnaire.id)
+        edited.name = "geändert"
+        edited.questions.append(createQuestion(self.database, "neu"))
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.database.editQuestionnaire(edited)
+
+        self.assertEqual(self.countRows(), before)
+        self.assertCacheCleared()
+
+        saved = self.database.getQuestionnaireById(questionnaire.id)
+        self.assertEqual(saved.name, "Bogen")
+        self.assertEqual([question.abbreviation for question in saved.questions], ["q0", "q1"])
+
+
+if __name__ == "__main__":
+    unittest.main()